@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from sklearn.model_selection import train_test_split
+
+import schemas
+from brand_config import DATA_PATH, data_file
+
+##################################################
+######    광고 이월효과(adstock) / 포화(saturation) 변환    #####
+##################################################
+# build_training_dataset.py 의 lag3 / 7d_sum 대신 쓸 수 있는 광고비 변환
+# 모든 파라미터 조합을 (날짜 × 조합) 배열 하나로 계산해서 proxy_sales 와의 설명력(R2) 비교
+# 변환은 전체 기간으로 계산(이월효과는 이전 날짜 필요)하되, 파라미터 선택은 elasticnet_regression 과 같은
+# train 행(8:2 random_state=42)에서만 → test 행이 파라미터 선택에 쓰이지 않음
+channels = ["search_ad_spend_est", "live_ad_spend_est"]
+adstock_feats = ["search_ad_spend_adstock", "live_ad_spend_adstock"]
+
+# 탐색 그리드
+decays = np.round(np.linspace(0.0, 0.95, 20), 4)  # 이월 감쇠율
+delays = np.arange(0, 7)  # delayed adstock 최대 효과 지연(일)
+max_lag = 13  # delayed adstock 창 길이(일)
+half_sat_ratios = np.array([0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0])  # 반포화점 = 비율 × 양수 평균
+slopes = np.array([0.5, 1.0, 2.0, 3.0])  # Hill 곡선 기울기
+
+
+# 기하 감쇠 adstock: a_t = x_t + decay * a_{t-1} (1차 IIR 필터, decay 마다 lfilter 한 번)
+def geometric_adstock(x, decay_grid):
+    x = np.asarray(x, dtype=float)
+    decay_grid = np.asarray(decay_grid, dtype=float)
+    out = np.empty((len(x), len(decay_grid)))
+    for j, decay in enumerate(decay_grid):
+        out[:, j] = lfilter([1.0], [1.0, -decay], x)
+    return out
+
+
+# 지연 adstock 가중치 (window, 조합): w_l = decay^((l - delay)^2) 를 합 1로 정규화
+def delayed_weights(decay_grid, delay_grid, window=max_lag):
+    lags = np.arange(window)[:, None]
+    decay_grid = np.asarray(decay_grid, dtype=float)[None, :]
+    delay_grid = np.asarray(delay_grid, dtype=float)[None, :]
+    weights = np.where(decay_grid > 0, np.power(np.maximum(decay_grid, 1e-12), (lags - delay_grid) ** 2),
+                       (lags == delay_grid).astype(float))
+    return weights / weights.sum(axis=0, keepdims=True)
+
+
+# 지연 adstock: delayed_weights 를 max_lag 일 창으로 적용 (FIR 필터)
+def delayed_adstock(x, decay_grid, delay_grid, window=max_lag):
+    x = np.asarray(x, dtype=float)
+    weights = delayed_weights(decay_grid, delay_grid, window)
+
+    # 창[t] = x[t-window+1 .. t] → lag 순서(0 = 당일)로 뒤집어서 행렬곱
+    padded = np.concatenate([np.zeros(window - 1), x])
+    return sliding_window_view(padded, window)[:, ::-1] @ weights
+
+
+# Hill 포화: a^s / (a^s + K^s)
+def hill(a, half_sat, slope):
+    a_s = np.power(np.maximum(a, 0), slope)
+    return a_s / (a_s + np.power(half_sat, slope))
+
+
+# 로그 포화: log(1 + a / K)
+def log_saturation(a, half_sat):
+    return np.log1p(np.maximum(a, 0) / half_sat)
+
+
+# 열마다 y 와의 상관계수 제곱 (단변량 R2)
+def column_r2(F, y):
+    Fc = F - F.mean(axis=0)
+    yc = (y - y.mean()) / (y.std() or 1.0)
+    std = Fc.std(axis=0)
+    corr = np.where(std > 0, (Fc * yc[:, None]).mean(axis=0) / np.where(std > 0, std, 1.0), 0.0)
+    return corr ** 2
+
+
+# adstock 후보 (종류, decay, delay) 와 (날짜 × 후보) 배열
+def adstock_grid(x):
+    geo = geometric_adstock(x, decays)
+    dd, ll = np.meshgrid(decays, delays, indexing="ij")
+    delayed = delayed_adstock(x, dd.ravel(), ll.ravel())
+    specs = [("geometric", d, 0) for d in decays] + [("delayed", d, l) for d, l in zip(dd.ravel(), ll.ravel())]
+    return specs, np.concatenate([geo, delayed], axis=1)
+
+
+# elasticnet_regression.run_experiments 의 train 행 (train_test_split 은 행 수와 random_state 로만 결정됨)
+def train_rows(n_rows, test_size=0.2, random_state=42):
+    train_idx, _ = train_test_split(np.arange(n_rows), test_size=test_size, random_state=random_state)
+    return np.sort(train_idx)
+
+
+# 채널 하나에 대해 (adstock × saturation) 전체 조합 평가 (rows 를 주면 그 행에서만 R2 / 반포화점 계산)
+def sweep_channel(x, y, chunk_size=64, rows=None):
+    specs, A = adstock_grid(x)
+    y = np.asarray(y, dtype=float)
+    if rows is not None:
+        A, y = A[rows], y[rows]
+
+    # 반포화점은 adstock 열마다 양수 평균 기준 (광고비 단위와 무관)
+    pos_mean = np.array([a[a > 0].mean() if (a > 0).any() else 1.0 for a in A.T])
+
+    results = []
+    for start in range(0, A.shape[1], chunk_size):
+        a = A[:, start:start + chunk_size]  # (T, C)
+        K = pos_mean[start:start + chunk_size][None, :, None] * half_sat_ratios[None, None, :]  # (1, C, R)
+
+        # Hill: (T, C, R, S) / 로그: (T, C, R) 를 한 번에 계산
+        hill_vals = hill(a[:, :, None, None], K[..., None], slopes[None, None, None, :])
+        log_vals = log_saturation(a[:, :, None], K)
+        r2_hill = column_r2(hill_vals.reshape(len(y), -1), y).reshape(a.shape[1], len(half_sat_ratios), len(slopes))
+        r2_log = column_r2(log_vals.reshape(len(y), -1), y).reshape(a.shape[1], len(half_sat_ratios))
+        r2_none = column_r2(a, y)
+
+        for c in range(a.shape[1]):
+            kind, decay, delay = specs[start + c]
+            base = {"adstock": kind, "decay": decay, "delay": delay}
+            results.append({**base, "saturation": "none", "half_sat": np.nan, "slope": np.nan, "r2": r2_none[c]})
+            for r, ratio in enumerate(half_sat_ratios):
+                k = pos_mean[start + c] * ratio
+                results.append({**base, "saturation": "log", "half_sat": k, "slope": np.nan, "r2": r2_log[c, r]})
+                for s, slope in enumerate(slopes):
+                    results.append({**base, "saturation": "hill", "half_sat": k, "slope": slope,
+                                 "r2": r2_hill[c, r, s]})
+
+    return pd.DataFrame(results)
+
+
+# 파라미터 한 세트로 변환
+def transform(x, adstock, decay, delay, saturation, half_sat, slope):
+    if adstock == "geometric":
+        a = geometric_adstock(x, [decay])[:, 0]
+    else:
+        a = delayed_adstock(x, [decay], [delay])[:, 0]
+    return saturate(a, saturation, half_sat, slope)
+
+
+# adstock 값에 포화 변환 적용 ("none" 이면 그대로)
+def saturate(a, saturation, half_sat, slope):
+    if saturation == "hill":
+        return hill(a, half_sat, slope)
+    if saturation == "log":
+        return log_saturation(a, half_sat)
+    return a
+
+
+# 채널별 최적 파라미터 탐색 (train_only=False 면 전체 행 기준)
+def sweep(model_input_df, train_only=True):
+    y = model_input_df["proxy_sales"].to_numpy(dtype=float)
+    rows = train_rows(len(y)) if train_only else None
+    best = []
+    for channel in channels:
+        result_df = sweep_channel(model_input_df[channel].to_numpy(dtype=float), y, rows=rows)
+        row = result_df.loc[result_df["r2"].idxmax()].to_dict()
+        row.update({"channel": channel, "n_combinations": len(result_df)})
+        best.append(row)
+    columns = ["channel", "adstock", "decay", "delay", "saturation", "half_sat", "slope", "r2", "n_combinations"]
+    return pd.DataFrame(best)[columns]
+
+
+# 최적 파라미터로 adstock feature 추가 (elasticnet_regression.py 입력)
+def add_adstock_features(model_input_df, params_df):
+    model_input_df = model_input_df.copy()
+    for p in params_df.itertuples():
+        feature = p.channel.replace("_est", "_adstock")
+        model_input_df[feature] = transform(model_input_df[p.channel].to_numpy(dtype=float), p.adstock, p.decay,
+                                            int(p.delay), p.saturation, p.half_sat, p.slope)
+    return model_input_df
+
+
+def load_params(brand, data_path=DATA_PATH):
+    return pd.read_csv(data_file(f"adstock_params_{brand}.csv", data_path))
+
+
+def run(brand, data_path=DATA_PATH):
+    model_input_df = schemas.load("elasticnet_data", brand, data_path)
+    params_df = sweep(model_input_df)
+    params_df.to_csv(data_file(f"adstock_params_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return params_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+
+    print(run(brand))
@@ -0,0 +1,161 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import schemas
+from brand_config import DATA_PATH, data_file
+from elasticnet_regression import feature_sets, load_hyperparams
+from gram_experiments import solve
+
+##################################################
+######   rolling-origin 백테스트 (ElasticNet)   #####
+##################################################
+# 기준일(origin)을 step 일씩 앞으로 옮기면서 origin 이전 날짜로 학습, 다음 step 일로 평가 (미래 데이터 학습 없음)
+# 충분통계량(Σx, Σxxᵀ, Σxy, Σy)에 새 날짜 행만 더하고 (window 를 주면 오래된 행은 빼고)
+# 표준화 Gram 행렬을 통계량에서 바로 만든 뒤, 직전 origin 계수에서 좌표하강법 시작 (warm start)
+# → origin 하나당 비용이 (추가 행 수 × p² + p² × 반복 수), 전체 재학습 없음
+# origin 별 R2 / RMSE 는 step 과 별개인 horizon 일 구간으로 평가 (step=1 이어도 R2 계산 가능, 구간은 origin 끼리 겹침)
+# 전체 성능(summarize)은 겹치지 않는 step 일 구간의 오차(sum_sq_err)를 합쳐서 계산
+# coef_drift: 직전 origin 대비 표준화 계수 변화량 (표준화 기준이 origin 마다 학습 구간으로 다시 잡히므로
+#             계수 자체의 변화와 평균 / 표준편차 변화가 섞여 있음, 원래 단위 계수는 beta_* 컬럼 참고)
+min_train = 90  # 첫 origin 의 학습 일수
+horizon = 28  # origin 별 R2 / RMSE 평가 일수
+tol = 1e-8  # 좌표하강법 종료 기준 (warm start 라 몇 번 반복이면 수렴)
+
+
+class SufficientStats:
+    # shift: 큰 값끼리 빼면서 생기는 오차를 줄이기 위해 첫 학습 구간 평균을 빼고 누적
+    def __init__(self, shift_x, shift_y):
+        self.shift_x, self.shift_y = np.asarray(shift_x, dtype=float), float(shift_y)
+        p = len(self.shift_x)
+        self.n = 0
+        self.sx, self.sxx, self.sxy = np.zeros(p), np.zeros((p, p)), np.zeros(p)
+        self.sy = 0.0
+
+    def add(self, X, y, sign=1):
+        X, y = X - self.shift_x, y - self.shift_y
+        self.n += sign * len(y)
+        self.sx += sign * X.sum(axis=0)
+        self.sxx += sign * (X.T @ X)
+        self.sxy += sign * (X.T @ y)
+        self.sy += sign * y.sum()
+
+    def remove(self, X, y):
+        self.add(X, y, sign=-1)
+
+    # 학습 구간 기준 표준화 (StandardScaler 와 같음) 후 중심화한 Gram / X^T y
+    def standardized(self):
+        n = self.n
+        mean, y_mean = self.sx / n, self.sy / n
+        gram = self.sxx - n * np.outer(mean, mean)
+        var = np.clip(np.diag(gram) / n, 0, None)
+        std = np.sqrt(var)
+        std[std <= 10 * np.finfo(float).eps * np.maximum(np.abs(mean + self.shift_x), 1)] = 1.0  # 상수 컬럼
+        xy = (self.sxy - n * mean * y_mean) / std
+        return mean + self.shift_x, std, y_mean + self.shift_y, gram / np.outer(std, std), xy
+
+
+def _r2(y, pred):
+    if len(y) < 2:
+        return np.nan
+    sst = ((y - y.mean()) ** 2).sum()
+    return 1 - ((y - pred) ** 2).sum() / sst if sst > 0 else np.nan
+
+
+# origin 마다 모든 feature set 을 한 번에 (mask) 학습 → origin × 실험 결과
+def backtest(model_input_df, params=None, sets=None, step=1, min_train=min_train, window=None, horizon=horizon):
+    sets = sets or feature_sets
+    columns = list(dict.fromkeys(c for cols in sets.values() for c in cols))
+    X = model_input_df[columns].to_numpy(dtype=float)
+    y = model_input_df["proxy_sales"].to_numpy(dtype=float)
+    dates = pd.DatetimeIndex(model_input_df["date"])
+    if min_train >= len(y):
+        raise ValueError(f"학습 일수({min_train})가 데이터 길이({len(y)})보다 깁니다.")
+    if window is not None and window < min_train:
+        raise ValueError("window 는 min_train 이상이어야 합니다.")
+    if horizon < 2:
+        raise ValueError("horizon 은 2 이상이어야 R2 를 계산할 수 있습니다.")
+
+    names = list(sets)
+    col = {c: i for i, c in enumerate(columns)}
+    masks = np.zeros((len(names), len(columns)), dtype=bool)
+    for i, name in enumerate(names):
+        masks[i, [col[c] for c in sets[name]]] = True
+    settings = np.array([(params or {}).get(name, (1.0, 0.5)) for name in names], dtype=float)
+
+    stats = SufficientStats(X[:min_train].mean(axis=0), y[:min_train].mean())
+    stats.add(X[:min_train], y[:min_train])
+    start, end = 0, min_train  # 학습 구간 [start, end)
+
+    rows, W = [], None
+    for origin in range(min_train, len(y), step):
+        # 새 날짜 추가 / window 밖 날짜 제거
+        if origin > end:
+            stats.add(X[end:origin], y[end:origin])
+            end = origin
+        if window is not None and end - start > window:
+            stats.remove(X[start:end - window], y[start:end - window])
+            start = end - window
+
+        mean, std, y_mean, gram, xy = stats.standardized()
+        l1 = stats.n * settings[:, 0] * settings[:, 1]
+        l2 = stats.n * settings[:, 0] * (1 - settings[:, 1])
+        W_prev = W
+        W = solve(gram, xy, masks, l1, l2, W0=W_prev, tol=tol)
+
+        # 원래 단위 계수 / intercept 로 다음 horizon 일 예측 (앞 step 일은 전체 성능용)
+        beta_real = W / std
+        intercept = y_mean - beta_real @ mean
+        n_eval = min(max(horizon, step), len(y) - origin)
+        n_test = min(step, n_eval)
+        y_eval = y[origin:origin + n_eval]
+        err = y_eval[:, None] - (X[origin:origin + n_eval] @ beta_real.T + intercept)  # (평가 일수, 실험 수)
+        drift = np.full(len(names), np.nan) if W_prev is None else np.sqrt(((W - W_prev) ** 2).sum(axis=1))
+
+        for k, name in enumerate(names):
+            row = {"experiment": name, "origin": dates[origin], "n_train": stats.n, "n_test": n_test,
+                   "n_eval": n_eval, "R2": _r2(y_eval, y_eval - err[:, k]),
+                   "RMSE": np.sqrt((err[:, k] ** 2).mean()), "coef_drift": drift[k], "intercept": intercept[k]}
+            for c in columns:
+                row[f"beta_{c}"] = beta_real[k, col[c]] if masks[k, col[c]] else np.nan
+            row["sum_sq_err"] = (err[:n_test, k] ** 2).sum()
+            rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+# 실험별 전체 out-of-sample 성능 (모든 origin 의 예측을 합쳐서 계산)
+def summarize(backtest_df, model_input_df):
+    y = model_input_df.set_index("date")["proxy_sales"]
+    rows = []
+    for name, df in backtest_df.groupby("experiment", sort=False):
+        y_test = y[y.index >= df["origin"].min()]
+        sse = df["sum_sq_err"].sum()
+        rows.append({"experiment": name, "n_origins": len(df), "oos_R2": 1 - sse / ((y_test - y_test.mean()) ** 2).sum(),
+                     "oos_RMSE": np.sqrt(sse / df["n_test"].sum()), "mean_coef_drift": df["coef_drift"].mean(),
+                     "max_coef_drift": df["coef_drift"].max()})
+    return pd.DataFrame(rows)
+
+
+# step=1: 일 단위, step=7: 주 단위 / window 를 주면 최근 window 일만 학습 (기본: 처음부터 누적)
+# horizon: origin 별 R2 / RMSE 평가 일수 (step 보다 짧으면 step 일)
+def run(brand, data_path=DATA_PATH, step=1, min_train=min_train, window=None, use_tuned=False, horizon=horizon):
+    model_input_df = schemas.load("elasticnet_data", brand, data_path)
+    params = load_hyperparams(brand, data_path) if use_tuned else None
+
+    start = time.perf_counter()
+    backtest_df = backtest(model_input_df, params, feature_sets, step, min_train, window, horizon)
+    print(f"[{brand}] origin {backtest_df['origin'].nunique()}개 백테스트 ({time.perf_counter() - start:.2f}s)")
+
+    # elasticnet_experiments_results_{brand}.csv 옆에 저장
+    backtest_df.to_csv(data_file(f"elasticnet_backtest_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return backtest_df, summarize(backtest_df, model_input_df)
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    step = 1  # 1: 일 단위, 7: 주 단위 origin 이동
+
+    _, summary_df = run(brand, step=step)
+    print(summary_df.to_string(index=False))
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import build_training_dataset
+import elasticnet_regression
+import estimate_live_ad_spend
+import proxy_sales
+import synthetic_data
+from instrumentation import RssSampler
+from brand_config import data_file, get_competitors
+from run_pipeline import STAGES
+
+#############################################
+######       stage 별 성능 측정 (벤치마크)      #####
+#############################################
+# run_pipeline.py 와 같은 순서로 브랜드별 stage 를 실행하면서
+# 실행 시간 / CPU 시간 / 처리량(입력 행/초) / 최대 메모리(RSS) 측정
+# 결과는 CSV 에 실행 단위(run_id)로 누적 저장 → 이전 실행과 비교
+RESULTS_FILE = "benchmark_results.csv"
+
+stage_funcs = {
+    "estimate_live_ad_spend": lambda brand, data_path: estimate_live_ad_spend.run(brand, data_path),
+    "proxy_sales": lambda brand, data_path: proxy_sales.run(brand, data_path),
+    "build_training_dataset": lambda brand, data_path: build_training_dataset.run(brand, data_path),
+    "elasticnet_regression": lambda brand, data_path: elasticnet_regression.run(brand, data_path),
+}
+
+
+# stage 별 입력 파일 (처리량 계산용)
+def stage_inputs(stage, brand, data_path):
+    if stage == "estimate_live_ad_spend":
+        files = [f"live_info_{brand}.csv", f"prod_code_{brand}.csv"]
+    elif stage == "proxy_sales":
+        return [data_file("search_volume_total.csv", data_path), data_file(f"prod_code_{brand}.csv", data_path),
+                proxy_sales.review_path(brand, data_path), data_file(f"live_info_{brand}.csv", data_path)]
+    elif stage == "build_training_dataset":
+        files = [f"live_info_{brand}_2.csv", "search_volume_total.csv", f"proxy_sales_{brand}.csv"] + \
+                [f"live_info_{c}.csv" for c in get_competitors(brand)]
+    else:
+        files = [f"elasticnet_data_{brand}.csv"]
+    return [data_file(f, data_path) for f in files]
+
+
+# CSV 데이터 행 수 (헤더 제외)
+def count_rows(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+# stage 하나 측정
+def measure(stage, brand, data_path):
+    input_rows = sum(count_rows(p) for p in stage_inputs(stage, brand, data_path))
+    with RssSampler() as sampler:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        stage_funcs[stage](brand, data_path)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return {
+        "brand": brand,
+        "stage": stage,
+        "wall_sec": wall,
+        "cpu_sec": cpu,
+        "input_rows": input_rows,
+        "rows_per_sec": input_rows / wall if wall > 0 else float("nan"),
+        "peak_rss_mb": sampler.peak_rss / 2 ** 20,
+        "rss_delta_mb": (sampler.peak_rss - sampler.start_rss) / 2 ** 20,
+    }
+
+
+def run_benchmark(data_path, brands, label="", scale=None, repeat=1):
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    rows = []
+    for r in range(repeat):
+        for brand in brands:
+            for stage in STAGES:
+                row = measure(stage, brand, data_path)
+                rows.append({"run_id": run_id, "label": label, "repeat": r, "scale": json.dumps(scale or {}), **row})
+                print(f"[{brand}] {stage}: {row['wall_sec']:.3f}s, {row['rows_per_sec']:.0f} rows/s, "
+                      f"peak {row['peak_rss_mb']:.1f}MB")
+    return pd.DataFrame(rows)
+
+
+# 결과 누적 저장
+def save_results(results_df, results_path):
+    header = not os.path.exists(results_path)
+    results_df.to_csv(results_path, mode="a", header=header, index=False, encoding="utf-8-sig" if header else "utf-8")
+
+
+# 두 실행의 stage 별 비교 (브랜드 합계, 반복 중 최소값 기준)
+def compare(history_df, base_run, new_run):
+    def stage_summary(run_id):
+        run_df = history_df[history_df["run_id"] == run_id]
+        per_repeat = run_df.groupby(["stage", "repeat"]).agg(wall_sec=("wall_sec", "sum"),
+                                                             peak_rss_mb=("peak_rss_mb", "max"))
+        return per_repeat.groupby("stage").min()
+
+    base, new = stage_summary(base_run), stage_summary(new_run)
+    summary = pd.DataFrame({
+        "base_wall_sec": base["wall_sec"],
+        "new_wall_sec": new["wall_sec"],
+        "speedup": base["wall_sec"] / new["wall_sec"],
+        "base_peak_rss_mb": base["peak_rss_mb"],
+        "new_peak_rss_mb": new["peak_rss_mb"],
+    })
+    return summary.reindex([s for s in STAGES if s in summary.index])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="stage 별 실행 시간 / 처리량 / 메모리 측정")
+    parser.add_argument("--data-path", required=True, help="벤치마크용 데이터 폴더 (--generate 시 덮어씀)")
+    parser.add_argument("--generate", action="store_true", help="합성 데이터 생성 후 측정")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--label", default="", help="실행 설명 (예: 커밋명)")
+    parser.add_argument("--results", default=RESULTS_FILE, help="결과 누적 CSV")
+    parser.add_argument("--compare-to", default="last", help="비교할 run_id (기본: 직전 실행, none 이면 비교 안 함)")
+    synthetic_data.add_scale_args(parser)
+    args = parser.parse_args()
+
+    scale = synthetic_data.scale_kwargs(args)
+    if args.generate:
+        brands, _ = synthetic_data.generate(args.data_path, **scale)
+    else:
+        brands = synthetic_data.synthetic_brands(args.brands, args.data_path)
+
+    results_df = run_benchmark(args.data_path, brands, args.label, scale, args.repeat)
+    previous_runs = pd.read_csv(args.results)["run_id"].unique().tolist() if os.path.exists(args.results) else []
+    save_results(results_df, args.results)
+
+    base_run = previous_runs[-1] if args.compare_to == "last" and previous_runs else args.compare_to
+    if base_run in previous_runs:
+        history_df = pd.read_csv(args.results, dtype={"run_id": str})
+        print(f"\n{base_run} → {results_df['run_id'].iloc[0]}")
+        print(compare(history_df, str(base_run), results_df["run_id"].iloc[0]).to_string())
+
+
+if __name__ == "__main__":
+    main()
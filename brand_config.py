@@ -0,0 +1,89 @@
+import csv
+import os
+
+#############################################
+######          브랜드 레지스트리          #####
+#############################################
+# 모든 스크립트가 공유하는 브랜드 정보 (brands.csv 에서 import 시점에 읽음 → 브랜드 추가는 CSV 한 줄)
+# name    : 파일명/표시용 브랜드명
+# keyword : 검색량(brand 컬럼) / 상품명 필터링 키워드
+# cpc     : 브랜드별 예상 CPC
+# actual_sales_2024 : proxy_sales 스케일링 기준 매출액 (비에날씬 2024년 매출액 2688억 원)
+BRANDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "brands.csv")
+brand_fields = ["brand", "name", "keyword", "cpc", "url", "prod_prefix", "live_prefix", "actual_sales_2024"]
+
+
+# 브랜드 CSV → {브랜드 코드: 정보}
+def read_brands(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    missing = [c for c in brand_fields if rows and c not in rows[0]]
+    if missing:
+        raise ValueError(f"{path} 에 필수 컬럼이 없습니다: {missing}")
+    brands = {}
+    for row in rows:
+        brands[row['brand']] = {'name': row['name'], 'keyword': row['keyword'], 'cpc': int(row['cpc']),
+                                'url': row['url'], 'prod_prefix': row['prod_prefix'],
+                                'live_prefix': row['live_prefix'],
+                                'actual_sales_2024': float(row['actual_sales_2024'])}
+    return brands
+
+
+BRANDS = read_brands(BRANDS_FILE)
+
+# 기본 데이터 폴더
+DATA_PATH = "data"
+
+
+# 브랜드 정보 조회
+def get_brand(brand):
+    try:
+        return BRANDS[brand]
+    except KeyError:
+        raise ValueError(f"brand는 {', '.join(repr(b) for b in BRANDS)} 중 하나여야 합니다.")
+
+
+# 경쟁사 브랜드 목록 (자기 자신 제외 전체)
+def get_competitors(brand):
+    get_brand(brand)
+    return [b for b in BRANDS if b != brand]
+
+
+# 검색 키워드 → CPC 딕셔너리
+def get_cpc_dict():
+    return {info['keyword']: info['cpc'] for info in BRANDS.values()}
+
+
+# 데이터 파일 경로
+def data_file(filename, data_path=DATA_PATH):
+    return os.path.join(data_path, filename)
+
+
+# 데이터 폴더별 추가 브랜드 목록 (synthetic_data.py 가 만든 합성 브랜드 등)
+# spawn 으로 시작한 워커는 부모에서 등록한 브랜드를 모르므로 이 파일을 다시 읽어 등록
+def data_brands_file(data_path=DATA_PATH):
+    return data_file("brands.csv", data_path)
+
+
+def load_data_brands(data_path=DATA_PATH):
+    path = data_brands_file(data_path)
+    if os.path.exists(path) and os.path.abspath(path) != BRANDS_FILE:
+        BRANDS.update(read_brands(path))
+    return BRANDS
+
+
+# 브랜드 추가 등록 (synthetic_data.py 등 실행 중 생성되는 브랜드용)
+# data_path 를 주면 {data_path}/brands.csv 에도 기록 (같은 코드는 덮어씀)
+def register_brand(brand, name, keyword, cpc, prod_prefix, live_prefix, actual_sales_2024, url="", data_path=None):
+    BRANDS[brand] = {'name': name, 'keyword': keyword, 'cpc': cpc, 'url': url, 'prod_prefix': prod_prefix,
+                     'live_prefix': live_prefix, 'actual_sales_2024': actual_sales_2024}
+    if data_path is not None:
+        path = data_brands_file(data_path)
+        saved = read_brands(path) if os.path.exists(path) else {}
+        saved[brand] = BRANDS[brand]
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(brand_fields)
+            for code, info in saved.items():
+                writer.writerow([code] + [info[c] for c in brand_fields[1:]])
+    return BRANDS[brand]
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+import adstock
+import schemas
+from brand_config import DATA_PATH, data_file
+
+##################################################
+######      광고비 예산 배분 최적화 (선형 모델)     #####
+##################################################
+# 선형 모델은 1원당 기여도가 일정하므로 상한이 없으면 예산 전부가 기여도 최대인 한 칸(채널, 날짜)에 몰림 (corner solution)
+# → adstock 포화 feature 가 있는 실험(adstock_added)이면 포화 곡선으로 한계 효과 체감을 반영해서 배분
+# → 포화 feature 가 없으면 채널별 하루 상한(max_daily) 기본값 = 총 예산 / 계획 일수
+channels = ["search_ad_spend_est", "live_ad_spend_est"]
+lag = 3  # build_training_dataset.py 의 shift(3)
+window = 7  # build_training_dataset.py 의 rolling(window=7)
+
+
+# 학습된 ElasticNet 계수 불러오기 (beta_real = 원래 스케일 계수)
+def load_model(brand, experiment="lag_rolling_added", data_path=DATA_PATH):
+    results_df = pd.read_csv(data_file(f"elasticnet_experiments_results_{brand}.csv", data_path))
+    exp_df = results_df[results_df["experiment"] == experiment]
+    if exp_df.empty:
+        raise ValueError(f"experiment '{experiment}' 결과가 없습니다.")
+
+    coefs = dict(zip(exp_df["feature"], exp_df["beta_real"].astype(float)))
+    intercept = coefs.pop("intercept")
+    return coefs, intercept
+
+
+# adstock.py 최적 파라미터 (모델에 adstock feature 가 있을 때만, 없으면 None)
+def load_saturation(coefs, brand, data_path=DATA_PATH):
+    if not any(f in coefs for f in adstock.adstock_feats):
+        return None
+    return adstock.load_params(brand, data_path)
+
+
+# 계획 기간 직전까지의 광고비 / 경쟁사 이벤트 이력 (lag, rolling, adstock 계산용)
+def load_history(brand, data_path=DATA_PATH):
+    model_input_df = schemas.load("elasticnet_data", brand, data_path)
+    history = {c: model_input_df[c].to_numpy(dtype=float) for c in channels + ["competitor_event_flag"]}
+    start_date = model_input_df["date"].max() + pd.Timedelta(days=1)
+    return history, start_date
+
+
+# 후보 스케줄 (K, H) 의 adstock + 포화 feature: 이력 끝의 adstock 상태에서 이어서 변환
+def saturated_feature(schedule, hist, p):
+    K, H = schedule.shape
+    if p.adstock == "geometric":
+        carry = adstock.geometric_adstock(hist, [p.decay])[-1, 0] if len(hist) else 0.0
+        a = lfilter([1.0], [1.0, -p.decay], schedule, axis=1, zi=np.full((K, 1), p.decay * carry))[0]
+    else:
+        hist = hist[-(adstock.max_lag - 1):]
+        hist = np.pad(hist, (adstock.max_lag - 1 - len(hist), 0))
+        extended = np.concatenate([np.broadcast_to(hist, (K, adstock.max_lag - 1)), schedule], axis=1)
+        weights = adstock.delayed_weights([p.decay], [int(p.delay)])[:, 0]
+        a = sliding_window_view(extended, adstock.max_lag, axis=1)[..., ::-1] @ weights
+    return adstock.saturate(a, p.saturation, p.half_sat, p.slope)
+
+
+# 후보 스케줄 (K, H) 배열들로부터 feature 배열 계산
+# 이력을 앞에 붙인 뒤 lag는 shift된 view, 7일 합은 누적합 차이로 계산
+# saturation (adstock 파라미터) 이 있으면 elasticnet_regression.with_adstock 과 같은 이름의 포화 feature 도 계산
+def build_features(schedules, history, competitor_flags, saturation=None):
+    K, H = schedules[channels[0]].shape
+    features = {}
+
+    for c in channels:
+        hist = np.zeros(window - 1) if history is None else history[c][-(window - 1):]
+        hist = np.pad(hist, (window - 1 - len(hist), 0))
+        extended = np.concatenate([np.broadcast_to(hist, (K, window - 1)), schedules[c]], axis=1)
+
+        features[c] = schedules[c]
+        prefix = c.replace("_est", "")
+        features[f"{prefix}_lag{lag}"] = extended[:, window - 1 - lag: window - 1 - lag + H]
+
+        csum = np.concatenate([np.zeros((K, 1)), np.cumsum(extended, axis=1)], axis=1)
+        features[f"{prefix}_{window}d_sum"] = csum[:, window:] - csum[:, :H]
+
+    # 경쟁사 이벤트는 외생 변수 (계획 기간 값 고정)
+    comp_hist = np.zeros(lag) if history is None else history["competitor_event_flag"][-lag:]
+    comp_hist = np.pad(comp_hist, (lag - len(comp_hist), 0))
+    comp = np.concatenate([comp_hist, competitor_flags])
+    features["competitor_event_flag"] = np.broadcast_to(competitor_flags, (K, H))
+    features[f"competitor_event_flag_lag{lag}"] = np.broadcast_to(comp[:H], (K, H))
+
+    if saturation is not None:
+        for p in saturation.itertuples():
+            hist = np.zeros(0) if history is None else history[p.channel]
+            features[p.channel.replace("_est", "_adstock")] = saturated_feature(schedules[p.channel], hist, p)
+    return features
+
+
+# 일별 예측 proxy_sales (K, H)
+def predict(schedules, coefs, intercept, history=None, competitor_flags=None, saturation=None):
+    K, H = schedules[channels[0]].shape
+    if competitor_flags is None:
+        competitor_flags = np.zeros(H)
+    features = build_features(schedules, history, np.asarray(competitor_flags, dtype=float), saturation)
+
+    pred = np.full((K, H), intercept, dtype=float)
+    for f, beta in coefs.items():
+        if f in features:
+            pred += beta * features[f]
+    return pred
+
+
+# 채널/일자별 1원당 한계 기여도 (선형 모델이므로 상수)
+def marginal_values(coefs, intercept, horizon, history=None, competitor_flags=None):
+    n_cells = len(channels) * horizon
+    impulses = np.zeros((n_cells + 1, len(channels), horizon))
+    impulses[np.arange(1, n_cells + 1), np.repeat(np.arange(len(channels)), horizon),
+             np.tile(np.arange(horizon), len(channels))] = 1.0
+    schedules = {c: impulses[:, i, :] for i, c in enumerate(channels)}
+    totals = predict(schedules, coefs, intercept, history, competitor_flags).sum(axis=1)
+    return (totals[1:] - totals[0]).reshape(len(channels), horizon)
+
+
+# 채널/일자별 상한 (C, H) (max_daily=None 이면 무제한)
+def daily_caps(max_daily, horizon):
+    if max_daily is None:
+        return np.full((len(channels), horizon), np.inf)
+    return np.broadcast_to(np.asarray(max_daily, dtype=float)[:, None], (len(channels), horizon))
+
+
+# 한계 기여도가 큰 칸부터 일별 상한까지 채우는 배분 (선형 모델의 최적해)
+def greedy_allocation(marginal, budget, max_daily=None):
+    alloc = np.zeros_like(marginal)
+    caps = daily_caps(max_daily, marginal.shape[1])
+    remaining = budget
+    for idx in np.argsort(-marginal, axis=None):
+        if remaining <= 0:
+            break
+        i, t = np.unravel_index(idx, marginal.shape)
+        alloc[i, t] = min(caps[i, t], remaining)
+        remaining -= alloc[i, t]
+    if remaining > 1e-6:
+        raise ValueError("일별 상한(max_daily) 합계가 총 예산보다 작습니다.")
+    return alloc
+
+
+# 포화 모델의 greedy: 예산을 n_steps 조각으로 나눠 조각마다 예측 합계가 가장 많이 늘어나는 칸에 배분
+# (칸마다 한계 기여도가 배분액에 따라 줄어들므로 매 조각마다 모든 칸을 한 번에 다시 평가)
+def incremental_allocation(coefs, intercept, budget, horizon, history=None, competitor_flags=None, saturation=None,
+                           max_daily=None, n_steps=200):
+    caps = daily_caps(max_daily, horizon)
+    if caps.sum() < budget - 1e-6:
+        raise ValueError("일별 상한(max_daily) 합계가 총 예산보다 작습니다.")
+
+    n_cells = len(channels) * horizon
+    cells = np.eye(n_cells).reshape(n_cells, len(channels), horizon)
+    alloc = np.zeros((len(channels), horizon))
+    remaining = budget
+    while remaining > 1e-6:
+        amount = np.minimum(caps - alloc, min(budget / n_steps, remaining))
+        cands = alloc[None] + cells * amount[None]
+        schedules = {c: cands[:, i, :] for i, c in enumerate(channels)}
+        totals = predict(schedules, coefs, intercept, history, competitor_flags, saturation).sum(axis=1)
+        totals[amount.ravel() <= 0] = -np.inf
+        best = int(np.argmax(totals))
+        alloc = cands[best]
+        remaining -= amount.ravel()[best]
+    return alloc
+
+
+# 후보 스케줄 생성 (무작위 Dirichlet 배분 + 균등/채널 집중 + greedy 해)
+def candidate_schedules(budget, horizon, n_candidates, rng, greedy=None):
+    n_cells = len(channels) * horizon
+    random = rng.dirichlet(np.ones(n_cells), size=n_candidates).reshape(n_candidates, len(channels), horizon)
+
+    structured = [np.full((len(channels), horizon), 1.0 / n_cells)]
+    for i in range(len(channels)):
+        only = np.zeros((len(channels), horizon))
+        only[i] = 1.0 / horizon
+        structured.append(only)
+
+    cands = np.concatenate([random, np.stack(structured)]) * budget
+    if greedy is not None:
+        cands = np.concatenate([cands, greedy[None]])
+    return cands
+
+
+def optimize(coefs, intercept, budget, horizon, history=None, start_date=None, competitor_flags=None,
+             max_daily=None, n_candidates=5000, seed=42, saturation=None):
+    rng = np.random.default_rng(seed)
+
+    if saturation is None:
+        if max_daily is None:
+            max_daily = np.full(len(channels), budget / horizon)
+        marginal = marginal_values(coefs, intercept, horizon, history, competitor_flags)
+        greedy = greedy_allocation(marginal, budget, max_daily)
+    else:
+        greedy = incremental_allocation(coefs, intercept, budget, horizon, history, competitor_flags, saturation,
+                                        max_daily)
+    cands = candidate_schedules(budget, horizon, n_candidates, rng, greedy)
+
+    # 일별 상한을 넘는 후보 제외
+    if max_daily is not None:
+        caps = np.asarray(max_daily, dtype=float)[None, :, None]
+        cands = cands[(cands <= caps + 1e-9).all(axis=(1, 2))]
+
+    # 모든 후보를 한 번에 평가
+    schedules = {c: cands[:, i, :] for i, c in enumerate(channels)}
+    totals = predict(schedules, coefs, intercept, history, competitor_flags, saturation).sum(axis=1)
+    best = int(np.argmax(totals))
+
+    best_schedules = {c: cands[best:best + 1, i, :] for i, c in enumerate(channels)}
+    daily_pred = predict(best_schedules, coefs, intercept, history, competitor_flags, saturation)[0]
+
+    if start_date is None:
+        start_date = pd.Timestamp.today().normalize()
+    plan_df = pd.DataFrame({
+        "date": pd.date_range(start_date, periods=horizon, freq="D"),
+        "search_ad_spend_est": cands[best, 0],
+        "live_ad_spend_est": cands[best, 1],
+        "proxy_sales_pred": daily_pred,
+    })
+    return plan_df, totals[best], len(cands)
+
+
+def run(brand, budget, horizon, experiment="lag_rolling_added", data_path=DATA_PATH, max_daily=None,
+        n_candidates=5000, seed=42):
+    coefs, intercept = load_model(brand, experiment, data_path)
+    history, start_date = load_history(brand, data_path)
+    return optimize(coefs, intercept, budget, horizon, history, start_date, max_daily=max_daily,
+                    n_candidates=n_candidates, seed=seed, saturation=load_saturation(coefs, brand, data_path))
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    budget = 100_000_000  # 총 예산 (원)
+    horizon = 28  # 계획 기간 (일)
+
+    plan_df, total, n_evaluated = run(brand, budget, horizon)
+    print(plan_df)
+    print(f"후보 {n_evaluated}개 평가, 예측 proxy_sales 합계: {total:,.0f}")
@@ -1,86 +1,15 @@
-import pandas as pd
-
-brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
-
-#############################################
-######        최종 학습 데이터 구축        #####
-#############################################
-data_path = r"data"
-# CSV 불러오기
-live_df = pd.read_csv(rf"{data_path}\live_info_{brand}_2.csv")
-search_df = pd.read_csv(rf"{data_path}\search_volume_total.csv")
-search_df = search_df[search_df["brand"].str.contains("비에날씬", na=False)]  # 비에날씬 검색량만
-proxy_df = pd.read_csv(rf"{data_path}\proxy_sales_{brand}.csv")
-
-# 경쟁사 파일 선택
-brand_competitors = {
-    'B': [rf"{data_path}\live_info_D.csv", rf"{data_path}\live_info_L.csv"],
-    'D': [rf"{data_path}\live_info_B.csv", rf"{data_path}\live_info_L.csv"],
-    'L': [rf"{data_path}\live_info_B.csv", rf"{data_path}\live_info_D.csv"]
-}
-
-try:
-    competitor_files = brand_competitors[brand]
-except KeyError:
-    raise ValueError("brand는 'B', 'D', 'L' 중 하나여야 합니다.")
-
-competitor_events = []  # 경쟁사 프로모션 여부
-
-for f in competitor_files:
-    df = pd.read_csv(f)[["date", "promotion_flag"]]
-    df["date"] = pd.to_datetime(df["date"])
-    df["promotion_flag"] = df["promotion_flag"].fillna(0)
-    competitor_events.append(df)
-
-# 모든 경쟁사 데이터 합치기
-competitor_df = pd.concat(competitor_events)
-# 같은 날짜에 이벤트가 하나라도 있으면 1
-competitor_df = competitor_df.groupby("date")["promotion_flag"].max().reset_index()
-competitor_df.rename(columns={"promotion_flag": "competitor_event_flag"}, inplace=True)
-
-# 날짜 datetime 변환
-for df in [live_df, search_df, proxy_df]:
-    df["date"] = pd.to_datetime(df["date"])
-
-# 필요한 컬럼만 추출
-live_df = live_df[["date", "live_ad_spend_est"]]
-search_df = search_df[["date", "ad_spend_est"]]
-proxy_df = proxy_df[["date", "proxy_sales"]]
-
-search_df.rename(columns={"ad_spend_est": "search_ad_spend_est"}, inplace=True)
-
-# 날짜 기준으로 병합
-merged_df = proxy_df.merge(search_df, on="date", how="outer") \
-                     .merge(live_df, on="date", how="outer") \
-                     .merge(competitor_df, on="date", how="left") \
-                     .fillna(0)
-
-# 정렬 (시계열 순서 유지)
-merged_df = merged_df.sort_values("date").reset_index(drop=True)
-
-# Lag / Rolling 추가
-model_input_df = merged_df.copy()
-
-# 광고비 lag (3일)
-model_input_df["search_ad_spend_lag3"] = model_input_df["search_ad_spend_est"].shift(3)
-model_input_df["live_ad_spend_lag3"] = model_input_df["live_ad_spend_est"].shift(3)
-
-# 광고비 rolling sum (7일 누적합)
-model_input_df["search_ad_spend_7d_sum"] = (
-    model_input_df["search_ad_spend_est"].rolling(window=7, min_periods=1).sum()
-)
-model_input_df["live_ad_spend_7d_sum"] = (
-    model_input_df["live_ad_spend_est"].rolling(window=7, min_periods=1).sum()
-)
-
-# 경쟁사 이벤트 lag (3일)
-model_input_df["competitor_event_flag_lag3"] = model_input_df["competitor_event_flag"].shift(3)
+import io
+import os
 
-# month 변수 추가
-model_input_df["month"] = model_input_df["date"].dt.month
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
-# NaN 처리
-model_input_df = model_input_df.fillna(0)
+import instrumentation
+import schemas
+from brand_config import DATA_PATH, data_file, get_brand
+from competitor_events import CompetitorEvents
+from daily_join import join_daily, to_daily
 
 # 최종 feature 순서 정리
 final_columns = [
@@ -97,30 +26,168 @@ final_columns = [
     "proxy_sales"
 ]
 
-model_input_df = model_input_df[final_columns]
-
-# 데이터 저장
-model_input_df.to_csv(rf"{data_path}\elasticnet_data_{brand}.csv", index=False, encoding="utf-8-sig")
-
-
-# # 7일 단위 데이터 구축 (Optional)
-# start_date = merged_df["date"].min()
-# merged_df["days_since_start"] = (merged_df["date"] - start_date).dt.days
-# merged_df["week_index"] = (merged_df["days_since_start"] // 7).astype(int)
-#
-# # 7일 단위로 합계 집계
-# weekly_df = (
-#     merged_df.groupby("week_index")[["live_ad_spend_est", "search_ad_spend_est", "proxy_sales", "competitor_event_flag"]]
-#     .sum().reset_index()
-# )
-#
-# # 주 시작일 계산
-# weekly_df["week_start"] = start_date + pd.to_timedelta(weekly_df["week_index"] * 7, unit="D")
-# weekly_df = weekly_df[["week_start", "live_ad_spend_est", "search_ad_spend_est", "competitor_event_flag", "proxy_sales"]]
-#
-# # 경쟁사 이벤트 여부 0 이상이면 다 1로
-# weekly_df["competitor_event_flag"] = (weekly_df["competitor_event_flag"] > 0).astype(int)
-#
-# # 데이터 저장
-# weekly_df.to_csv(rf"{data_path}\elasticnet_data_week_{brand}.csv", index=False, encoding="utf-8-sig")
 
+# 경쟁사 프로모션 여부 (같은 날짜에 이벤트가 하나라도 있으면 1)
+# events: competitor_events.CompetitorEvents (여러 브랜드 실행 시 한 번만 만들어서 공유)
+def load_competitor_events(brand, data_path=DATA_PATH, events=None, since=None):
+    if events is None:
+        events = CompetitorEvents.from_live_info(data_path, since=since)
+    return events.competitor_frame(brand)[["date", "competitor_event_flag"]]
+
+
+#############################################
+######        최종 학습 데이터 구축        #####
+#############################################
+@instrumentation.traced("merge")
+def build_training_dataset(brand, live_df, search_df, proxy_df, competitor_df, start=None):
+    keyword = get_brand(brand)['keyword']
+
+    search_df = search_df[search_df["brand"].str.contains(keyword, na=False)]  # 해당 브랜드 검색량만
+
+    # 날짜 datetime 변환 + 필요한 컬럼만 추출
+    live_df = live_df[["date", "live_ad_spend_est"]].assign(date=lambda d: pd.to_datetime(d["date"]))
+    search_df = search_df[["date", "ad_spend_est"]].assign(date=lambda d: pd.to_datetime(d["date"]))
+    proxy_df = proxy_df[["date", "proxy_sales"]].assign(date=lambda d: pd.to_datetime(d["date"]))
+
+    search_df = search_df.rename(columns={"ad_spend_est": "search_ad_spend_est"})
+
+    # 소스별 일 단위 집계 후 공통 달력 위에 병합 (경쟁사 이벤트는 달력 범위 안에서만)
+    merged_df = join_daily(
+        [to_daily(proxy_df, {"proxy_sales": "sum"}),
+         to_daily(search_df, {"search_ad_spend_est": "sum"}),
+         to_daily(live_df, {"live_ad_spend_est": "sum"})],
+        lookups=[to_daily(competitor_df, {"competitor_event_flag": "max"})],
+        start=start,
+    ).fillna(0)
+
+    return add_lag_rolling(merged_df)[final_columns]
+
+
+# 광고비 rolling sum (7일 누적합)
+# 창마다 같은 순서로 더하므로 어느 지점에서 다시 계산해도 전체 재계산과 값이 동일함
+def rolling_sum(values, window=7):
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    padded = np.concatenate([np.zeros(window - 1), values])
+    return sliding_window_view(padded, window).sum(axis=1)
+
+
+# Lag / Rolling 추가
+@instrumentation.traced()
+def add_lag_rolling(merged_df):
+    model_input_df = merged_df.copy()
+
+    # 광고비 lag (3일)
+    model_input_df["search_ad_spend_lag3"] = model_input_df["search_ad_spend_est"].shift(3)
+    model_input_df["live_ad_spend_lag3"] = model_input_df["live_ad_spend_est"].shift(3)
+
+    # 광고비 rolling sum (7일 누적합)
+    model_input_df["search_ad_spend_7d_sum"] = rolling_sum(model_input_df["search_ad_spend_est"])
+    model_input_df["live_ad_spend_7d_sum"] = rolling_sum(model_input_df["live_ad_spend_est"])
+
+    # 경쟁사 이벤트 lag (3일)
+    model_input_df["competitor_event_flag_lag3"] = model_input_df["competitor_event_flag"].shift(3)
+
+    # month 변수 추가
+    model_input_df["month"] = model_input_df["date"].dt.month
+
+    # NaN 처리 (부분 구간만 계산해도 dtype이 같도록 고정)
+    model_input_df = model_input_df.fillna(0)
+    float_cols = [c for c in final_columns if c not in ("date", "month")]
+    return model_input_df.astype({c: float for c in float_cols if c in model_input_df})
+
+
+def run(brand, data_path=DATA_PATH, search_df=None, events=None):
+    # CSV 불러오기 (검색량 데이터는 공유 입력으로 전달 가능)
+    live_df = schemas.load("live_info_2", brand, data_path)
+    if search_df is None:
+        search_df = schemas.load("search_volume", data_path=data_path)
+    proxy_df = schemas.load("proxy_sales", brand, data_path)
+    competitor_df = load_competitor_events(brand, data_path, events)
+
+    model_input_df = build_training_dataset(brand, live_df, search_df, proxy_df, competitor_df)
+
+    # 데이터 저장
+    instrumentation.to_csv(model_input_df, data_file(f"elasticnet_data_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return model_input_df
+
+
+# CSV 끝부분 n행만 읽기 (전체 이력을 읽지 않음)
+# float 는 round_trip 으로 읽어야 저장된 값과 비트 단위로 같음 → 이어 계산한 lag / rolling 이 전체 재계산과 동일
+def read_csv_tail(path, n, block_size=1 << 16):
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(0, os.SEEK_END)
+        end = pos = f.tell()
+        data = b""
+        while pos > len(header) and data.count(b"\n") <= n:
+            pos = max(len(header), pos - block_size)
+            f.seek(pos)
+            data = f.read(end - pos)
+    lines = [line for line in data.splitlines() if line.strip()][-n:] if n > 0 else []
+    return pd.read_csv(io.BytesIO(header + b"\n".join(lines) + b"\n"), encoding="utf-8-sig",
+                       float_precision="round_trip")
+
+
+#############################################
+######     증분 추가 (새 날짜만 계산)      #####
+#############################################
+# 기존 elasticnet_data_{brand}.csv 마지막 날짜 이후의 행만 만들어 뒤에 추가
+# (이미 저장된 날짜의 원천 데이터는 바뀌지 않는다고 가정)
+@instrumentation.traced()
+def build_incremental(brand, tail_df, live_df, search_df, proxy_df, competitor_df):
+    last_date = tail_df["date"].max()
+
+    # 새 날짜만 선택
+    def new_rows(df):
+        return df[pd.to_datetime(df["date"]) > last_date]
+
+    new_df = build_training_dataset(brand, new_rows(live_df), new_rows(search_df), new_rows(proxy_df),
+                                    new_rows(competitor_df), start=last_date + pd.Timedelta(days=1))
+    if new_df.empty:
+        return new_df
+
+    # 기존 마지막 6행(lag 3 / rolling 7 상태)을 앞에 붙여서 lag / rolling 다시 계산
+    base_cols = ["date", "search_ad_spend_est", "live_ad_spend_est", "competitor_event_flag", "proxy_sales"]
+    state_df = tail_df[base_cols]
+    combined_df = pd.concat([state_df, new_df[base_cols]], ignore_index=True)
+    return add_lag_rolling(combined_df)[final_columns].iloc[len(state_df):].reset_index(drop=True)
+
+
+def run_incremental(brand, data_path=DATA_PATH, search_df=None, events=None):
+    out_path = data_file(f"elasticnet_data_{brand}.csv", data_path)
+    if not os.path.exists(out_path):
+        return run(brand, data_path, search_df, events)
+
+    tail_df = read_csv_tail(out_path, 6)
+    tail_df["date"] = pd.to_datetime(tail_df["date"])
+
+    # CSV 불러오기 (마지막 날짜 이후 행만 보관)
+    last_date = tail_df["date"].max()
+    live_df = schemas.load("live_info_2", brand, data_path, since=last_date)
+    if search_df is None:
+        search_df = schemas.load("search_volume", data_path=data_path, since=last_date)
+    proxy_df = schemas.load("proxy_sales", brand, data_path, since=last_date)
+    competitor_df = load_competitor_events(brand, data_path, events, since=last_date)
+
+    new_df = build_incremental(brand, tail_df, live_df, search_df, proxy_df, competitor_df)
+
+    # 새 행만 이어 쓰기
+    if not new_df.empty:
+        instrumentation.to_csv(new_df, out_path, mode="a", header=False, index=False, encoding="utf-8-sig")
+    print(f"[{brand}] {len(new_df)}개 행 추가")
+    return new_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    incremental = False  # True: 기존 데이터 뒤에 새 날짜만 추가
+
+    if incremental:
+        run_incremental(brand)
+    else:
+        run(brand)
+
+
+# 7일 / ISO 주 / 월 / N일 단위 데이터는 resample.py 참고 (일 단위 결과의 누적합에서 바로 집계)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import instrumentation
+import schemas
+from brand_config import BRANDS, DATA_PATH
+
+#############################################
+######   경쟁사 이벤트 행렬 (날짜 × 브랜드)   #####
+#############################################
+# 모든 브랜드의 live_info 를 한 번만 읽어서 날짜별 프로모션 라이브 수를 희소 행렬(CSC)로 저장
+# 브랜드별 "경쟁사 중 하나라도 프로모션" 플래그 = (날짜별 전체 합 - 자기 열) > 0
+# → 브랜드마다 경쟁사 파일을 다시 읽고 concat / groupby 하지 않음
+
+
+class CompetitorEvents:
+    def __init__(self, calendar, brands, counts):
+        self.calendar = pd.DatetimeIndex(calendar, name="date")
+        self.brands = list(brands)
+        self.counts = sparse.csc_matrix(counts)  # (날짜 수, 브랜드 수) 프로모션 라이브 수
+        self._col = {b: i for i, b in enumerate(self.brands)}
+        self._total = np.asarray(self.counts.sum(axis=1)).ravel()  # 날짜별 전체 브랜드 합
+
+    # 브랜드별 live_info 에서 (날짜, promotion_flag) 만 읽어서 행렬 생성 (since 를 주면 그 이후 날짜만)
+    @classmethod
+    @instrumentation.traced("load", name="competitor_events")
+    def from_live_info(cls, data_path=DATA_PATH, brands=None, since=None):
+        brands = list(BRANDS) if brands is None else list(brands)
+        dates, cols = [], []
+        for i, brand in enumerate(brands):
+            df = schemas.load("live_info", brand, data_path, columns=["date", "promotion_flag"], since=since)
+            event_dates = df.loc[df["promotion_flag"] == 1, "date"].to_numpy(dtype="datetime64[D]")
+            dates.append(event_dates)
+            cols.append(np.full(len(event_dates), i))
+        return cls.from_events(np.concatenate(dates) if dates else np.array([], dtype="datetime64[D]"),
+                               np.concatenate(cols) if cols else np.array([], dtype=int), brands)
+
+    # (이벤트 날짜, 브랜드 열 번호) 배열 → 행렬 (같은 칸 중복은 합산)
+    @classmethod
+    def from_events(cls, event_dates, brand_idx, brands):
+        event_dates = np.asarray(event_dates, dtype="datetime64[D]")
+        if len(event_dates) == 0:
+            return cls(pd.DatetimeIndex([]), brands, sparse.csc_matrix((0, len(brands)), dtype=np.int32))
+
+        start = event_dates.min()
+        rows = (event_dates - start).astype(np.int64)
+        calendar = pd.date_range(pd.Timestamp(start), periods=int(rows.max()) + 1, freq="D")
+        counts = sparse.coo_matrix((np.ones(len(rows), dtype=np.int32), (rows, np.asarray(brand_idx))),
+                                   shape=(len(calendar), len(brands)))
+        return cls(calendar, brands, counts.tocsc())
+
+    def competitors(self, brand):
+        if brand not in self._col:
+            raise ValueError(f"이벤트 행렬에 없는 브랜드입니다: {brand}")
+        return [b for b in self.brands if b != brand]
+
+    # 날짜별 경쟁사 프로모션 라이브 수 합계 (전체 합 - 자기 열)
+    def competitor_total(self, brand):
+        self.competitors(brand)
+        own = self.counts[:, self._col[brand]].toarray().ravel()
+        return self._total - own
+
+    # 경쟁사 중 하나라도 프로모션이 있으면 1
+    def competitor_flag(self, brand):
+        return (self.competitor_total(brand) > 0).astype(np.int8)
+
+    # 경쟁사별 날짜 프로모션 라이브 수 (희소 행렬, 열 순서 = competitors(brand))
+    def competitor_counts(self, brand):
+        keep = [self._col[b] for b in self.competitors(brand)]
+        return self.counts[:, keep]
+
+    # lag 일 뒤로 민 값 (앞쪽은 0)
+    @staticmethod
+    def lagged(values, lag):
+        values = np.asarray(values)
+        out = np.zeros_like(values)
+        if lag < len(values):
+            out[lag:] = values[:len(values) - lag]
+        return out
+
+    # build_training_dataset.py 입력 형태 (행렬 달력 전체, 달력 밖 날짜는 결합 시 0)
+    def competitor_frame(self, brand, lags=()):
+        flag = self.competitor_flag(brand)
+        frame = pd.DataFrame({"date": self.calendar, "competitor_event_flag": flag,
+                              "competitor_event_count": self.competitor_total(brand)})
+        for lag in lags:
+            frame[f"competitor_event_flag_lag{lag}"] = self.lagged(flag, lag)
+        return frame
@@ -0,0 +1,100 @@
+import json
+import os
+from urllib.parse import urlparse
+
+#############################################
+######     크롤링 상태 저장 / 이어하기      #####
+#############################################
+# 방송 하나를 처리할 때마다 journal(JSON Lines)에 한 줄씩 추가
+# 재실행 시 journal 을 다시 읽어 방문한 방송 / 상품명→상품코드 / 다음 코드 번호를 복원
+# → 중간에 중단돼도 처리한 방송은 유지되고, 코드 부여도 실행마다 바뀌지 않음
+
+
+# 방송 url 키 (쿼리스트링 제외: ?fm=shoppinglive&sn=home 등)
+def url_key(url):
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{parsed.path}".rstrip("/")
+
+
+class CrawlState:
+    def __init__(self, path, prod_prefix, live_prefix):
+        self.path = path
+        self.prod_prefix = prod_prefix
+        self.live_prefix = live_prefix
+
+        self.visited = {}  # url 키 → live_code
+        self.prod_index = {}  # 상품명 → prod_code (O(1) 중복 확인)
+        self.live_results = []  # (live_code, live_name, live_url, prod_codes)
+        self.prod_results = []  # (prod_code, prod_name, prod_price, prod_url)
+
+        if path and os.path.exists(path):
+            self._replay()
+
+    def _replay(self):
+        good_offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break  # 마지막 줄이 쓰다가 끊긴 경우
+                self._apply(record)
+                good_offset += len(line)
+
+        # 끊긴 줄은 잘라내고 그 뒤부터 이어 쓰기
+        if good_offset < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
+
+    def _apply(self, record):
+        self.visited[url_key(record["live_url"])] = record["live_code"]
+        self.live_results.append((record["live_code"], record["live_name"], record["live_url"],
+                                  ",".join(record["prod_codes"])))
+        for code, name, price, prod_url in record["new_products"]:
+            self.prod_index[name] = code
+            self.prod_results.append((code, name, price, prod_url))
+
+    def is_visited(self, url):
+        return url_key(url) in self.visited
+
+    # 방송 결과에 코드 부여 후 journal 에 기록 (checkpoint)
+    # 상품을 하나도 못 찾은 방송은 기록하지 않음 (코드 없이 None 반환 → 다음 실행에서 다시 시도)
+    def add_broadcast(self, url, live_name, products):
+        if self.is_visited(url):
+            return self.visited[url_key(url)]
+        if not products:
+            return None
+
+        live_code = f"{self.live_prefix}_{len(self.live_results) + 1:03d}"  # 라이브 코드
+        prod_codes, new_products = [], []
+        next_index = len(self.prod_results) + 1
+
+        for name, prod_url, price in products:
+            code = self.prod_index.get(name)
+            if code is None:
+                # 상품 코드 BP_001, BP_002, ...
+                code = f"{self.prod_prefix}_{next_index:03d}"
+                next_index += 1
+                new_products.append((code, name, price, prod_url))
+                self.prod_index[name] = code  # 같은 방송 안의 중복도 처리
+            prod_codes.append(code)
+
+        record = {"live_code": live_code, "live_name": live_name, "live_url": url,
+                  "prod_codes": prod_codes, "new_products": new_products}
+        self._write(record)
+
+        # prod_index 는 위에서 이미 갱신됨
+        self.visited[url_key(url)] = live_code
+        self.live_results.append((live_code, live_name, url, ",".join(prod_codes)))
+        self.prod_results.extend(new_products)
+        return live_code
+
+    def _write(self, record):
+        if not self.path:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
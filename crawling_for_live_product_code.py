@@ -3,29 +3,90 @@ from selenium.webdriver.edge.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs, unquote
-import time
+import queue
+import threading
 import csv
 import html
 import json
 
+from brand_config import get_brand
+from crawl_state import CrawlState
+
+PRODUCT_SELECTOR = "div.ProductList_item_erjbw"
+EMPTY_SELECTOR = "[class*='ProductList_empty']"  # 상품 없음 안내 영역
+BROADCAST_SELECTOR = "a.VideoBoxLinkWrapper_wrap_GLkZS"
+
+
+# Edge 드라이버 생성 (headless: 화면 없이 실행, 로컬 테스트 서버용)
+def make_driver(driver_path, headless=False):
+    options = webdriver.EdgeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    driver = webdriver.Edge(service=Service(driver_path), options=options)
+    if not headless:
+        driver.maximize_window()  # 브라우저 시작 후 최대화
+    return driver
+
+
+# 요소 개수가 연속 poll 동안 변하지 않으면 로딩 완료로 판단
+# 개수가 0 이면 아직 로딩 전일 수 있으므로 empty_locator(상품 없음 안내)가 보일 때만 완료
+class element_count_stable:
+    def __init__(self, locator, stable_polls=2, empty_locator=None):
+        self.locator = locator
+        self.stable_polls = stable_polls
+        self.empty_locator = empty_locator
+        self.last_count = -1
+        self.hits = 0
+
+    def __call__(self, driver):
+        count = len(driver.find_elements(*self.locator))
+        if count == self.last_count:
+            self.hits += 1
+        else:
+            self.last_count, self.hits = count, 0
+        if self.hits < self.stable_polls:
+            return False
+        return count > 0 or (self.empty_locator is not None and len(driver.find_elements(*self.empty_locator)) > 0)
+
+
+# 스크롤 후 문서 높이가 늘어날 때까지 대기 (늘어나지 않으면 False)
+def wait_height_change(driver, last_height, timeout):
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script("return document.body.scrollHeight") > last_height)
+    except TimeoutException:
+        return False
+
+
+# 문서 로드 완료 대기
+def wait_ready(driver, timeout):
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: d.execute_script("return document.readyState") == "complete")
+
+
 class LiveScraper:
-    def __init__(self, driver_path, url):
-        self.service = Service(driver_path)
-        self.driver = webdriver.Edge(service=self.service)
-        self.driver.maximize_window()  # 브라우저 시작 후 최대화
+    # driver 를 넘기면 기존 브라우저 재사용 (드라이버 풀)
+    def __init__(self, driver_path, url, driver=None, timeout=10):
+        self.own_driver = driver is None
+        self.driver = make_driver(driver_path) if driver is None else driver
         self.url = url
+        self.timeout = timeout
         self.results = []
-    
+
     # 라이브 방송 페이지 로드
     def load_page(self):
+        self.driver.switch_to.default_content()  # 이전 방송에서 iframe 으로 전환된 상태 해제
         self.driver.get(self.url)
-        time.sleep(3)  # 페이지 로드 대기
+        wait_ready(self.driver, self.timeout)  # 페이지 로드 대기
 
         # iframe 존재시 전환
         iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
         if iframes:
             self.driver.switch_to.frame(iframes[0])
+            wait_ready(self.driver, self.timeout)
 
     def click_show_all(self):
         try:
@@ -38,27 +99,46 @@ class LiveScraper:
                     b.click()
                     clicked = True
                     # print("'전체 보기' 버튼 클릭 완료")
-                    time.sleep(3)  # 클릭 후 로딩 대기
+                    self.wait_products_loaded()  # 클릭 후 상품 개수가 안정될 때까지 대기
                     break
             if not clicked:
                 print("'전체 보기' 버튼이 없거나 이미 전체 표시됨")
         except Exception as e:
             print("버튼 클릭 오류:", e)
 
+    # 상품 목록 개수 안정화 대기
+    def wait_products_loaded(self):
+        try:
+            WebDriverWait(self.driver, self.timeout, poll_frequency=0.3).until(
+                element_count_stable((By.CSS_SELECTOR, PRODUCT_SELECTOR),
+                                     empty_locator=(By.CSS_SELECTOR, EMPTY_SELECTOR)))
+        except TimeoutException:
+            pass
+
     # 스크롤하여 모든 상품 로딩
-    def scroll_to_load(self):
+    def scroll_to_load(self, scroll_timeout=2):
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         while True:
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
+            if not wait_height_change(self.driver, last_height, scroll_timeout):
                 break
-            last_height = new_height
+            last_height = self.driver.execute_script("return document.body.scrollHeight")
+        self.wait_products_loaded()
+
+    # 라이브 제목
+    def get_live_name(self, default):
+        try:
+            meta_tag = self.driver.find_element(By.CSS_SELECTOR, "meta[property='og:title']")
+            return meta_tag.get_attribute("content").strip()
+        except:
+            try:
+                return self.driver.title.strip()
+            except:
+                return default
 
     # 상품 정보 추출 (상품명, url)
     def extract_products(self):
-        items = self.driver.find_elements(By.CSS_SELECTOR, "div.ProductList_item_erjbw")
+        items = self.driver.find_elements(By.CSS_SELECTOR, PRODUCT_SELECTOR)
         for item in items:
             try:
                 a_title = item.find_element(By.CSS_SELECTOR, "strong.ProductTitle_wrap_gGxmc a")
@@ -71,7 +151,7 @@ class LiveScraper:
                 raw_url = a_title.get_attribute("href")
                 qs = parse_qs(urlparse(raw_url).query)
                 prod_url = unquote(qs.get("sourceUrl", [raw_url])[0])
-                
+
                 # 상품 가격
                 data = a_thumb.get_attribute("data-shp-contents-dtl")
                 price = ""
@@ -87,43 +167,146 @@ class LiveScraper:
                 # strong a 태그 없으면 건너뜀 (상품이 아님)
                 continue
         return self.results
-    
+
     # csv 저장
     def save_csv(self, filename):
         with open(filename, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(["prod_code", "prod_name", "prod_url"])
             writer.writerows(self.results)
-    
-    # 브라우저 종료
+
+    # 브라우저 종료 (풀에서 빌린 드라이버는 종료하지 않음)
     def quit(self):
-        self.driver.quit()
+        if self.own_driver:
+            self.driver.quit()
+
+
+# 드라이버 세션이 살아 있는지 확인 (브라우저가 죽었거나 세션이 끊기면 예외)
+def driver_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+# 고정 크기 WebDriver 풀 (브라우저를 방송마다 새로 띄우지 않고 재사용)
+# 반납 시 세션을 확인해서 죽은 드라이버는 종료하고 새 드라이버로 교체 (다음 방송이 죽은 세션을 받지 않음)
+class DriverPool:
+    def __init__(self, size, driver_factory):
+        self.driver_factory = driver_factory
+        self.drivers = [driver_factory() for _ in range(size)]
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.n_replaced = 0
+        for driver in self.drivers:
+            self.idle.put(driver)
+
+    # 교체에 실패한 자리(None)는 빌릴 때 다시 생성
+    def acquire(self):
+        driver = self.idle.get()
+        if driver is None:
+            try:
+                driver = self._new_driver()
+            except Exception:
+                self.idle.put(None)
+                raise
+        return driver
+
+    def release(self, driver):
+        if not driver_alive(driver):
+            self._discard(driver)
+            try:
+                driver = self._new_driver()
+            except Exception as e:
+                print(f"드라이버 교체 실패: {e}")
+                driver = None
+        self.idle.put(driver)
+
+    def _new_driver(self):
+        driver = self.driver_factory()
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+    def _discard(self, driver):
+        with self.lock:
+            self.n_replaced += 1
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 방송 하나 크롤링 → (url, 라이브 제목, [(name, url, price), ...])
+def crawl_broadcast(pool, url, index, timeout=10):
+    driver = pool.acquire()
+    try:
+        scraper = LiveScraper(None, url, driver=driver, timeout=timeout)
+        scraper.load_page()
+        scraper.click_show_all()
+        scraper.scroll_to_load()
+        live_name = scraper.get_live_name(f"라이브_{index + 1}")
+        products = scraper.extract_products()  # (name, url, price) 리스트
+        return url, live_name, products
+    finally:
+        pool.release(driver)
+
+
+# 방송들을 드라이버 풀에서 동시에 크롤링 (결과는 broadcast_urls 순서대로 하나씩 반환)
+def iter_crawl_broadcasts(broadcast_urls, pool_size, driver_factory, timeout=10):
+    with DriverPool(pool_size, driver_factory) as pool, ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = [executor.submit(crawl_broadcast, pool, url, i, timeout) for i, url in enumerate(broadcast_urls)]
+        for i, future in enumerate(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[{i+1}/{len(broadcast_urls)}] 크롤링 실패: {broadcast_urls[i]} ({e})")
+                continue
+            print(f"[{i+1}/{len(broadcast_urls)}] 총 {len(result[2])}개의 상품 추출 완료: {broadcast_urls[i]}")
+            yield result
+
+
+def crawl_broadcasts(broadcast_urls, pool_size, driver_factory, timeout=10):
+    return list(iter_crawl_broadcasts(broadcast_urls, pool_size, driver_factory, timeout))
 
 
 # 전체 쇼핑라이브 url 리스트 얻기
-def get_broadcast_urls(driver, channel_url):
+def get_broadcast_urls(driver, channel_url, scroll_timeout=2, timeout=10):
     driver.get(channel_url)
-    time.sleep(3)  # 초기 페이지 로드
+    wait_ready(driver, timeout)  # 초기 페이지 로드
 
     broadcast_urls = set()  # 중복 제거
     last_height = driver.execute_script("return document.body.scrollHeight")
 
     while True:
         # 방송 링크 추출
-        links = driver.find_elements(By.CSS_SELECTOR, "a.VideoBoxLinkWrapper_wrap_GLkZS")
+        links = driver.find_elements(By.CSS_SELECTOR, BROADCAST_SELECTOR)
         for a in links:
             href = a.get_attribute("href")
             if href:
                 broadcast_urls.add(href)
 
-        # 스크롤해서 전체 라이브 얻기
+        # 스크롤해서 전체 라이브 얻기 (더 이상 로드될 방송이 없으면 종료)
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)  # 로딩 대기
-
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:  # 더 이상 로드될 방송이 없으면 종료
+        if not wait_height_change(driver, last_height, scroll_timeout):
             break
-        last_height = new_height
+        last_height = driver.execute_script("return document.body.scrollHeight")
 
     return list(broadcast_urls)
 
@@ -136,80 +319,40 @@ def save_to_csv(data, filename, headers=None, encoding="utf-8-sig"):
         writer.writerows(data)
 
 
+# 크롤링 결과에 라이브 코드 / 상품 코드 부여 (상태 파일 없이 메모리에서만)
+def assign_codes(crawled, prod_prefix, live_prefix):
+    state = CrawlState(None, prod_prefix, live_prefix)
+    for url, live_name, products in crawled:
+        state.add_broadcast(url, live_name, products)
+    return state.live_results, state.prod_results
+
+
 def main():
     driver_path = r'C:\Users\ilimo\Downloads\edgedriver_win64\msedgedriver.exe'  # 드라이버 경로
-
-    # 브랜드 정보 딕셔너리
-    brand_info = {
-        'B': {'url': "https://shoppinglive.naver.com/channels/51290", 'prod_prefix': 'BP', 'live_prefix': 'BL', 'name': '비에날씬'},
-        'D': {'url': "https://shoppinglive.naver.com/channels/26959", 'prod_prefix': 'DP', 'live_prefix': 'DL', 'name': '덴마크'},
-        'L': {'url': "https://shoppinglive.naver.com/channels/12886", 'prod_prefix': 'LP', 'live_prefix': 'LL', 'name': '락토핏'}
-    }
+    pool_size = 4  # 동시에 띄울 브라우저 수
 
     # 사용할 브랜드 (비에날씬, 덴마크, 락토핏)
     brand = 'D'  # 'B', 'D', 'L' *********************************************************************************************************************************
-    channel_url = brand_info[brand]['url']
-    prod_prefix = brand_info[brand]['prod_prefix']
-    live_prefix = brand_info[brand]['live_prefix']
-    brand_name = brand_info[brand]['name']
+    info = get_brand(brand)  # 브랜드 레지스트리
+    channel_url = info['url']
+    prod_prefix = info['prod_prefix']
+    live_prefix = info['live_prefix']
+    brand_name = info['name']
+
+    # 이전 크롤링 상태 복원 (방문한 방송, 상품명→상품코드, 다음 코드 번호)
+    state = CrawlState(f"crawl_state_{brand}.jsonl", prod_prefix, live_prefix)
 
     # 드라이버로 방송 URL 먼저 수집
-    service = Service(driver_path)
-    driver = webdriver.Edge(service=service)
-    driver.maximize_window()  # 화면 최대화
+    driver = make_driver(driver_path)
     broadcast_urls = get_broadcast_urls(driver, channel_url)
     driver.quit()
-    print(f"총 {len(broadcast_urls)}개의 방송 발견")
-
-    live_results = []
-    prod_results = []
-
-    existing_names = set()  # 중복 상품 체크용 집합
-    prod_index = 1  # 상품 코드 인덱스 1부터 시작
-
-    # 각 쇼핑라이브 크롤링
-    for i, url in enumerate(broadcast_urls):
-        print(f"[{i+1}/{len(broadcast_urls)}] 크롤링 시작: {url}")
-        scraper = LiveScraper(driver_path, url)  # LiveScraper 객체
-        scraper.load_page()
-        scraper.click_show_all()
-        scraper.scroll_to_load()
-
-        # 라이브 제목
-        try:
-            meta_tag = scraper.driver.find_element(By.CSS_SELECTOR, "meta[property='og:title']")
-            live_name = meta_tag.get_attribute("content").strip()
-        except:
-            try:
-                live_name = scraper.driver.title.strip()
-            except:
-                live_name = f"라이브_{i + 1}"
-        live_code = f"{live_prefix}_{i+1:03d}"  # 라이브 코드
-
-        # 상품 추출
-        products = scraper.extract_products()  # (name, url, price) 리스트
+    new_urls = [url for url in broadcast_urls if not state.is_visited(url)]
+    print(f"총 {len(broadcast_urls)}개의 방송 발견 (새 방송 {len(new_urls)}개)")
 
-        live_prod_results = []  # 라이브와 상품 매칭을 위한 리스트
-        # 중복 제외하고 prod_results에 추가
-        for name, prod_url, price in products:
-            if name not in existing_names:
-                # 상품 코드 BP_001, BP_002, ...
-                code = f"{prod_prefix}_{prod_index:03d}"
-                prod_results.append((code, name, price, prod_url))
-                existing_names.add(name)  # 집합에 추가
-                prod_index += 1
-            else:
-                # 이미 있는 상품이면 prod_code 찾기
-                code = next(c for c, n, _, _ in prod_results if n == name)
-                
-            # 라이브 내 상품코드 기록
-            live_prod_results.append(code)
-
-        # 라이브 결과에 상품코드 추가
-        live_results.append((live_code, live_name, url, ",".join(live_prod_results)))
-
-        scraper.quit()
-        print(f"총 {len(products)}개의 상품 추출 완료")
+    # 새 방송만 크롤링 (드라이버 풀에서 동시 진행, 방송마다 상태 저장)
+    for url, live_name, products in iter_crawl_broadcasts(new_urls, pool_size, lambda: make_driver(driver_path)):
+        state.add_broadcast(url, live_name, products)
+    live_results, prod_results = state.live_results, state.prod_results
 
     # CSV 저장
     save_to_csv(live_results, f"라이브코드_{brand_name}_2.csv", ["live_code", "live_name", "live_url", "prod_codes"])
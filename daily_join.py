@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+#############################################
+######     일 단위 달력 기준 데이터 결합     #####
+#############################################
+# 소스마다 먼저 하루 한 행으로 집계한 뒤, 공통 달력(연속된 날짜) 위에 위치 기반으로 배치
+# → 같은 날 여러 라이브 / 여러 키워드가 있어도 행이 늘어나지 않고, 비용은 날짜 수에 비례
+
+
+# 소스 하나를 일 단위로 집계 (정렬된 DatetimeIndex, 날짜당 한 행)
+def to_daily(df, agg, date_col="date"):
+    dates = pd.to_datetime(df[date_col]).dt.normalize()
+    daily_df = df[list(agg)].groupby(dates.to_numpy()).agg(agg)
+    daily_df.index = pd.DatetimeIndex(daily_df.index, name=date_col)
+    return daily_df.sort_index()
+
+
+# 여러 라이브 코드 등 문자열 집계용
+def join_strings(values):
+    return ",".join(values.dropna().astype(str))
+
+
+# 일 단위 소스들을 공통 달력 위에 결합
+# frames  : 달력 범위를 정하는 소스 (outer merge 와 같은 역할)
+# lookups : 달력 범위 안에서 값만 붙이는 소스 (left merge 와 같은 역할)
+# start / end 를 주면 그 범위로 달력 고정 (증분 계산용)
+def join_daily(frames, lookups=(), start=None, end=None, date_col="date"):
+    with instrumentation.step("join_daily", "merge") as record:
+        merged_df = _join_daily(frames, lookups, start, end, date_col)
+        # fan_out: 가장 긴 소스 대비 달력 때문에 늘어난 행 수
+        record["rows_in"] = sum(len(f) for f in list(frames) + list(lookups))
+        record["rows_out"] = len(merged_df)
+        record["fan_out"] = len(merged_df) - max((len(f) for f in frames), default=0)
+    return merged_df
+
+
+def _join_daily(frames, lookups, start, end, date_col):
+    non_empty = [f for f in frames if len(f)]
+    if start is None:
+        start = min((f.index[0] for f in non_empty), default=None)
+    if end is None:
+        end = max((f.index[-1] for f in non_empty), default=None)
+
+    columns = [c for f in list(frames) + list(lookups) for c in f.columns]
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"소스 간 컬럼명이 겹칩니다: {columns}")
+
+    if start is None or end is None or pd.Timestamp(end) < pd.Timestamp(start):
+        return pd.DataFrame({date_col: pd.DatetimeIndex([]), **{c: [] for c in columns}})
+
+    calendar = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq="D", name=date_col)
+    n_days = len(calendar)
+    out = {date_col: calendar}
+
+    for f in list(frames) + list(lookups):
+        # 날짜 → 달력 위치 (정수 연산, 정렬/merge 없음)
+        pos = ((f.index - calendar[0]) // pd.Timedelta(days=1)).to_numpy()
+        mask = (pos >= 0) & (pos < n_days)
+        for col in f.columns:
+            values = f[col].to_numpy()
+            if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+                arr = np.full(n_days, np.nan)
+            else:
+                arr = np.full(n_days, None, dtype=object)
+            arr[pos[mask]] = values[mask]
+            out[col] = arr
+
+    return pd.DataFrame(out)
@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import ElasticNet
+
+import schemas
+from brand_config import DATA_PATH, data_file
+from elasticnet_regression import feature_sets, load_hyperparams, with_adstock
+
+##################################################
+######   ElasticNet 계수 신뢰구간 (block bootstrap)   #####
+##################################################
+# 연속된 날짜 블록 단위로 복원추출 → 시계열 자기상관을 유지한 채 재학습
+# 설계행렬은 공유 메모리에 한 번만 올리고 워커는 복사 없이 참조
+n_boot = 1000  # 재표본 수
+conf_level = 0.95  # 신뢰수준
+seed = 42
+
+# 워커 프로세스별 공유 메모리 참조 (initializer 에서 연결)
+_shared = {}
+
+
+# 블록 길이 기본값: n^(1/3) (moving block bootstrap 관례)
+def default_block_size(n_rows):
+    return max(1, int(round(n_rows ** (1 / 3))))
+
+
+# 길이 n_rows 인 재표본 행 번호 (시작점을 무작위로 뽑은 블록을 이어붙임)
+def block_indices(rng, n_rows, block_size):
+    n_blocks = -(-n_rows // block_size)
+    starts = rng.integers(0, n_rows - block_size + 1, size=n_blocks)
+    return (starts[:, None] + np.arange(block_size)).ravel()[:n_rows]
+
+
+# 설계행렬(X | y)을 공유 메모리에 복사
+def share_array(arr):
+    shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    return shm
+
+
+def _init_worker(shm_name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _shared["shm"] = shm  # 참조 유지 (GC 되면 버퍼 해제)
+    _shared["data"] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+# 재표본 하나 학습 → (표준화 계수, 원래 단위 계수, 원래 단위 intercept)
+def fit_once(X, y, alpha, l1_ratio):
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    model = ElasticNet(alpha=alpha, l1_ratio=l1_ratio, random_state=42)
+    model.fit((X - mean) / scale, y)
+    beta_real = model.coef_ / scale
+    intercept_real = model.intercept_ - np.sum(mean * beta_real)
+    return model.coef_, beta_real, intercept_real
+
+
+# 재표본 묶음 처리 (공유 행렬에서 필요한 열/행만 인덱싱)
+def _fit_chunk(job):
+    exp_name, col_idx, alpha, l1_ratio, block_size, seeds = job
+    data = _shared["data"]
+    X_all, y_all = data[:, col_idx], data[:, -1]
+
+    scaled = np.empty((len(seeds), len(col_idx)))
+    real = np.empty((len(seeds), len(col_idx) + 1))
+    for i, ss in enumerate(seeds):
+        idx = block_indices(np.random.default_rng(ss), len(y_all), block_size)
+        scaled[i], real[i, :-1], real[i, -1] = fit_once(X_all[idx], y_all[idx], alpha, l1_ratio)
+    return exp_name, scaled, real
+
+
+# 재표본별 계수 → 실험 / feature 별 퍼센타일 구간
+def summarize(exp_name, feature_cols, scaled, real, block_size):
+    q = [(1 - conf_level) / 2 * 100, 50, (1 + conf_level) / 2 * 100]
+    scaled_q = np.percentile(scaled, q, axis=0)
+    real_q = np.percentile(real, q, axis=0)
+
+    rows = []
+    for i, f in enumerate(list(feature_cols) + ["intercept"]):
+        rows.append({
+            "experiment": exp_name,
+            "feature": f,
+            "beta_scaled_lower": scaled_q[0, i] if i < scaled.shape[1] else np.nan,
+            "beta_scaled_median": scaled_q[1, i] if i < scaled.shape[1] else np.nan,
+            "beta_scaled_upper": scaled_q[2, i] if i < scaled.shape[1] else np.nan,
+            "beta_real_lower": real_q[0, i],
+            "beta_real_median": real_q[1, i],
+            "beta_real_upper": real_q[2, i],
+            "n_boot": len(real),
+            "block_size": block_size,
+            "conf_level": conf_level,
+        })
+    return rows
+
+
+def bootstrap(model_input_df, params=None, sets=None, n_boot=n_boot, block_size=None, seed=seed, max_workers=None):
+    sets = sets or feature_sets
+    columns = list(dict.fromkeys(c for cols in sets.values() for c in cols))
+    data = model_input_df[columns + ["proxy_sales"]].to_numpy(dtype=float)
+    block_size = block_size or default_block_size(len(data))
+    if not 1 <= block_size <= len(data):
+        raise ValueError(f"block_size({block_size})는 1 이상, 데이터 길이({len(data)}) 이하여야 합니다.")
+
+    # 재표본 i 의 난수는 (seed, i) 로만 결정 → 워커 수 / 묶음 크기와 무관하게 같은 결과
+    seeds = np.random.SeedSequence(seed).spawn(n_boot)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk = max(1, -(-n_boot // (max_workers * 4)))
+
+    jobs = []
+    for exp_name, feature_cols in sets.items():
+        col_idx = [columns.index(c) for c in feature_cols]
+        alpha, l1_ratio = (params or {}).get(exp_name, (1.0, 0.5))
+        for start in range(0, n_boot, chunk):
+            jobs.append((exp_name, col_idx, alpha, l1_ratio, block_size, seeds[start:start + chunk]))
+
+    shm = share_array(data)
+    try:
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shm.name, data.shape, data.dtype)) as pool:
+                results = list(pool.map(_fit_chunk, jobs))
+        else:
+            _init_worker(shm.name, data.shape, data.dtype)
+            results = [_fit_chunk(job) for job in jobs]
+            del _shared["data"]
+            _shared.pop("shm").close()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # pool.map 은 작업 순서를 유지하므로 재표본 순서대로 이어붙이면 됨
+    rows = []
+    for exp_name, feature_cols in sets.items():
+        parts = [(s, r) for name, s, r in results if name == exp_name]
+        scaled = np.concatenate([s for s, _ in parts])
+        real = np.concatenate([r for _, r in parts])
+        rows.extend(summarize(exp_name, feature_cols, scaled, real, block_size))
+    return pd.DataFrame(rows)
+
+
+def run(brand, data_path=DATA_PATH, use_tuned=False, use_adstock=False, n_boot=n_boot, block_size=None, seed=seed,
+        max_workers=None):
+    model_input_df = schemas.load("elasticnet_data", brand, data_path)
+    params = load_hyperparams(brand, data_path) if use_tuned else None
+
+    # elasticnet_regression.run 과 같은 feature set 구성
+    sets = feature_sets
+    if use_adstock:
+        model_input_df, sets = with_adstock(model_input_df, brand, data_path)
+
+    # elasticnet_experiments_results_{brand}.csv 옆에 저장
+    ci_df = bootstrap(model_input_df, params, sets, n_boot, block_size, seed, max_workers)
+    ci_df.to_csv(data_file(f"elasticnet_bootstrap_ci_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return ci_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+
+    print(run(brand))
@@ -5,14 +5,11 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import r2_score, mean_squared_error
 import numpy as np
 
-brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
-
-##################################################
-######       ElasticNet 학습 및 성능 평가       #####
-##################################################
-# 데이터셋 불러오기
-data_path = r"data"
-model_input_df = pd.read_csv(rf"{data_path}\elasticnet_data_{brand}.csv.csv")
+import adstock
+import instrumentation
+import resample
+import schemas
+from brand_config import DATA_PATH, data_file
 
 # 실험을 위한 feature set 정의
 base_feats = ["search_ad_spend_est", "live_ad_spend_est", "competitor_event_flag"]
@@ -26,69 +23,124 @@ feature_sets = {
     "lag_rolling_added": base_feats + lag_feats + roll_feats
 }
 
-all_results = []  # 결과 저장용
 
-# 각 feature set별로 ElasticNet 학습
-for exp_name, feature_cols in feature_sets.items():
-    print(f"\n\n==============================")
-    print(f"▶ [ {exp_name} ] ")
-    print("==============================")
+##################################################
+######       ElasticNet 학습 및 성능 평가       #####
+##################################################
+@instrumentation.traced()
+def run_experiments(model_input_df, params=None, sets=None):
+    all_results = []  # 결과 저장용
+
+    # 각 feature set별로 ElasticNet 학습
+    for exp_name, feature_cols in (sets or feature_sets).items():
+        print(f"\n\n==============================")
+        print(f"▶ [ {exp_name} ] ")
+        print("==============================")
+
+        # feature, label 분리
+        X = model_input_df[feature_cols]
+        y = model_input_df["proxy_sales"]
+
+        # 데이터 스케일링
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+
+        # train : test = 8 : 2
+        X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=42)
+
+        # 데이터 크기 확인
+        print(f"X_train shape: {X_train.shape}, y_train shape: {y_train.shape}")
+        print(f"X_test shape: {X_test.shape}, y_test shape: {y_test.shape}")
+
+        # alpha: 정규화 강도, l1_ratio: L1(Lasso)/L2(Ridge) 비율 (튜닝 결과가 있으면 사용)
+        alpha, l1_ratio = (params or {}).get(exp_name, (1.0, 0.5))
+        model = ElasticNet(alpha=alpha, l1_ratio=l1_ratio, random_state=42)
+
+        # 모델 학습
+        model.fit(X_train, y_train)
+
+        # 성능 평가
+        y_pred = model.predict(X_test)
+        r2 = r2_score(y_test, y_pred)
+        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+
+        # 계수 복원
+        beta_real = model.coef_ / scaler.scale_
+        intercept_real = model.intercept_ - np.sum(scaler.mean_ * model.coef_ / scaler.scale_)
+
+        # feature별 결과 기록
+        for i, f in enumerate(feature_cols):
+            all_results.append({
+                "experiment": exp_name,
+                "feature": f,
+                "beta_scaled": model.coef_[i],
+                "beta_real": beta_real[i],
+                "intercept": np.nan,  # CSV 에는 빈 칸으로 저장
+                "R2": np.nan,
+                "RMSE": np.nan
+            })
+
+        # intercept, R2, RMSE 기록 (feature=None)
+        all_results.append({
+            "experiment": exp_name,
+            "feature": "intercept",
+            "beta_scaled": model.intercept_,
+            "beta_real": intercept_real,
+            "intercept": intercept_real,
+            "R2": r2,
+            "RMSE": rmse
+        })
 
-    # feature, label 분리
-    X = model_input_df[feature_cols]
-    y = model_input_df["proxy_sales"]
+    return pd.DataFrame(all_results)
 
-    # 데이터 스케일링
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
 
-    # train : test = 8 : 2
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=42)
+# elasticnet_tuning.py 결과 {experiment: (alpha, l1_ratio)}
+def load_hyperparams(brand, data_path=DATA_PATH):
+    params_df = pd.read_csv(data_file(f"elasticnet_hyperparams_{brand}.csv", data_path))
+    return {r.experiment: (r.alpha, r.l1_ratio) for r in params_df.itertuples()}
 
-    # 데이터 크기 확인
-    print(f"X_train shape: {X_train.shape}, y_train shape: {y_train.shape}")
-    print(f"X_test shape: {X_test.shape}, y_test shape: {y_test.shape}")
 
-    # alpha: 정규화 강도, l1_ratio: L1(Lasso)/L2(Ridge) 비율
-    model = ElasticNet(alpha=1.0, l1_ratio=0.5, random_state=42)
+# adstock.py 최적 파라미터로 변환한 광고비 feature 와 feature set 추가
+# (adstock.run 은 run_experiments 와 같은 train 행에서만 파라미터를 고르므로 test 성능에 누수 없음)
+def with_adstock(model_input_df, brand, data_path=DATA_PATH):
+    model_input_df = adstock.add_adstock_features(model_input_df, adstock.load_params(brand, data_path))
+    return model_input_df, {**feature_sets, "adstock_added": base_feats + adstock.adstock_feats}
 
-    # 모델 학습
-    model.fit(X_train, y_train)
 
-    # 성능 평가
-    y_pred = model.predict(X_test)
-    r2 = r2_score(y_test, y_pred)
-    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+# 일 / 주 / 월 등 단위별 실험 비교 (누적합 테이블 하나에서 단위별 데이터만 다시 잘라냄)
+def compare_granularities(table, freqs=("D", "W", "M"), params=None, sets=None):
+    results = []
+    for freq in freqs:
+        results_df = run_experiments(table.training_frame(freq), params, sets)
+        results_df.insert(0, "granularity", freq)
+        results.append(results_df)
+    return pd.concat(results, ignore_index=True)
 
-    # 계수 복원
-    beta_real = model.coef_ / scaler.scale_
-    intercept_real = model.intercept_ - np.sum(scaler.mean_ * model.coef_ / scaler.scale_)
 
-    # feature별 결과 기록
-    for i, f in enumerate(feature_cols):
-        all_results.append({
-            "experiment": exp_name,
-            "feature": f,
-            "beta_scaled": model.coef_[i],
-            "beta_real": beta_real[i],
-            "intercept": "",
-            "R2": "",
-            "RMSE": ""
-        })
+def run_granularities(brand, data_path=DATA_PATH, freqs=("D", "W", "M"), use_tuned=False):
+    params = load_hyperparams(brand, data_path) if use_tuned else None
+    results_df = compare_granularities(resample.load_table(brand, data_path), freqs, params)
+    instrumentation.to_csv(results_df, data_file(f"elasticnet_granularity_results_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return results_df
+
+
+def run(brand, data_path=DATA_PATH, use_tuned=False, use_adstock=False):
+    # 데이터셋 불러오기
+    model_input_df = schemas.load("elasticnet_data", brand, data_path)
+    params = load_hyperparams(brand, data_path) if use_tuned else None
+
+    sets = feature_sets
+    if use_adstock:
+        model_input_df, sets = with_adstock(model_input_df, brand, data_path)
+
+    # df 생성 및 CSV 저장
+    results_df = run_experiments(model_input_df, params, sets)
+    instrumentation.to_csv(results_df, data_file(f"elasticnet_experiments_results_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return results_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
 
-    # intercept, R2, RMSE 기록 (feature=None)
-    all_results.append({
-        "experiment": exp_name,
-        "feature": "intercept",
-        "beta_scaled": model.intercept_,
-        "beta_real": intercept_real,
-        "intercept": intercept_real,
-        "R2": r2,
-        "RMSE": rmse
-    })
-
-# df 생성 및 CSV 저장
-results_df = pd.DataFrame(all_results)
-results_df.to_csv(rf"elasticnet_experiments_results_{brand}.csv", index=False, encoding="utf-8-sig")
-
-print("All training and results saving completed.")
\ No newline at end of file
+    run(brand)
+    print("All training and results saving completed.")
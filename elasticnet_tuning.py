@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import enet_path
+from sklearn.model_selection import TimeSeriesSplit
+
+import schemas
+from brand_config import DATA_PATH, data_file
+from elasticnet_regression import feature_sets
+
+##################################################
+######   ElasticNet 하이퍼파라미터 탐색 (alpha path)  #####
+##################################################
+l1_ratios = [0.1, 0.3, 0.5, 0.7, 0.9, 0.95, 1.0]  # L1(Lasso)/L2(Ridge) 비율 후보
+n_alphas = 200  # l1_ratio별 alpha path 길이
+eps = 1e-4  # alpha_min / alpha_max
+n_splits = 5  # rolling-origin fold 수
+
+
+# 전체 데이터 기준 alpha 그리드 (모든 fold가 같은 그리드를 공유해야 평균 가능)
+def alpha_grid(X, y, l1_ratio):
+    X_std = (X - X.mean(axis=0)) / _safe_std(X)
+    alpha_max = np.max(np.abs(X_std.T @ (y - y.mean()))) / (len(y) * max(l1_ratio, 1e-3))
+    if alpha_max <= 0:
+        alpha_max = 1.0
+    return np.logspace(np.log10(alpha_max), np.log10(alpha_max * eps), n_alphas)
+
+
+def _safe_std(X):
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    return std
+
+
+# 한 fold에서 alpha path 전체의 검증 MSE 계산 (warm start 좌표하강법)
+def _score_path(job):
+    exp_name, l1_ratio, fold, X, y, train_idx, test_idx, alphas = job
+
+    X_train, y_train = X[train_idx], y[train_idx]
+    X_test, y_test = X[test_idx], y[test_idx]
+
+    # train fold 기준 표준화 + y 중심화 (enet_path는 intercept를 학습하지 않음)
+    mean, std = X_train.mean(axis=0), _safe_std(X_train)
+    y_mean = y_train.mean()
+    X_train = (X_train - mean) / std
+    X_test = (X_test - mean) / std
+
+    _, coefs, _ = enet_path(X_train, y_train - y_mean, l1_ratio=l1_ratio, alphas=alphas)
+
+    # (n_test, n_alphas) 예측값을 한 번에 계산
+    y_pred = X_test @ coefs + y_mean
+    mse = ((y_pred - y_test[:, None]) ** 2).mean(axis=0)
+    return exp_name, l1_ratio, fold, mse
+
+
+# (feature_set × l1_ratio × fold) 작업 생성
+def make_jobs(model_input_df):
+    y = model_input_df["proxy_sales"].to_numpy(dtype=float)
+    splitter = TimeSeriesSplit(n_splits=n_splits)
+    folds = list(splitter.split(y))
+
+    jobs, grids = [], {}
+    for exp_name, feature_cols in feature_sets.items():
+        X = model_input_df[feature_cols].to_numpy(dtype=float)
+        for l1_ratio in l1_ratios:
+            alphas = alpha_grid(X, y, l1_ratio)
+            grids[(exp_name, l1_ratio)] = alphas
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                jobs.append((exp_name, l1_ratio, fold, X, y, train_idx, test_idx, alphas))
+    return jobs, grids
+
+
+def tune(model_input_df, max_workers=None):
+    jobs, grids = make_jobs(model_input_df)
+
+    # 작업을 코어에 분산
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            scores = list(pool.map(_score_path, jobs, chunksize=max(1, len(jobs) // (max_workers * 4))))
+    else:
+        scores = [_score_path(job) for job in jobs]
+
+    # fold 평균 MSE로 (feature_set, l1_ratio, alpha) 선택
+    fold_mse = {}
+    for exp_name, l1_ratio, _, mse in scores:
+        fold_mse.setdefault((exp_name, l1_ratio), []).append(mse)
+
+    best = {}
+    for (exp_name, l1_ratio), mses in fold_mse.items():
+        mean_mse = np.mean(mses, axis=0)
+        i = int(np.argmin(mean_mse))
+        if exp_name not in best or mean_mse[i] < best[exp_name]["cv_mse"]:
+            best[exp_name] = {
+                "experiment": exp_name,
+                "alpha": grids[(exp_name, l1_ratio)][i],
+                "l1_ratio": l1_ratio,
+                "cv_mse": mean_mse[i],
+                "cv_rmse": np.sqrt(mean_mse[i]),
+                "n_alphas": n_alphas,
+                "n_splits": n_splits,
+            }
+
+    return pd.DataFrame([best[exp_name] for exp_name in feature_sets])
+
+
+def run(brand, data_path=DATA_PATH, max_workers=None):
+    model_input_df = schemas.load("elasticnet_data", brand, data_path)
+
+    # elasticnet_experiments_results_{brand}.csv 옆에 저장
+    params_df = tune(model_input_df, max_workers)
+    params_df.to_csv(data_file(f"elasticnet_hyperparams_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return params_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+
+    print(run(brand))
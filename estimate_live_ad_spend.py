@@ -1,40 +1,99 @@
 import pandas as pd
 import numpy as np
 
-brand = 'D'  # 'B', 'D', 'L' ********************************************************************************************************
-
-# CSV 불러오기
-live_df = pd.read_csv(f"data/live_info_{brand}.csv")  # 라이브 정보
-prod_df = pd.read_csv(f"data/prod_code_{brand}.csv")  # 상품 정보
-
-# 필요 컬럼만 선택
-prod_df = prod_df[["prod_code", "prod_price"]]
-
-# prod_code → prod_price 딕셔너리 (가격 조회 편리)
-price_dict = pd.Series(prod_df.prod_price.values, index=prod_df.prod_code).to_dict()
-
-# 라이브 판매 상품 평균 단가 계산
-def calc_avg_price(prod_codes_str):
-    codes = prod_codes_str.split(",")  # 쉼표로 나누기
-    prices = [price_dict.get(code, 0) for code in codes]  # 없으면 0
-    return sum(prices) / len(prices) if prices else 0
-
-live_df["avg_price"] = live_df["prod_codes"].apply(calc_avg_price)
+import instrumentation
+import schemas
+from brand_config import DATA_PATH, data_file, get_brand
 
 cvr = 0.001  # 구매 전환율
-# 구매자 수 추정
-live_df["purchase_count_est"] = live_df["viewer_count"] * cvr
 
 # 쇼핑라이브 수수료 비율 = 버티컬 사용료 + 판매수수료 + Npay 주문관리 수수료 (VAT 별도)
 #                    = 2.7% + 3.64% + 3.63%
 fee_rate = 9.97
 k = 30  # 스케일링 상수
 
+
+# prod_codes 문자열 → (전체 상품코드 배열, 라이브별 시작 위치) CSR 형태로 한 번만 분해
+def parse_prod_codes(prod_codes):
+    prod_codes = pd.Series(prod_codes).fillna("").astype(str)
+    counts = prod_codes.str.count(",").to_numpy() + 1  # 쉼표로 나누기
+    flat_codes = np.array(",".join(prod_codes).split(",")) if len(prod_codes) else np.array([], dtype=str)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return flat_codes, offsets
+
+
+# 라이브 판매 상품 평균 단가 계산 (상품코드 → 가격 인덱스 조회 후 라이브별 구간 합)
+def calc_avg_price(prod_codes, prod_df):
+    prod_df = prod_df.drop_duplicates("prod_code", keep="last")
+    flat_codes, offsets = parse_prod_codes(prod_codes)
+
+    # 없는 상품코드는 가격 0 (마지막 칸)
+    idx = pd.Index(prod_df["prod_code"]).get_indexer(flat_codes)
+    prices = np.append(prod_df["prod_price"].to_numpy(dtype=float), 0.0)[idx]
+
+    counts = np.diff(offsets)
+    if len(counts) == 0:
+        return np.zeros(0)
+    return np.add.reduceat(prices, offsets[:-1]) / counts
+
+
 # live_ad_spend_est 계산
 # 라이브 판매상품 평균 단가 * 수수료 * (1 + log(1 + 구매자 수) / 스케일링 상수)
-live_df["live_ad_spend_est"] = live_df["avg_price"] * fee_rate * (1 + np.log1p(live_df["purchase_count_est"]) / k)
+# cvr, fee_rate, k 에 배열을 넘기면 (파라미터 조합 × 라이브) 결과를 한 번에 계산
+def calc_live_ad_spend(avg_price, viewer_count, cvr=cvr, fee_rate=fee_rate, k=k):
+    cvr, fee_rate, k = (np.asarray(v, dtype=float)[..., None] for v in (cvr, fee_rate, k))
+    purchase_count_est = np.asarray(viewer_count, dtype=float) * cvr  # 구매자 수 추정
+    return np.asarray(avg_price, dtype=float) * fee_rate * (1 + np.log1p(purchase_count_est) / k)
+
+
+# 라이브 광고비 추정
+@instrumentation.traced()
+def estimate_live_ad_spend(live_df, prod_df):
+    live_df = live_df.copy()
+
+    live_df["avg_price"] = calc_avg_price(live_df["prod_codes"], prod_df)
+
+    # 구매자 수 추정
+    live_df["purchase_count_est"] = live_df["viewer_count"] * cvr
+
+    live_df["live_ad_spend_est"] = calc_live_ad_spend(live_df["avg_price"], live_df["viewer_count"])
+
+    return live_df
+
+
+# (cvr, fee_rate, k) 민감도 분석: 모든 조합을 한 번에 계산
+# 반환: 조합별 라이브 광고비 합계 DataFrame, (조합 수 × 라이브 수) 배열
+def sweep_live_ad_spend(live_df, prod_df, cvrs, fee_rates, ks):
+    avg_price = calc_avg_price(live_df["prod_codes"], prod_df)
+    grid = np.array(np.meshgrid(cvrs, fee_rates, ks, indexing="ij")).reshape(3, -1)
+    spend = calc_live_ad_spend(avg_price, live_df["viewer_count"], grid[0], grid[1], grid[2])
+
+    summary_df = pd.DataFrame({
+        "cvr": grid[0],
+        "fee_rate": grid[1],
+        "k": grid[2],
+        "live_ad_spend_total": spend.sum(axis=1),
+        "live_ad_spend_mean": spend.mean(axis=1),
+    })
+    return summary_df, spend
+
+
+def run(brand, data_path=DATA_PATH):
+    get_brand(brand)
+
+    # CSV 불러오기
+    live_df = schemas.load("live_info", brand, data_path)  # 라이브 정보
+    prod_df = schemas.load("prod_code", brand, data_path)  # 상품 정보
+
+    live_df = estimate_live_ad_spend(live_df, prod_df)
+
+    # 결과 저장
+    instrumentation.to_csv(live_df, data_file(f"live_info_{brand}_2.csv", data_path), index=False, encoding="utf-8-sig")
+    return live_df
+
 
-print(live_df.head())
+if __name__ == "__main__":
+    brand = 'D'  # 'B', 'D', 'L' ********************************************************************************************************
 
-# 결과 저장
-live_df.to_csv(f"live_info_{brand}_2.csv", index=False, encoding="utf-8-sig")
\ No newline at end of file
+    live_df = run(brand)
+    print(live_df.head())
@@ -0,0 +1,228 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+import schemas
+from adstock import adstock_feats
+from brand_config import DATA_PATH, data_file
+from elasticnet_regression import base_feats, feature_sets, lag_feats, load_hyperparams, roll_feats, with_adstock
+
+##################################################
+######   공유 Gram 행렬 기반 다중 모델 실험   #####
+##################################################
+# 모든 feature set 의 합집합 컬럼을 한 번만 표준화하고, train 구간의 Gram 행렬(X^T X)과 X^T y 를 한 번만 계산
+# 각 (feature 부분집합 × 모델) 은 이 행렬의 행/열만 골라 쓰는 작은 (p × p) 문제 → 원본 행을 다시 읽지 않음
+# 표준화 / train·test 분할은 elasticnet_regression.run_experiments 와 같음 (전체 기준 StandardScaler, 8:2 random_state=42)
+# 모델별 목적함수 (n = train 행 수, sklearn 과 같은 정의)
+#   ElasticNet : 1/(2n)·||y - Xw||² + alpha·l1_ratio·|w|₁ + alpha·(1 - l1_ratio)/2·||w||²
+#   Lasso      : ElasticNet(l1_ratio=1)
+#   Ridge      : ||y - Xw||² + alpha·||w||²
+#   OLS        : ||y - Xw||² (공선성이 있으면 최소 노름 해)
+seasonal_feats = ["month_sin", "month_cos"]
+default_models = {"ElasticNet": (1.0, 0.5), "Lasso": (1.0, 1.0), "Ridge": (1.0, 0.0), "OLS": (0.0, 0.0)}
+tol = 1e-10  # 좌표하강법 종료 기준 (계수 최대 변화량 / 계수 최대 크기)
+max_iter = 10000
+
+
+# month → 주기 feature (12월과 1월이 가깝도록 sin / cos)
+def add_seasonality(model_input_df):
+    model_input_df = model_input_df.copy()
+    angle = 2 * np.pi * (model_input_df["month"].to_numpy(dtype=float) - 1) / 12
+    model_input_df["month_sin"] = np.sin(angle)
+    model_input_df["month_cos"] = np.cos(angle)
+    return model_input_df
+
+
+# base feature 는 고정, optional 컬럼의 모든 부분집합 {실험명: feature 목록}
+def subset_search(optional, base=base_feats):
+    sets = {}
+    for k in range(len(optional) + 1):
+        for combo in combinations(optional, k):
+            sets["+".join(combo) or "baseline"] = list(base) + list(combo)
+    return sets
+
+
+class SharedGram:
+    def __init__(self, model_input_df, columns, test_size=0.2, random_state=42):
+        self.columns = list(columns)
+        X = model_input_df[self.columns].to_numpy(dtype=float)
+        y = model_input_df["proxy_sales"].to_numpy(dtype=float)
+
+        # 전체 기준 표준화 (StandardScaler 와 같음, 부분집합마다 다시 할 필요 없음)
+        self.mean = X.mean(axis=0)
+        self.scale = X.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        X_scaled = (X - self.mean) / self.scale
+
+        train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=test_size, random_state=random_state)
+
+        # train 평균으로 중심화 (intercept 는 평균 차이로 복원)
+        self.x_mean = X_scaled[train_idx].mean(axis=0)
+        self.y_mean = y[train_idx].mean()
+        X_train = X_scaled[train_idx] - self.x_mean
+        y_train = y[train_idx] - self.y_mean
+        self.n_train = len(train_idx)
+        self.gram = X_train.T @ X_train
+        self.xy = X_train.T @ y_train
+
+        # test 도 train 평균 기준으로 중심화 → 예측 = X_test @ w
+        self.X_test = X_scaled[test_idx] - self.x_mean
+        self.y_test = y[test_idx] - self.y_mean
+
+    def masks(self, sets):
+        col = {c: i for i, c in enumerate(self.columns)}
+        masks = np.zeros((len(sets), len(self.columns)), dtype=bool)
+        for i, feature_cols in enumerate(sets.values()):
+            masks[i, [col[c] for c in feature_cols]] = True
+        return masks
+
+    # 모델 / alpha / l1_ratio → Gram 단위 벌점 (l1, l2)
+    def penalties(self, model, alpha, l1_ratio):
+        if model in ("ElasticNet", "Lasso"):
+            l1_ratio = 1.0 if model == "Lasso" else l1_ratio
+            return self.n_train * alpha * l1_ratio, self.n_train * alpha * (1 - l1_ratio)
+        if model == "Ridge":
+            return 0.0, alpha
+        if model == "OLS":
+            return 0.0, 0.0
+        raise ValueError(f"지원하지 않는 모델입니다: {model}")
+
+    # test 구간 R2 / RMSE (문제 여러 개를 한 번에)
+    def score(self, W):
+        resid = self.y_test[:, None] - self.X_test @ W.T
+        sse = (resid ** 2).sum(axis=0)
+        sst = ((self.y_test - self.y_test.mean()) ** 2).sum()
+        return 1 - sse / sst, np.sqrt(sse / len(self.y_test))
+
+
+# 부분집합 문제 여러 개를 한 번에 풀기 (mask 밖 계수는 0 → Gram 의 행/열을 고른 것과 같음)
+# l1 = 0 이면 닫힌 해, l1 > 0 이면 Gram 좌표하강법 (W0 를 주면 그 계수에서 시작 → warm start)
+def solve(gram, xy, masks, l1, l2, W0=None, tol=tol):
+    n_problems, p = masks.shape
+    m = masks.astype(float)
+    W = np.zeros((n_problems, p)) if W0 is None else np.array(W0, dtype=float) * m
+
+    closed = l1 == 0
+    if closed.any():
+        mc = m[closed]
+        A = mc[:, :, None] * mc[:, None, :] * gram
+        A[:, np.arange(p), np.arange(p)] += l2[closed, None] * mc + (1 - mc)
+        W[closed] = (np.linalg.pinv(A, hermitian=True) @ (mc * xy)[:, :, None])[:, :, 0]
+
+    idx = np.flatnonzero(~closed)
+    if len(idx):
+        Wc, a = W[idx], l1[idx]
+        # mask 밖 / 분산 0 컬럼은 1/분모 = 0 → 계수 0 유지
+        denom = np.diag(gram)[None, :] + l2[idx, None]
+        inv_denom = np.divide(m[idx], denom, out=np.zeros_like(denom), where=denom > 0)
+        active = np.arange(len(idx))
+        for _ in range(max_iter):
+            Wa, aa, inv = Wc[active], a[active], inv_denom[active]
+            grad = xy - Wa @ gram  # 잔차와 각 컬럼의 내적 (좌표 갱신마다 rank-1 로 갱신)
+            max_delta = np.zeros(len(active))
+            for j in range(p):
+                rho = grad[:, j] + gram[j, j] * Wa[:, j]
+                new = (rho - np.minimum(np.maximum(rho, -aa), aa)) * inv[:, j]  # soft threshold
+                delta = new - Wa[:, j]
+                grad -= delta[:, None] * gram[j]
+                Wa[:, j] = new
+                np.maximum(max_delta, np.abs(delta), out=max_delta)
+            Wc[active] = Wa
+            converged = max_delta <= tol * np.maximum(np.abs(Wa).max(axis=1), 1e-12)
+            active = active[~converged]
+            if len(active) == 0:
+                break
+        W[idx] = Wc
+    return W
+
+
+def _solve_chunk(job):
+    return solve(*job)
+
+
+# 모든 (feature set × 모델) 학습 → (실험별 성능 요약, 계수)
+def fit_all(model_input_df, sets=None, models=None, params=None, max_workers=None):
+    sets = sets or feature_sets
+    models = models or default_models
+    columns = list(dict.fromkeys(c for cols in sets.values() for c in cols))
+    state = SharedGram(model_input_df, columns)
+    set_masks = state.masks(sets)
+
+    # 문제 목록 (모델 순서 × feature set 순서), elasticnet_tuning.py 결과는 ElasticNet 에만 적용
+    names, model_names, masks, l1, l2, settings = [], [], [], [], [], []
+    for model, (alpha, l1_ratio) in models.items():
+        for i, exp_name in enumerate(sets):
+            if model == "ElasticNet":
+                alpha_i, l1_ratio_i = (params or {}).get(exp_name, (alpha, l1_ratio))
+            else:
+                alpha_i, l1_ratio_i = alpha, l1_ratio
+            pen = state.penalties(model, alpha_i, l1_ratio_i)
+            names.append(exp_name)
+            model_names.append(model)
+            masks.append(set_masks[i])
+            l1.append(pen[0])
+            l2.append(pen[1])
+            settings.append((alpha_i, l1_ratio_i))
+    masks, l1, l2 = np.array(masks), np.array(l1), np.array(l2)
+
+    # 문제 묶음을 코어에 분산 (Gram 은 p × p 라 작업마다 복사해도 작음)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk = max(1, -(-len(masks) // (max_workers * 4)))
+    jobs = [(state.gram, state.xy, masks[s:s + chunk], l1[s:s + chunk], l2[s:s + chunk])
+            for s in range(0, len(masks), chunk)]
+    if max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            W = np.concatenate(list(pool.map(_solve_chunk, jobs)))
+    else:
+        W = np.concatenate([_solve_chunk(job) for job in jobs])
+
+    r2, rmse = state.score(W)
+    beta_real = W / state.scale
+    intercept = state.y_mean - W @ state.x_mean
+    intercept_real = intercept - beta_real @ state.mean
+
+    summary, coefs = [], []
+    for k, (exp_name, model) in enumerate(zip(names, model_names)):
+        feature_cols = sets[exp_name]
+        summary.append({"experiment": exp_name, "model": model, "n_features": len(feature_cols),
+                        "features": "+".join(feature_cols), "alpha": settings[k][0], "l1_ratio": settings[k][1],
+                        "R2": r2[k], "RMSE": rmse[k]})
+        for f in feature_cols:
+            j = columns.index(f)
+            coefs.append({"experiment": exp_name, "model": model, "feature": f, "beta_scaled": W[k, j],
+                          "beta_real": beta_real[k, j], "intercept": np.nan, "R2": np.nan, "RMSE": np.nan})
+        coefs.append({"experiment": exp_name, "model": model, "feature": "intercept", "beta_scaled": intercept[k],
+                      "beta_real": intercept_real[k], "intercept": intercept_real[k], "R2": r2[k], "RMSE": rmse[k]})
+    return pd.DataFrame(summary), pd.DataFrame(coefs)
+
+
+# exhaustive=True: lag / rolling / 계절성 (+ adstock) 컬럼의 모든 부분집합 탐색
+def run(brand, data_path=DATA_PATH, exhaustive=False, use_tuned=False, use_adstock=False, max_workers=None):
+    model_input_df = add_seasonality(schemas.load("elasticnet_data", brand, data_path))
+    params = load_hyperparams(brand, data_path) if use_tuned else None
+
+    sets = feature_sets
+    if use_adstock:
+        model_input_df, sets = with_adstock(model_input_df, brand, data_path)
+    if exhaustive:
+        sets = subset_search(lag_feats + roll_feats + seasonal_feats + (adstock_feats if use_adstock else []))
+
+    summary_df, coef_df = fit_all(model_input_df, sets, params=params, max_workers=max_workers)
+    summary_df = summary_df.sort_values(["model", "R2"], ascending=[True, False], kind="stable")
+
+    # elasticnet_experiments_results_{brand}.csv 옆에 저장
+    summary_df.to_csv(data_file(f"elasticnet_model_comparison_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    coef_df.to_csv(data_file(f"elasticnet_model_coefs_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    return summary_df, coef_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    exhaustive = False  # True: lag / rolling / 계절성 컬럼의 모든 부분집합 비교
+
+    summary_df, _ = run(brand, exhaustive=exhaustive)
+    print(summary_df.to_string(index=False))
@@ -0,0 +1,237 @@
+import asyncio
+import html
+import json
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, parse_qs, unquote
+
+import aiohttp
+
+from brand_config import get_brand
+from crawl_state import CrawlState
+
+#############################################
+######   브라우저 없이 HTTP로 상품 정보 추출   #####
+#############################################
+# 방송 페이지 HTML 의 상품 목록 마크업(data-shp-contents-dtl JSON 속성, sourceUrl 쿼리)에서
+# LiveScraper.extract_products 와 같은 (상품명, url, 가격) 추출
+# 마크업에 상품이 없거나 '전체 보기' 버튼이 있는 페이지(목록 일부만 마크업에 있음)만 Selenium 으로 처리
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class ProductListParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.live_name = None
+        self.iframe_src = None
+        self.products = []  # (name, url, price)
+        self.show_all = False  # '전체 보기' 버튼 (누르기 전에는 목록 일부만 있음)
+        self._button_text = None
+
+        self._item = None  # 현재 상품 {name, href, data}
+        self._item_div_depth = 0
+        self._in_title = False
+        self._in_title_a = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if tag == "meta" and attrs.get("property") == "og:title" and self.live_name is None:
+            self.live_name = (attrs.get("content") or "").strip()
+        elif tag == "iframe" and self.iframe_src is None:
+            self.iframe_src = attrs.get("src")
+
+        if tag == "button":
+            self._button_text = ""
+
+        if tag == "div":
+            if self._item is not None:
+                self._item_div_depth += 1
+            elif "ProductList_item_erjbw" in classes:
+                self._item = {"name": "", "href": None, "data": None}
+                self._item_div_depth = 1
+            return
+
+        if self._item is None:
+            return
+        if tag == "strong" and "ProductTitle_wrap_gGxmc" in classes:
+            self._in_title = True
+        elif tag == "a" and self._in_title:
+            self._in_title_a = True
+            self._item["href"] = attrs.get("href")
+        elif tag == "a" and "ProductThumbnail_link_thumbnail_779w7" in classes:
+            self._item["data"] = attrs.get("data-shp-contents-dtl")
+
+    def handle_endtag(self, tag):
+        if tag == "button" and self._button_text is not None:
+            # LiveScraper.click_show_all 과 같은 기준 (공백 차이는 무시)
+            if "전체보기" in "".join(self._button_text.split()):
+                self.show_all = True
+            self._button_text = None
+        if self._item is None:
+            return
+        if tag == "a" and self._in_title_a:
+            self._in_title_a = False
+        elif tag == "strong" and self._in_title:
+            self._in_title = False
+        elif tag == "div":
+            self._item_div_depth -= 1
+            if self._item_div_depth == 0:
+                self._finish_item()
+
+    def handle_data(self, data):
+        if self._button_text is not None:
+            self._button_text += data
+        if self._in_title_a:
+            self._item["name"] += data
+
+    def _finish_item(self):
+        item, self._item = self._item, None
+        # strong a 태그 없으면 건너뜀 (상품이 아님)
+        if not item["href"]:
+            return
+
+        # 상품명
+        name = " ".join(item["name"].split())
+
+        # sourceUrl 디코딩
+        qs = parse_qs(urlparse(item["href"]).query)
+        prod_url = unquote(qs.get("sourceUrl", [item["href"]])[0])
+
+        # 상품 가격
+        price = ""
+        if item["data"]:
+            try:
+                for d in json.loads(html.unescape(item["data"])):
+                    if d.get("key") == "price":
+                        price = d.get("value")
+                        break
+            except (ValueError, AttributeError):
+                pass
+
+        self.products.append((name, prod_url, price))
+
+
+# HTML → (라이브 제목, [(name, url, price), ...], iframe src, '전체 보기' 버튼 여부)
+def extract_products_from_html(text):
+    parser = ProductListParser()
+    parser.feed(text)
+    parser.close()
+    return parser.live_name, parser.products, parser.iframe_src, parser.show_all
+
+
+# 재시도(지수 백오프) 포함 GET
+async def fetch_text(session, url, retries=3, backoff=0.5):
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url) as resp:
+                if resp.status in RETRY_STATUS and attempt < retries:
+                    await asyncio.sleep(backoff * 2 ** attempt)
+                    continue
+                resp.raise_for_status()
+                return await resp.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+
+# 방송 하나 처리 → (url, 라이브 제목, 상품 리스트)
+# 마크업에 상품이 없거나 '전체 보기' 버튼이 있으면 (목록이 잘렸을 수 있음) None → Selenium 대체 실행
+async def extract_broadcast(session, semaphore, url, index, retries):
+    async with semaphore:
+        try:
+            text = await fetch_text(session, url, retries)
+            live_name, products, iframe_src, show_all = extract_products_from_html(text)
+
+            # 상품 목록이 iframe 안에 있으면 iframe 페이지 한 번 더 요청
+            if not products and iframe_src:
+                frame_name, products, _, show_all = extract_products_from_html(
+                    await fetch_text(session, urljoin(url, iframe_src), retries))
+                live_name = live_name or frame_name
+        except Exception as e:
+            print(f"[{index + 1}] HTTP 추출 실패: {url} ({e})")
+            return None
+
+    if not products or show_all:
+        return None
+    return url, live_name or f"라이브_{index + 1}", products
+
+
+# 방송들을 동시에 요청 (연결 재사용, 동시 요청 수 제한)
+# on_result(url, 라이브 제목, 상품 리스트): 방송이 끝나면 바로 호출 (상태 저장 → 중간에 죽어도 끝난 방송은 남음)
+# 단 앞 방송들이 모두 끝난 뒤 broadcast_urls 순서대로 호출 → 첫 크롤링의 코드 부여가 응답 순서와 무관
+# 반환: (추출 결과 dict url → (url, 라이브 제목, 상품 리스트), 브라우저가 필요한 url 리스트)
+async def extract_broadcasts_async(broadcast_urls, concurrency=8, retries=3, timeout=15, headers=None,
+                                   on_result=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    extracted = {}
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout, headers=headers) as session:
+        async def indexed(i, url):
+            return i, await extract_broadcast(session, semaphore, url, i, retries)
+
+        tasks = [asyncio.ensure_future(indexed(i, url)) for i, url in enumerate(broadcast_urls)]
+        results, done, next_i = [None] * len(tasks), [False] * len(tasks), 0
+        for task in asyncio.as_completed(tasks):
+            i, results[i] = await task
+            done[i] = True
+            # 끝난 방송 중 앞 방송이 모두 끝난 부분까지 순서대로 기록
+            while next_i < len(tasks) and done[next_i]:
+                result = results[next_i]
+                next_i += 1
+                if result is None:
+                    continue
+                extracted[result[0]] = result
+                if on_result is not None:
+                    on_result(*result)
+
+    fallback = [url for url in broadcast_urls if url not in extracted]
+    return extracted, fallback
+
+
+def extract_broadcasts(broadcast_urls, concurrency=8, retries=3, timeout=15, headers=None, on_result=None):
+    return asyncio.run(extract_broadcasts_async(broadcast_urls, concurrency, retries, timeout, headers, on_result))
+
+
+# HTTP 추출 (방송마다 바로 상태에 기록) + (필요한 방송만) Selenium 대체 실행
+def crawl(state, broadcast_urls, concurrency=8, browser_fallback=None):
+    new_urls = [url for url in broadcast_urls if not state.is_visited(url)]
+    extracted, fallback = extract_broadcasts(new_urls, concurrency, on_result=state.add_broadcast)
+    print(f"HTTP 추출 {len(extracted)}개 / 브라우저 필요 {len(fallback)}개")
+
+    if fallback and browser_fallback is not None:
+        for url, live_name, products in browser_fallback(fallback):
+            state.add_broadcast(url, live_name, products)
+    return fallback
+
+
+def main():
+    from crawling_for_live_product_code import get_broadcast_urls, iter_crawl_broadcasts, make_driver, save_to_csv
+
+    driver_path = r'C:\Users\ilimo\Downloads\edgedriver_win64\msedgedriver.exe'  # 드라이버 경로
+    pool_size = 4  # 대체 실행 시 동시에 띄울 브라우저 수
+
+    brand = 'D'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    info = get_brand(brand)
+    state = CrawlState(f"crawl_state_{brand}.jsonl", info['prod_prefix'], info['live_prefix'])
+
+    # 방송 목록은 채널 페이지 무한 스크롤이 필요하므로 브라우저로 수집
+    driver = make_driver(driver_path)
+    broadcast_urls = get_broadcast_urls(driver, info['url'])
+    driver.quit()
+    print(f"총 {len(broadcast_urls)}개의 방송 발견")
+
+    crawl(state, broadcast_urls,
+          browser_fallback=lambda urls: iter_crawl_broadcasts(urls, pool_size, lambda: make_driver(driver_path)))
+
+    # CSV 저장
+    save_to_csv(state.live_results, f"라이브코드_{info['name']}_2.csv", ["live_code", "live_name", "live_url", "prod_codes"])
+    save_to_csv(state.prod_results, f"상품코드_{info['name']}_2.csv", ["prod_code", "prod_name", "prod_price", "prod_url"])
+    print(f"총 {len(state.live_results)}개의 라이브 / {len(state.prod_results)}개의 상품 CSV 저장 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import psutil
+
+#############################################
+######   단계별 계측 (시간 / 메모리 / 행 수)   #####
+#############################################
+# 파이프라인 스크립트의 읽기(load) / 결합(merge) / 변환(transform) / 저장(save) 단계를 감싸서
+# 실행 시간, CPU 시간, 최대 RSS 증가량, 입력/출력 행 수, 결합 시 늘어난 행 수(fan_out) 기록
+# enable() 하지 않으면 기록하지 않고 원래 함수만 실행
+_state = {"enabled": False, "profile_dir": None, "run_id": None, "records": [], "context": {}, "depth": 0,
+          "slowest": None}
+
+
+def enable(run_id=None, profile_dir=None):
+    _state.update(enabled=True, run_id=run_id or datetime.now().strftime("%Y%m%d-%H%M%S"),
+                  profile_dir=profile_dir, records=[], context={}, depth=0, slowest=None)
+    return _state["run_id"]
+
+
+def disable():
+    _state["enabled"] = False
+
+
+def is_enabled():
+    return _state["enabled"]
+
+
+def records():
+    return list(_state["records"])
+
+
+# 실행 중 RSS 를 주기적으로 기록해서 최대값 측정
+class RssSampler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.start_rss = self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self.start_rss = self.peak_rss = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+
+
+# 단계 하나 기록 (호출하는 쪽에서 rows_in / rows_out / fan_out 채움)
+@contextmanager
+def step(name, kind):
+    record = {"name": name, "kind": kind}
+    if not _state["enabled"]:
+        yield record
+        return
+
+    record.update(_state["context"])
+    record["depth"] = _state["depth"]
+    _state["depth"] += 1
+    try:
+        with RssSampler() as sampler:
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            yield record
+            record["wall_sec"] = time.perf_counter() - wall_start
+            record["cpu_sec"] = time.process_time() - cpu_start
+        record["rss_start_mb"] = sampler.start_rss / 2 ** 20
+        record["rss_peak_delta_mb"] = (sampler.peak_rss - sampler.start_rss) / 2 ** 20
+        _state["records"].append(record)
+    finally:
+        _state["depth"] -= 1
+
+
+# pipeline stage 단위 기록 (안쪽 단계에 brand / stage 표시, profile_dir 이 있으면 cProfile)
+@contextmanager
+def stage(name, brand):
+    if not _state["enabled"]:
+        yield {}
+        return
+
+    outer = _state["context"]
+    _state["context"] = {"stage": name, "brand": brand}
+    profiler = cProfile.Profile() if _state["profile_dir"] else None
+    try:
+        with step(name, "stage") as record:
+            if profiler:
+                profiler.enable()
+            try:
+                yield record
+            finally:
+                if profiler:
+                    profiler.disable()
+    finally:
+        _state["context"] = outer
+
+    if profiler:
+        _keep_if_slowest(profiler, record)
+
+
+# 가장 오래 걸린 stage 의 profile 만 파일로 남김
+def _keep_if_slowest(profiler, record):
+    slowest = _state["slowest"]
+    if slowest is not None and slowest["wall_sec"] >= record["wall_sec"]:
+        return
+    os.makedirs(_state["profile_dir"], exist_ok=True)
+    path = os.path.join(_state["profile_dir"], f"{_state['run_id']}_{record['brand']}_{record['stage']}.prof")
+    profiler.dump_stats(path)
+    if slowest is not None and os.path.exists(slowest["profile"]):
+        os.remove(slowest["profile"])
+    record["profile"] = path
+    if slowest is not None:
+        slowest.pop("profile", None)
+    _state["slowest"] = record
+
+
+def _n_rows(obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if isinstance(obj, tuple) and obj and isinstance(obj[0], (pd.DataFrame, pd.Series)):
+        return len(obj[0])
+    return None
+
+
+# 변환 함수 데코레이터: DataFrame 인자 행 수 → 반환 DataFrame 행 수
+def traced(kind="transform", name=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return func(*args, **kwargs)
+            with step(name or func.__name__, kind) as record:
+                rows_in = [n for n in map(_n_rows, list(args) + list(kwargs.values())) if n is not None]
+                result = func(*args, **kwargs)
+                record["rows_in"] = sum(rows_in)
+                record["rows_out"] = _n_rows(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def read_csv(path, **kwargs):
+    with step(f"read {os.path.basename(str(path))}", "load") as record:
+        df = pd.read_csv(path, **kwargs)
+        record["rows_out"] = len(df)
+    return df
+
+
+def to_csv(df, path, **kwargs):
+    with step(f"save {os.path.basename(str(path))}", "save") as record:
+        df.to_csv(path, **kwargs)
+        record["rows_in"] = len(df)
+
+
+# pd.merge + fan_out (왼쪽 입력 대비 늘어난 행 수)
+def merge(left, right, name="merge", **kwargs):
+    with step(name, "merge") as record:
+        merged = pd.merge(left, right, **kwargs)
+        record["rows_in"] = len(left) + len(right)
+        record["rows_out"] = len(merged)
+        record["fan_out"] = len(merged) - len(left)
+    return merged
+
+
+# 실행 기록 JSON 저장 (여러 프로세스 기록을 합쳐서 저장할 수 있도록 records 를 받음)
+def write_run(trace_dir, run_records=None, run_id=None, **meta):
+    run_records = records() if run_records is None else run_records
+    run_id = run_id or _state["run_id"]
+
+    # 여러 워커의 profile 중 가장 느린 stage 것만 유지
+    profiled = [r for r in run_records if r.get("profile")]
+    slowest = max(profiled, key=lambda r: r["wall_sec"], default=None)
+    for r in profiled:
+        if r is not slowest:
+            if os.path.exists(r["profile"]):
+                os.remove(r["profile"])
+            r.pop("profile")
+
+    os.makedirs(trace_dir, exist_ok=True)
+    path = os.path.join(trace_dir, f"run_{run_id}.json")
+    stages = [r for r in run_records if r["kind"] == "stage"]
+    summary = {
+        "run_id": run_id,
+        **meta,
+        "total_stage_sec": sum(r["wall_sec"] for r in stages),
+        "slowest_stage": None if not stages else max(stages, key=lambda r: r["wall_sec"])["name"],
+        "profile": None if slowest is None else slowest["profile"],
+        "records": run_records,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp_path, path)
+    return path
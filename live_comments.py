@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import schemas
+from brand_config import DATA_PATH, data_file
+
+#############################################
+######   라이브 댓글 스트리밍 집계 (분 단위)   #####
+#############################################
+# 댓글 원본 CSV 를 chunk 단위로 읽으면서 라이브별 / 분별 집계만 누적 (댓글 행 자체는 보관하지 않음)
+# → 메모리는 댓글 수가 아니라 (라이브 × 분) 수, (라이브 × 댓글 작성자) 수에 비례
+# url / nickname 은 category 로 읽어서 chunk 안의 고유값만 파싱 / 해시
+# url_code → live_code 는 live_code_{brand}.csv 로 미리 만든 해시 인덱스(pd.Index)로 한 번에 조회
+# time : 라이브 시작 후 경과 시간("HH:MM:SS", "MM:SS", 초) 또는 시각("2025-01-01 20:01:02")
+url_col, time_col, nickname_col, duration_col = "url", "time", "nickname", "total_duration(sec)"
+chunksize = 200_000
+_minute_bits = 40  # (라이브 번호, 분) → int64 키 (분 값은 2^40 미만)
+stats_columns = ["live_code", "date", "comment_count", "unique_commenters", "active_minutes", "duration_min",
+                 "comment_rate", "peak_minute_comments", "peak_intensity"]
+
+
+# url 에서 /replays/ 뒤 숫자 추출 (앞의 "{brand}_" 는 제거)
+def parse_url_codes(urls, brand=None):
+    urls = pd.Series(urls, dtype=str)
+    if brand is not None:
+        urls = urls.str.replace(rf"^{brand}_", "", regex=True)
+    return pd.to_numeric(urls.str.extract(r"/replays/(\d+)", expand=False), errors="coerce")
+
+
+# url_code → live_code 해시 인덱스 (같은 url_code 가 여러 번이면 첫 번째)
+class LiveCodeIndex:
+    def __init__(self, live_code_df):
+        codes = parse_url_codes(live_code_df["live_url"])
+        keep = codes.notna().to_numpy() & ~codes.duplicated().to_numpy()
+        self.index = pd.Index(codes[keep].astype(np.int64).to_numpy())
+        self.live_codes = live_code_df["live_code"].to_numpy()[keep]
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(instrumentation.read_csv(path, usecols=["live_code", "live_url"], dtype=str))
+
+    # url_code 배열 → 라이브 번호 (없으면 -1)
+    def lookup(self, url_codes):
+        url_codes = np.asarray(url_codes, dtype=float)
+        positions = np.full(len(url_codes), -1, dtype=np.int64)
+        valid = ~np.isnan(url_codes)
+        positions[valid] = self.index.get_indexer(url_codes[valid].astype(np.int64))
+        return positions
+
+
+# 경과 시간 / 시각 → 초 (파싱 실패는 NaN)
+# 숫자만 있는 값은 초로 먼저 처리 (to_timedelta 에 넘기면 나노초로 읽힘), 나머지만 "MM:SS" / "HH:MM:SS" / 시각으로 파싱
+def parse_seconds(values):
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    text = values.astype(str).str.strip()
+    seconds = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float, copy=True)
+    rest = np.isnan(seconds) & values.notna().to_numpy()
+    if not rest.any():
+        return seconds
+
+    text = text[rest]
+    n_colons = text.str.count(":")
+    elapsed = pd.to_timedelta(text.where(n_colons != 1, "00:" + text), errors="coerce")
+    parsed = elapsed.dt.total_seconds().to_numpy(dtype=float)
+    if np.isnan(parsed).all():
+        stamps = pd.to_datetime(text, errors="coerce", format="mixed")
+        parsed = (stamps - pd.Timestamp("1970-01-01")).dt.total_seconds().to_numpy(dtype=float)
+    seconds[rest] = parsed
+    return seconds
+
+
+class CommentAggregator:
+    def __init__(self, code_index):
+        self.code_index = code_index
+        n_lives = len(code_index.live_codes)
+        self.comment_count = np.zeros(n_lives, dtype=np.int64)
+        self.unique_commenters = np.zeros(n_lives, dtype=np.int64)
+        self.duration_sec = np.full(n_lives, np.nan)
+        self._minute_keys = np.array([], dtype=np.int64)  # 정렬된 (라이브, 분) 키
+        self._minute_counts = np.array([], dtype=np.int64)
+        self._seen = np.array([], dtype=np.uint64)  # 정렬된 (라이브, 작성자) 해시
+        self.n_rows = self.n_unmatched = 0
+
+    # chunk 하나 반영
+    def update(self, chunk, brand=None):
+        self.n_rows += len(chunk)
+        urls = chunk[url_col].astype("category")
+        live = self.code_index.lookup(parse_url_codes(urls.cat.categories, brand).to_numpy()[urls.cat.codes])
+        matched = live >= 0
+        self.n_unmatched += int((~matched).sum())
+        chunk, live = chunk[matched], live[matched]
+        if len(live) == 0:
+            return
+
+        n_lives = len(self.comment_count)
+        self.comment_count += np.bincount(live, minlength=n_lives)
+
+        # 분별 댓글 수 (새 키는 합치고 기존 키는 더함)
+        times = chunk[time_col].astype("category")  # 같은 경과 시간 문자열은 한 번만 파싱 (결측 code -1 → 마지막 NaN)
+        minutes = np.floor(np.append(parse_seconds(times.cat.categories), np.nan)[times.cat.codes] / 60)
+        ok = ~np.isnan(minutes)
+        keys, counts = np.unique((live[ok] << _minute_bits) + minutes[ok].astype(np.int64), return_counts=True)
+        all_keys = np.concatenate([self._minute_keys, keys])
+        all_counts = np.concatenate([self._minute_counts, counts])
+        self._minute_keys, inverse = np.unique(all_keys, return_inverse=True)
+        self._minute_counts = np.bincount(inverse, weights=all_counts, minlength=len(self._minute_keys)).astype(np.int64)
+
+        # 고유 작성자 수 (작성자 해시와 라이브 번호를 섞은 64bit 키, 처음 보는 키만 라이브별로 셈)
+        if nickname_col in chunk.columns:
+            names = chunk[nickname_col].astype("category")
+            name_hash = pd.util.hash_array(names.cat.categories.to_numpy(dtype=object))[names.cat.codes]
+            pair = name_hash ^ (live.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+            pair, first = np.unique(pair, return_index=True)
+            pos = np.searchsorted(self._seen, pair)
+            is_new = (pos >= len(self._seen)) | (self._seen[np.minimum(pos, len(self._seen) - 1)] != pair) \
+                if len(self._seen) else np.ones(len(pair), dtype=bool)
+            self.unique_commenters += np.bincount(live[first[is_new]], minlength=n_lives)
+            self._seen = np.insert(self._seen, pos[is_new], pair[is_new])  # 정렬 유지하며 삽입
+
+        # 방송 길이 (초, 라이브별 최대값)
+        if duration_col in chunk.columns:
+            dur = pd.to_numeric(chunk[duration_col], errors="coerce").to_numpy(dtype=float)
+            per_live = pd.Series(dur).groupby(live).max()
+            idx = per_live.index.to_numpy()
+            self.duration_sec[idx] = np.fmax(self.duration_sec[idx], per_live.to_numpy())
+
+    # 분별 댓글 수 (live_code, minute, comment_count)
+    def minutes(self):
+        live = self._minute_keys >> _minute_bits
+        return pd.DataFrame({"live_code": self.code_index.live_codes[live],
+                             "minute": self._minute_keys - (live << _minute_bits),
+                             "comment_count": self._minute_counts})
+
+    # 라이브별 집계 (duration_min: 댓글 파일 방송 길이 → 없으면 live_info → 없으면 댓글이 있던 분 범위)
+    def stats(self, live_info_df=None):
+        live = self._minute_keys >> _minute_bits
+        minute = self._minute_keys - (live << _minute_bits)
+        per_live = pd.DataFrame({"live": live, "minute": minute, "count": self._minute_counts}).groupby("live").agg(
+            active_minutes=("minute", "size"), first_minute=("minute", "min"), last_minute=("minute", "max"),
+            peak_minute_comments=("count", "max"))
+
+        has_comments = np.flatnonzero(self.comment_count > 0)
+        stats_df = pd.DataFrame({"live_code": self.code_index.live_codes[has_comments],
+                                 "comment_count": self.comment_count[has_comments],
+                                 "unique_commenters": self.unique_commenters[has_comments]})
+        per_live = per_live.reindex(has_comments)
+        stats_df["active_minutes"] = per_live["active_minutes"].fillna(0).to_numpy(dtype=np.int64)
+        stats_df["peak_minute_comments"] = per_live["peak_minute_comments"].fillna(0).to_numpy(dtype=np.int64)
+
+        duration = self.duration_sec[has_comments] / 60
+        if live_info_df is not None:
+            info = live_info_df.drop_duplicates("live_code").set_index("live_code")
+            stats_df = stats_df.join(info[["date", "duration_min"]].rename(columns={"duration_min": "info_min"}),
+                                     on="live_code")
+            duration = np.where(np.isnan(duration), stats_df["info_min"].to_numpy(dtype=float), duration)
+            stats_df = stats_df.drop(columns="info_min")
+        span = (per_live["last_minute"] - per_live["first_minute"] + 1).to_numpy(dtype=float)
+        duration = np.where(np.isnan(duration) | (duration <= 0), span, duration)
+
+        stats_df["duration_min"] = duration
+        stats_df["comment_rate"] = stats_df["comment_count"] / duration  # 분당 댓글 수
+        stats_df["peak_intensity"] = stats_df["peak_minute_comments"] / stats_df["comment_rate"]  # 최고 분 / 평균 분
+        return stats_df[[c for c in stats_columns if c in stats_df.columns]]
+
+
+# 댓글 CSV 스트리밍 집계
+@instrumentation.traced("load", name="live_comments")
+def ingest(comment_path, code_index, brand=None, chunksize=chunksize):
+    aggregator = CommentAggregator(code_index)
+    wanted = {url_col, time_col, nickname_col, duration_col}
+    reader = pd.read_csv(comment_path, usecols=lambda c: c in wanted, chunksize=chunksize,
+                         dtype={url_col: "category", nickname_col: "category", time_col: str})
+    for chunk in reader:
+        aggregator.update(chunk, brand)
+    return aggregator
+
+
+def stats_path(brand, data_path=DATA_PATH):
+    return schemas.table_path("live_comment_stats", brand, data_path)
+
+
+def run(brand, comment_path, data_path=DATA_PATH, chunksize=chunksize):
+    code_index = LiveCodeIndex.from_csv(data_file(f"live_code_{brand}.csv", data_path))
+    aggregator = ingest(comment_path, code_index, brand, chunksize)
+    live_info_df = schemas.load("live_info", brand, data_path, columns=["live_code", "date", "duration_min"])
+
+    # 라이브별 집계 (proxy_sales.py 참여도 feature) + 분별 댓글 수
+    stats_df = aggregator.stats(live_info_df)
+    undated = stats_df["date"].isna()
+    if undated.any():
+        print(f"[{brand}] live_info 에 없는 라이브 {int(undated.sum())}개는 날짜를 알 수 없어 제외")
+        stats_df = stats_df[~undated].reset_index(drop=True)
+    instrumentation.to_csv(stats_df, stats_path(brand, data_path), index=False, encoding="utf-8-sig")
+    instrumentation.to_csv(aggregator.minutes(), data_file(f"live_comment_minutes_{brand}.csv", data_path), index=False,
+                           encoding="utf-8-sig")
+    print(f"[{brand}] 댓글 {aggregator.n_rows}건 (live_code 없음 {aggregator.n_unmatched}건), 라이브 {len(stats_df)}개 집계")
+    return stats_df
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+
+    run(brand, rf"D:\School\5-2\{brand}_comments.csv")
@@ -1,39 +1,56 @@
-import pandas as pd
+import instrumentation
 
-brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
 
-# CSV 불러오기
-df = pd.read_csv(rf"D:\School\5-2\{brand}_liveinfo.csv")
-codes_df = pd.read_csv(rf"D:\School\5-2\데이터\shoppinglive_data\live_code_{brand}.csv")
+# 라이브 정보 CSV 에 live_code 붙이기
+def run(brand, liveinfo_path, live_code_path, out_path):
+    # CSV 불러오기
+    df = instrumentation.read_csv(liveinfo_path)
+    codes_df = instrumentation.read_csv(live_code_path)
 
-# 기존 df 행 수 확인
-print("Number of rows before merge : ", len(df))
+    # 기존 df 행 수 확인
+    print("Number of rows before merge : ", len(df))
 
-# df 컬럼명 변경
-df = df.rename(columns={"url": "live_url"})
+    # df 컬럼명 변경
+    df = df.rename(columns={"url": "live_url"})
 
-# live_url 앞의 불필요한 부분 제거 (존재할 때만)
-df["live_url"] = df["live_url"].str.replace(rf"^{brand}_", "", regex=True)
+    # live_url 앞의 불필요한 부분 제거 (존재할 때만)
+    df["live_url"] = df["live_url"].str.replace(rf"^{brand}_", "", regex=True)
 
-# /replays/ 뒤의 숫자만 추출해서 새로운 컬럼 생성
-df["url_code"] = df["live_url"].str.extract(r'/replays/(\d+)')
-codes_df["url_code"] = codes_df["live_url"].str.extract(r'/replays/(\d+)')
+    # /replays/ 뒤의 숫자만 추출해서 새로운 컬럼 생성
+    df["url_code"] = df["live_url"].str.extract(r'/replays/(\d+)')
+    codes_df["url_code"] = codes_df["live_url"].str.extract(r'/replays/(\d+)')
 
-# codes_df 에서 필요한 컬럼만 선택
-codes_df = codes_df[["url_code", "live_code"]]
+    # codes_df 에서 필요한 컬럼만 선택 (prod_codes 는 estimate_live_ad_spend 입력)
+    codes_df = codes_df[["url_code", "live_code", "prod_codes"]]
 
-# df 기준 병합
-merged_df = pd.merge(df, codes_df, on="url_code", how="left")
+    # df 기준 병합
+    merged_df = instrumentation.merge(df, codes_df, name="live_code 병합", on="url_code", how="left")
 
-# 원하는 컬럼 순서 지정
-# desired_order = ["live_code", "time", "nickname", "comment", "total_duration(sec)","live_url"]
-desired_order = ["live_code", "date", "start_time", "end_time", "duration_min","viewer_count", "promotion_flag", "promotion_text"]
-merged_df = merged_df[desired_order]
+    # 원하는 컬럼 순서 지정
+    # desired_order = ["live_code", "time", "nickname", "comment", "total_duration(sec)","live_url"]
+    desired_order = ["live_code", "date", "start_time", "end_time", "duration_min","viewer_count", "promotion_flag", "promotion_text",
+                     "prod_codes"]
+    merged_df = merged_df[desired_order]
 
-# 병합 후 merged_df 행 수 확인
-print("Number of rows after merge : ", len(merged_df))
+    # 병합 후 merged_df 행 수 확인
+    print("Number of rows after merge : ", len(merged_df))
 
-# 결과 저장
-merged_df.to_csv(rf"D:\School\5-2\데이터\shoppinglive_data\live_info_{brand}.csv", index=False, encoding="utf-8-sig")
+    # 결과 저장
+    instrumentation.to_csv(merged_df, out_path, index=False, encoding="utf-8-sig")
+    return merged_df
 
-print(merged_df.head(10))
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    trace = False  # True: 읽기 / 병합 / 저장 단계별 시간, 메모리, 행 수를 trace 폴더에 JSON 으로 기록
+
+    if trace:
+        instrumentation.enable()
+
+    merged_df = run(brand, rf"D:\School\5-2\{brand}_liveinfo.csv",
+                    rf"D:\School\5-2\데이터\shoppinglive_data\live_code_{brand}.csv",
+                    rf"D:\School\5-2\데이터\shoppinglive_data\live_info_{brand}.csv")
+    print(merged_df.head(10))
+
+    if trace:
+        print(f"계측 기록 저장: {instrumentation.write_run('trace', script='liveinfo_comment_data_processing', brand=brand)}")
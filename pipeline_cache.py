@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+
+import instrumentation
+from brand_config import DATA_PATH
+
+#############################################
+######    stage 결과 캐시 (Feather 파일)    #####
+#############################################
+# 입력 파일 내용 + 파라미터의 해시를 키로 stage 결과를 저장
+# 입력이 같으면 계산을 건너뛰고, 저장된 Arrow 파일을 memory-map 으로 바로 읽음
+# 키에는 stage 계산 코드(모듈 소스) 해시와 캐시 형식 버전도 포함 → 공식이 바뀌면 이전 결과를 쓰지 않음
+CACHE_DIRNAME = "cache"
+CACHE_FORMAT = 1  # 캐시 파일 저장 형식이 바뀌면 올림
+
+
+# 파일 내용 해시 (청크 단위로 읽어서 큰 파일도 메모리 사용 일정)
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# stage 계산 코드 버전 = 모듈 소스 파일 해시들
+def code_digest(modules):
+    return [file_digest(module.__file__) for module in modules]
+
+
+# stage 캐시 키 = (stage, brand, 입력 해시들, 파라미터, 코드 해시, 캐시 형식) 해시
+def make_key(stage, brand, inputs, params=None, code=None):
+    payload = json.dumps({"stage": stage, "brand": brand, "inputs": list(inputs), "params": params or {},
+                          "code": list(code or []), "format": CACHE_FORMAT},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class PipelineCache:
+    def __init__(self, data_path=DATA_PATH, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(data_path, CACHE_DIRNAME)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, stage, brand, key):
+        return os.path.join(self.cache_dir, f"{stage}_{brand}_{key}.feather")
+
+    # 캐시에 있으면 읽고, 없으면 compute() 실행 후 저장 (같은 stage/brand 의 이전 키 파일은 삭제)
+    # code: compute() 가 쓰는 모듈들 (소스가 바뀌면 다시 계산)
+    # 반환: (DataFrame, 캐시 키, 캐시 적중 여부) / 캐시 키는 하위 stage 의 입력으로 사용
+    def get_or_compute(self, stage, brand, inputs, params, compute, code=()):
+        key = make_key(stage, brand, inputs, params, code_digest(code))
+        path = self.path(stage, brand, key)
+        with instrumentation.stage(stage, brand) as record:
+            hit = os.path.exists(path)
+            df = self.load(path) if hit else compute()
+            if not hit:
+                self.save(df, path)
+            self.prune(stage, brand, key)
+            record.update(cache_hit=hit, rows_out=len(df))
+        return df, key, hit
+
+    @staticmethod
+    def save(df, path):
+        # 임시 파일에 쓴 뒤 교체 (여러 프로세스가 동시에 써도 깨진 파일이 남지 않음)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def load(path):
+        import pyarrow.feather as feather
+
+        # 비압축 Arrow 파일이라 memory-map 으로 읽을 수 있음
+        return feather.read_table(path, memory_map=True).to_pandas()
+
+    # 특정 stage/brand 의 오래된 캐시 삭제 (keep_key 만 남김)
+    def prune(self, stage, brand, keep_key):
+        prefix = f"{stage}_{brand}_"
+        for f in os.listdir(self.cache_dir):
+            # key 는 16자리 hex → 다른 stage/brand 이름이 prefix 로 겹쳐도 지우지 않음
+            key = f[len(prefix):-len(".feather")]
+            if f.startswith(prefix) and f.endswith(".feather") and len(key) == 16 and "_" not in key and key != keep_key:
+                try:
+                    os.remove(os.path.join(self.cache_dir, f))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,198 @@
+import os
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import schemas
+from brand_config import DATA_PATH, data_file
+from live_comments import LiveCodeIndex, chunksize, parse_url_codes, url_col
+
+#############################################
+######    프로모션 태깅 (키워드 자동자)     #####
+#############################################
+# 할인 / 증정 / 1+1 / 이벤트 키워드 사전을 Aho-Corasick 자동자 하나로 만들어서
+# promotion_text, 라이브 제목(live_code 의 live_name), 댓글을 한 번씩만 훑어 모든 키워드를 동시에 찾음
+# 같은 문구는 한 번만 검사 (category 고유값 단위) → 사전이 바뀌어도 전체 이력 재태깅이 빠름
+# 키워드는 소문자 + 공백 제거 후 비교 ("1 + 1" = "1+1", "SALE" = "sale")
+# data/promo_keywords.csv (keyword, type, weight) 가 있으면 기본 사전 대신 사용
+# 할인율 "NN%" 는 키워드 대신 정규식으로 찾아 discount 점수 1 추가 ("100% 국내산" 같은 표기는 할인 아님)
+KEYWORD_FILE = "promo_keywords.csv"
+promo_keywords = {
+    "discount": ["할인", "특가", "세일", "sale", "쿠폰", "타임딜", "최저가", "반값", "적립", "페이백", "무료배송"],
+    "gift": ["증정", "사은품", "선물", "gift", "기프티콘", "교환권", "상품권", "경품", "추가구성"],
+    "bundle": ["1+1", "2+1", "3+1", "1+1+1", "묶음"],
+    "event": ["이벤트", "event", "추첨", "구매인증", "소통왕", "영업왕", "퀴즈", "당첨", "리뷰이벤트"],
+}
+promo_types = list(promo_keywords)
+discount_pattern = r"(?<!\d)(\d{1,2})\s*%"  # 1~99%
+comment_col = "comment"
+
+
+def normalize(text):
+    return "".join(str(text).lower().split())
+
+
+# 키워드 → (유형, 가중치) 자동자 (goto / fail / output)
+class KeywordAutomaton:
+    def __init__(self, keywords):
+        self.goto, self.fail, self.output = [{}], [0], [[]]
+        for keyword, (label, weight) in keywords.items():
+            state = 0
+            for ch in normalize(keyword):
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append((keyword, label, weight))
+
+        # 실패 링크 (BFS, 깊이 1 상태는 root 로), 접미사 상태의 출력도 함께 모음
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    # 문자열 한 번 훑으면서 찾은 키워드의 유형별 가중치 합 (같은 키워드가 여러 번 나와도 한 번만)
+    def scan(self, text):
+        goto, fail, output = self.goto, self.fail, self.output
+        found = {}
+        state = 0
+        for ch in normalize(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword, label, weight in output[state]:
+                found[keyword] = (label, weight)
+        scores = {}
+        for label, weight in found.values():
+            scores[label] = scores.get(label, 0) + weight
+        return scores
+
+    # 문자열 Series → (행 수, 유형 수) 점수 (고유 문구만 검사, 결측은 0)
+    def score_texts(self, texts, types=promo_types):
+        texts = pd.Series(texts).astype("category")
+        unique_scores = np.zeros((len(texts.cat.categories) + 1, len(types)))  # 마지막 행: 결측 (code -1)
+        for i, text in enumerate(texts.cat.categories):
+            for label, score in self.scan(text).items():
+                unique_scores[i, types.index(label)] = score
+        return unique_scores[texts.cat.codes.to_numpy()]
+
+
+# 문자열 Series 중 할인율 "NN%" 가 있는 행 (고유 문구만 검사, 결측은 False)
+def has_discount_pct(texts):
+    texts = pd.Series(texts).astype("category")
+    found = pd.Series(texts.cat.categories).astype(str).str.extract(discount_pattern)[0].notna().to_numpy()
+    return np.append(found, False)[texts.cat.codes.to_numpy()]
+
+
+def load_keywords(data_path=DATA_PATH):
+    path = data_file(KEYWORD_FILE, data_path)
+    if not os.path.exists(path):
+        return {kw: (label, 1.0) for label, kws in promo_keywords.items() for kw in kws}
+    keywords_df = pd.read_csv(path, dtype={"keyword": str, "type": str})
+    unknown = sorted(set(keywords_df["type"]) - set(promo_types))
+    if unknown:
+        raise ValueError(f"{KEYWORD_FILE} 에 알 수 없는 프로모션 유형이 있습니다: {unknown} (가능: {promo_types})")
+    weights = keywords_df["weight"] if "weight" in keywords_df.columns else pd.Series(1.0, index=keywords_df.index)
+    return {kw: (label, float(w)) for kw, label, w in zip(keywords_df["keyword"], keywords_df["type"], weights)}
+
+
+# 댓글 중 프로모션 키워드가 있는 댓글 수 (라이브별, chunk 스트리밍)
+def comment_mentions(comment_path, code_index, automaton, brand=None):
+    mentions = np.zeros(len(code_index.live_codes), dtype=np.int64)
+    totals = np.zeros(len(code_index.live_codes), dtype=np.int64)
+    reader = pd.read_csv(comment_path, usecols=[url_col, comment_col], chunksize=chunksize,
+                         dtype={url_col: "category", comment_col: "category"})
+    for chunk in reader:
+        urls = chunk[url_col].cat
+        live = code_index.lookup(parse_url_codes(urls.categories, brand).to_numpy()[urls.codes])
+        hit = (automaton.score_texts(chunk[comment_col]).sum(axis=1) > 0) | has_discount_pct(chunk[comment_col])
+        matched = live >= 0
+        totals += np.bincount(live[matched], minlength=len(totals))
+        mentions += np.bincount(live[matched & hit], minlength=len(mentions))
+    return pd.DataFrame({"live_code": code_index.live_codes, "comment_promo_mentions": mentions,
+                         "comment_promo_share": np.divide(mentions, totals, out=np.zeros(len(totals)), where=totals > 0)})
+
+
+# 라이브별 프로모션 플래그 / 유형 / 강도
+# promotion_flag     : promotion_text 또는 제목에 키워드가 하나라도 있으면 1
+# promotion_type     : 점수가 있는 유형을 promo_types 순서로 "+" 연결 (예: "discount+gift")
+# promotion_intensity: 키워드 가중치 합 (promotion_text + 제목)
+# max_discount_pct   : 제목 / promotion_text 의 "NN%" (1~99) 중 최대값
+@instrumentation.traced()
+def tag_lives(live_info_df, live_code_df=None, automaton=None, comments_df=None):
+    automaton = automaton or KeywordAutomaton(load_keywords())
+    tagged = live_info_df[["live_code", "date"]].copy()
+    texts = [live_info_df["promotion_text"]] if "promotion_text" in live_info_df.columns else []
+    if live_code_df is not None:
+        titles = live_code_df.drop_duplicates("live_code").set_index("live_code")["live_name"]
+        texts.append(live_info_df["live_code"].astype(str).map(titles))
+
+    # 문구별 할인율 (없으면 NaN)
+    pcts = [t.reset_index(drop=True).astype(str).str.extractall(discount_pattern)[0].astype(float)
+            .groupby(level=0).max().reindex(range(len(tagged))) for t in texts]
+
+    scores = np.zeros((len(tagged), len(promo_types)))
+    for t, pct in zip(texts, pcts):
+        scores += automaton.score_texts(t.reset_index(drop=True))
+        scores[:, promo_types.index("discount")] += pct.notna().to_numpy()
+    for j, label in enumerate(promo_types):
+        tagged[f"{label}_score"] = scores[:, j]
+
+    tagged["promotion_flag"] = (scores.sum(axis=1) > 0).astype(np.int8)
+    tagged["promotion_type"] = ["+".join(label for label, s in zip(promo_types, row) if s > 0) for row in scores]
+    tagged["promotion_intensity"] = scores.sum(axis=1)
+
+    pct = pd.concat(pcts, axis=1).max(axis=1) if texts else pd.Series(np.nan, index=range(len(tagged)))
+    tagged["max_discount_pct"] = pct.fillna(0).to_numpy()
+
+    if comments_df is not None:
+        tagged = tagged.merge(comments_df, on="live_code", how="left")
+        tagged[["comment_promo_mentions", "comment_promo_share"]] = \
+            tagged[["comment_promo_mentions", "comment_promo_share"]].fillna(0)
+    return tagged
+
+
+# 결과: live_promotions_{brand}.csv (update_live_info=True 면 live_info_{brand}.csv 의 promotion_flag 도 새 정의로 교체)
+def run(brand, data_path=DATA_PATH, comment_path=None, update_live_info=False):
+    automaton = KeywordAutomaton(load_keywords(data_path))
+    live_info_df = schemas.load("live_info", brand, data_path, columns=["live_code", "date", "promotion_text"])
+    code_path = data_file(f"live_code_{brand}.csv", data_path)
+    live_code_df = instrumentation.read_csv(code_path, usecols=["live_code", "live_name", "live_url"], dtype=str) \
+        if os.path.exists(code_path) else None
+
+    comments_df = None
+    if comment_path is not None and live_code_df is not None:
+        comments_df = comment_mentions(comment_path, LiveCodeIndex(live_code_df), automaton, brand)
+
+    tagged = tag_lives(live_info_df, live_code_df, automaton, comments_df)
+    instrumentation.to_csv(tagged, data_file(f"live_promotions_{brand}.csv", data_path), index=False,
+                           encoding="utf-8-sig")
+
+    if update_live_info:
+        path = schemas.table_path("live_info", brand, data_path)
+        raw_df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        # 행 위치가 아니라 live_code 기준으로 교체 (live_code 가 없는 행은 기존 값 유지)
+        flags = tagged.groupby(tagged["live_code"].astype(str), observed=True)["promotion_flag"].max().astype(str)
+        raw_df["promotion_flag"] = raw_df["live_code"].map(flags).fillna(raw_df["promotion_flag"])
+        tmp_path = f"{path}.tmp"
+        raw_df.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        os.replace(tmp_path, path)
+
+    print(f"[{brand}] 라이브 {len(tagged)}개 중 프로모션 {int(tagged['promotion_flag'].sum())}개")
+    return tagged
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+
+    print(run(brand)[["live_code", "promotion_flag", "promotion_type", "promotion_intensity"]].head(10))
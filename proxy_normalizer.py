@@ -0,0 +1,106 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+#############################################
+######   proxy_sales 정규화 상태 저장 / 갱신   #####
+#############################################
+# MinMaxScaler 의 min/max 와 2024년 기준 scaling factor 를 파일로 저장
+# 새 날짜가 기존 min/max 범위 안이면 새 행만 계산하고,
+# 범위를 벗어나거나 기준 연도(2024) 데이터가 바뀌면 전체 재계산
+STATE_FORMAT = 1
+calibration_year = 2024
+
+
+class ProxyNormalizer:
+    def __init__(self, columns, data_min, data_max, actual_sales, proxy_total=0.0, last_date=None, n_rows=0,
+                 version=1):
+        self.columns = list(columns)
+        self.data_min = np.asarray(data_min, dtype=float)
+        self.data_max = np.asarray(data_max, dtype=float)
+        self.actual_sales = float(actual_sales)
+        self.proxy_total = float(proxy_total)  # 기준 연도 proxy_sales_raw 합계
+        self.last_date = None if last_date is None else pd.Timestamp(last_date)
+        self.n_rows = int(n_rows)
+        self.version = int(version)
+
+    # 전체 데이터로 min/max, scaling factor 계산
+    @classmethod
+    def fit(cls, merged_df, columns, actual_sales, version=1):
+        scaler = MinMaxScaler().fit(merged_df[columns])
+        normalizer = cls(columns, scaler.data_min_, scaler.data_max_, actual_sales, version=version)
+        raw = normalizer.raw_score(merged_df)
+        normalizer.proxy_total = raw[normalizer._in_calibration_year(merged_df)].sum()
+        normalizer.last_date = pd.to_datetime(merged_df["date"]).max()
+        normalizer.n_rows = len(merged_df)
+        return normalizer
+
+    # 정규화 (Min-Max Scaling, MinMaxScaler.transform 과 같은 계산)
+    def normalize(self, df):
+        data_range = self.data_max - self.data_min
+        scale = 1.0 / np.where(data_range == 0, 1.0, data_range)
+        return df[self.columns].to_numpy(dtype=float) * scale - self.data_min * scale
+
+    # 정규화된 변수 합 (proxy_sales_raw)
+    def raw_score(self, df):
+        return self.normalize(df).sum(axis=1)
+
+    @property
+    def scaling_factor(self):
+        return self.actual_sales / self.proxy_total if self.proxy_total > 0 else 0
+
+    # 최종 proxy_sales
+    def score(self, df):
+        return self.raw_score(df) * self.scaling_factor
+
+    def _in_calibration_year(self, df):
+        return (pd.to_datetime(df["date"], errors="coerce").dt.year == calibration_year).to_numpy()
+
+    # 새 행이 기존 상태로 계산 가능한지 확인
+    # 반환: min/max 가 바뀌는 컬럼 목록, 기준 연도 데이터 포함 여부
+    def check(self, new_df):
+        values = new_df[self.columns].to_numpy(dtype=float)
+        if len(values) == 0:
+            return [], False
+        new_min, new_max = values.min(axis=0), values.max(axis=0)
+        changed = [c for c, lo, hi, mn, mx in zip(self.columns, new_min, new_max, self.data_min, self.data_max)
+                   if lo < mn or hi > mx]
+        return changed, bool(self._in_calibration_year(new_df).any())
+
+    # 상태를 바꾸지 않는 새 행 반영 (check 결과가 비어 있을 때만)
+    def append(self, new_df):
+        self.last_date = max(self.last_date, pd.to_datetime(new_df["date"]).max())
+        self.n_rows += len(new_df)
+
+    def to_dict(self):
+        return {
+            "format": STATE_FORMAT,
+            "version": self.version,
+            "columns": self.columns,
+            "data_min": self.data_min.tolist(),
+            "data_max": self.data_max.tolist(),
+            "actual_sales": self.actual_sales,
+            "calibration_year": calibration_year,
+            "proxy_total": self.proxy_total,
+            "scaling_factor": self.scaling_factor,
+            "last_date": None if self.last_date is None else self.last_date.strftime("%Y-%m-%d"),
+            "n_rows": self.n_rows,
+        }
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("format") != STATE_FORMAT:
+            raise ValueError(f"지원하지 않는 정규화 상태 파일 형식입니다: {path}")
+        return cls(state["columns"], state["data_min"], state["data_max"], state["actual_sales"],
+                   state["proxy_total"], state["last_date"], state["n_rows"], state["version"])
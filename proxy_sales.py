@@ -1,105 +1,223 @@
-import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-
-brand = 'L'  # 'B', 'D', 'L' *********************************************************************************************************************************
-
-data_path = r"D:\School\5-2\데이터"
-# CSV 읽기
-searches_df = pd.read_csv(rf"{data_path}\search_volume_total.csv")
-prod_code_df = pd.read_csv(rf"{data_path}\prod_code_{brand}.csv")
-reviews_df = pd.read_csv(rf"{data_path}\product_review_{brand}.csv")
-live_info_df = pd.read_csv(rf"{data_path}\live_info_{brand}.csv")
-
-# 필요한 컬럼 선택
-searches_df = searches_df[["brand", "date", "search_volume_abs"]]
-prod_code_df = prod_code_df[["prod_code", "prod_name"]]
-reviews_df = reviews_df[["상품코드", "날짜", "별점", "판매여부"]]
-live_info_df = live_info_df[["live_code", "date", "duration_min", "viewer_count", "promotion_flag"]]
-
-# 컬럼명 변경
-reviews_df = reviews_df.rename(columns={"상품코드": "prod_code", "날짜": "date", "별점": "rating", "판매여부": "is_available"})
-
-# 필요한 행 필터링
-if brand == 'B':
-    searches_df = searches_df[searches_df["brand"].str.contains("비에날씬", na=False)]  # 비에날씬 검색량만
-    prod_code_df = prod_code_df[prod_code_df["prod_name"].str.contains("비에날씬", na=False)]  # 비에날씬 상품만
-    reviews_df = reviews_df[reviews_df["prod_code"].isin(prod_code_df["prod_code"])]  # prod_code_df에 있는 상품코드만
-elif brand == 'D':
-    searches_df = searches_df[searches_df["brand"].str.contains("덴마크 유산균", na=False)]
-    prod_code_df = prod_code_df[prod_code_df["prod_name"].str.contains("덴마크 유산균", na=False)]
-    reviews_df = reviews_df[reviews_df["prod_code"].isin(prod_code_df["prod_code"])]
-elif brand == 'L':
-    searches_df = searches_df[searches_df["brand"].str.contains("락토핏", na=False)]
-    prod_code_df = prod_code_df[prod_code_df["prod_name"].str.contains("락토핏", na=False)]
-    reviews_df = reviews_df[reviews_df["prod_code"].isin(prod_code_df["prod_code"])]
-
-# 날짜별 rating 평균 + 일별 리뷰 수 집계
-reviews_df = reviews_df.groupby("date").agg(
-    avg_rating=("rating", "mean"),        # 날짜별 평균 평점
-    daily_review_count=("prod_code", "count")  # 날짜별 리뷰 수
-).reset_index()
+import os
 
-# 세 데이터프레임 합치기
-merged_df = searches_df.merge(reviews_df, on="date", how="outer") \
-                       .merge(live_info_df, on="date", how="outer")
-
-# 날짜 오름차순 정렬
-merged_df = merged_df.sort_values("date").reset_index(drop=True)
+import numpy as np
+import pandas as pd
 
-# # 중간 저장
-# merged_df.to_csv(rf"D:\School\5-2\데이터\proxy_sales_input_{brand}.csv", index=False, encoding="utf-8-sig")
-print(merged_df.head())
+import instrumentation
+import schemas
+from brand_config import DATA_PATH, data_file, get_brand
+from daily_join import join_daily, join_strings, to_daily
+from proxy_normalizer import ProxyNormalizer
 
 # 정규화 변수 목록
 cols_to_normalize = ["search_volume_abs", "avg_rating", "daily_review_count", "duration_min", "viewer_count", "promotion_flag"]
 
-# 결측치 처리 (없는 값 0으로)
-merged_df[cols_to_normalize] = merged_df[cols_to_normalize].fillna(0)
-
-# 정규화용 복사본 df 생성
-norm_df = merged_df.copy()
-
-# 정규화 (Min-Max Scaling)
-scaler = MinMaxScaler()
-norm_df[[f"{col}_norm" for col in cols_to_normalize]] = scaler.fit_transform(merged_df[cols_to_normalize])
-
-# 정규화된 변수 합으로 proxy_sales_raw 계산
-norm_df["proxy_sales_raw"] = norm_df[[f"{col}_norm" for col in cols_to_normalize]].sum(axis=1)
-
-# 스케일링 (비에날씬 2024년 매출액 2688억 원)
-norm_df["year"] = pd.to_datetime(norm_df["date"], errors="coerce").dt.year
-sales_2024 = norm_df[norm_df["year"] == 2024]
-proxy_total_2024 = sales_2024["proxy_sales_raw"].sum()
-actual_sales_2024 = 2688 * 1e8
-scaling_factor = actual_sales_2024 / proxy_total_2024 if proxy_total_2024 > 0 else 0
-
-# 최종 proxy_sales 계산 (모든 연도에 스케일 적용)
-merged_df["proxy_sales"] = norm_df["proxy_sales_raw"] * scaling_factor
-print(f"2024년 기준 scaling factor: {scaling_factor:.6f}")
-
-# proxy_sales 포함한 csv 저장
-merged_df.to_csv(rf"D:\School\5-2\데이터\proxy_sales_{brand}.csv", index=False, encoding="utf-8-sig")
-
-print(merged_df[["date", "proxy_sales"]].head(10))
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+# 라이브 댓글 참여도 (live_comments.py 결과가 있을 때만 추가, proxy_sales 계산에는 사용하지 않음)
+engagement_agg = {"comment_count": "sum", "unique_commenters": "sum", "peak_minute_comments": "max"}
 
 
+# 날짜별 rating 평균 + 일별 리뷰 수 집계
+# reviews_df: 리뷰 원본(상품코드, 날짜, 별점, ...) 또는 review_data_processing.py 의 일별 집계
+@instrumentation.traced()
+def aggregate_reviews(reviews_df, prod_codes):
+    if "review_count" in reviews_df.columns:
+        daily_df = reviews_df[reviews_df["prod_code"].isin(prod_codes)]
+        daily_df = daily_df.assign(date=pd.to_datetime(daily_df["date"]))
+        daily_df = daily_df.groupby("date")[["rating_sum", "rating_count", "review_count"]].sum()
+        return pd.DataFrame({
+            "avg_rating": daily_df["rating_sum"] / daily_df["rating_count"],  # 날짜별 평균 평점
+            "daily_review_count": daily_df["review_count"],  # 날짜별 리뷰 수
+        }).reset_index()
+
+    # 컬럼명 변경
+    reviews_df = reviews_df[[c for c in ["상품코드", "날짜", "별점", "판매여부"] if c in reviews_df.columns]]
+    reviews_df = reviews_df.rename(columns={"상품코드": "prod_code", "날짜": "date", "별점": "rating", "판매여부": "is_available"})
+    reviews_df = reviews_df.astype({"rating": float})  # float32 로 읽은 별점도 평균은 float64 로 계산
+    reviews_df = reviews_df[reviews_df["prod_code"].isin(prod_codes)]
+    reviews_df = reviews_df.assign(date=pd.to_datetime(reviews_df["date"]))
+
+    return reviews_df.groupby("date").agg(
+        avg_rating=("rating", "mean"),        # 날짜별 평균 평점
+        daily_review_count=("prod_code", "count")  # 날짜별 리뷰 수
+    ).reset_index()
+
+
+# 리뷰 입력 파일 (일별 집계가 있으면 우선 사용)
+def review_path(brand, data_path=DATA_PATH):
+    daily_path = data_file(f"review_daily_{brand}.csv", data_path)
+    return daily_path if os.path.exists(daily_path) else data_file(f"product_review_{brand}.csv", data_path)
+
+
+def load_reviews(brand, data_path=DATA_PATH):
+    path = review_path(brand, data_path)
+    return schemas.read_table("review_daily" if path.endswith(f"review_daily_{brand}.csv") else "product_review", path)
+
+
+# 검색량 / 리뷰 / 라이브 데이터를 일 단위로 합치기 (start 이후 날짜만 달력에 포함)
+@instrumentation.traced("merge")
+def merge_inputs(brand, searches_df, prod_code_df, reviews_df, live_info_df, start=None, engagement_df=None):
+    keyword = get_brand(brand)['keyword']
+
+    # 필요한 컬럼 선택
+    searches_df = searches_df[["brand", "date", "search_volume_abs"]]
+    prod_code_df = prod_code_df[["prod_code", "prod_name"]]
+    live_info_df = live_info_df[["live_code", "date", "duration_min", "viewer_count", "promotion_flag"]]
+
+    # 날짜 타입 통일 (CSV 문자열 / 캐시 datetime 모두 허용)
+    searches_df = searches_df.assign(date=pd.to_datetime(searches_df["date"]))
+    live_info_df = live_info_df.assign(date=pd.to_datetime(live_info_df["date"]))
+
+    # 필요한 행 필터링 (브랜드 키워드 기준)
+    searches_df = searches_df[searches_df["brand"].str.contains(keyword, na=False)]  # 해당 브랜드 검색량만
+    prod_code_df = prod_code_df[prod_code_df["prod_name"].str.contains(keyword, na=False)]  # 해당 브랜드 상품만
+    reviews_df = aggregate_reviews(reviews_df, prod_code_df["prod_code"])  # prod_code_df에 있는 상품코드만
+
+    # 증분 계산: start 이후 날짜만
+    if start is not None:
+        searches_df = searches_df[searches_df["date"] >= start]
+        reviews_df = reviews_df[reviews_df["date"] >= start]
+        live_info_df = live_info_df[live_info_df["date"] >= start]
+
+    # 세 데이터프레임을 일 단위로 집계 후 공통 달력 위에 합치기 (날짜 오름차순)
+    # 같은 날 라이브가 여러 개면 시간/시청자 수는 합계, 프로모션 여부는 최대값
+    # 댓글 참여도는 달력 범위 안에서만 붙임
+    lookups = [] if engagement_df is None else [to_daily(engagement_df, engagement_agg)]
+    merged_df = join_daily([
+        to_daily(searches_df, {"search_volume_abs": "sum"}),
+        to_daily(reviews_df, {"avg_rating": "mean", "daily_review_count": "sum"}),
+        to_daily(live_info_df, {"live_code": join_strings, "duration_min": "sum", "viewer_count": "sum",
+                                "promotion_flag": "max"}),
+    ], lookups=lookups, start=start)
+    merged_df.insert(0, "brand", keyword)
+
+    # 결측치 처리 (없는 값 0으로)
+    merged_df[cols_to_normalize] = merged_df[cols_to_normalize].fillna(0)
+    if engagement_df is not None:
+        # 댓글이 없는 날은 0
+        merged_df[list(engagement_agg)] = merged_df[list(engagement_agg)].fillna(0)
+    return merged_df
+
+
+# proxy_sales 계산 (전체 이력으로 정규화 상태를 새로 계산)
+@instrumentation.traced()
+def build_proxy_sales(brand, searches_df, prod_code_df, reviews_df, live_info_df, return_normalizer=False,
+                      engagement_df=None):
+    merged_df = merge_inputs(brand, searches_df, prod_code_df, reviews_df, live_info_df, engagement_df=engagement_df)
+
+    # 정규화 (Min-Max Scaling) + 스케일링 (2024년 매출액 기준)
+    normalizer = ProxyNormalizer.fit(merged_df, cols_to_normalize, get_brand(brand)['actual_sales_2024'])
+
+    # 최종 proxy_sales 계산 (모든 연도에 스케일 적용)
+    merged_df["proxy_sales"] = normalizer.score(merged_df)
+    print(f"[{brand}] 2024년 기준 scaling factor: {normalizer.scaling_factor:.6f}")
+
+    return (merged_df, normalizer) if return_normalizer else merged_df
+
+
+def _load_inputs(brand, data_path, searches_df):
+    # CSV 읽기 (검색량 데이터는 공유 입력으로 전달 가능)
+    if searches_df is None:
+        searches_df = schemas.load("search_volume", data_path=data_path)
+    prod_code_df = schemas.load("prod_code", brand, data_path)
+    reviews_df = load_reviews(brand, data_path)
+    live_info_df = schemas.load("live_info", brand, data_path)
+    return searches_df, prod_code_df, reviews_df, live_info_df
+
+
+# live_comments.py 라이브별 댓글 집계 (없으면 None)
+def load_engagement(brand, data_path=DATA_PATH):
+    path = schemas.table_path("live_comment_stats", brand, data_path)
+    if not os.path.exists(path):
+        return None
+    return schemas.read_table("live_comment_stats", path, columns=["date"] + list(engagement_agg))
+
+
+def state_path(brand, data_path=DATA_PATH):
+    return data_file(f"proxy_sales_state_{brand}.json", data_path)
+
+
+def run(brand, data_path=DATA_PATH, searches_df=None):
+    merged_df, normalizer = build_proxy_sales(brand, *_load_inputs(brand, data_path, searches_df),
+                                              return_normalizer=True, engagement_df=load_engagement(brand, data_path))
+
+    # 기존 상태가 있으면 버전 증가
+    if os.path.exists(state_path(brand, data_path)):
+        normalizer.version = ProxyNormalizer.load(state_path(brand, data_path)).version + 1
+
+    # proxy_sales 포함한 csv + 정규화 상태 저장
+    instrumentation.to_csv(merged_df, data_file(f"proxy_sales_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    normalizer.save(state_path(brand, data_path))
+    return merged_df
+
+
+#############################################
+######      증분 갱신 (새 날짜만 계산)      #####
+#############################################
+# 새 날짜가 저장된 min/max 범위 안이면 새 행만 계산해서 이어 쓰기
+# 범위를 벗어나면 전체 재계산 후, 값이 바뀐 과거 날짜를 보고
+def run_incremental(brand, data_path=DATA_PATH, searches_df=None, tol=1e-9):
+    csv_path = data_file(f"proxy_sales_{brand}.csv", data_path)
+    if not (os.path.exists(csv_path) and os.path.exists(state_path(brand, data_path))):
+        merged_df = run(brand, data_path, searches_df)
+        return {"mode": "full", "reason": "no_state", "new_rows": len(merged_df), "affected_dates": []}
+
+    normalizer = ProxyNormalizer.load(state_path(brand, data_path))
+    new_df = merge_inputs(brand, *_load_inputs(brand, data_path, searches_df),
+                          start=normalizer.last_date + pd.Timedelta(days=1),
+                          engagement_df=load_engagement(brand, data_path))
+
+    # 댓글 참여도 컬럼이 새로 생기거나 없어졌으면 이어 쓸 수 없으므로 전체 재계산
+    saved_cols = pd.read_csv(csv_path, nrows=0, encoding="utf-8-sig").columns.tolist()
+    if saved_cols != new_df.columns.tolist() + ["proxy_sales"]:
+        merged_df = run(brand, data_path, searches_df)
+        return {"mode": "full", "reason": "columns", "new_rows": len(merged_df), "affected_dates": []}
+
+    if new_df.empty:
+        return {"mode": "incremental", "new_rows": 0, "affected_dates": []}
+
+    changed_cols, touches_calibration = normalizer.check(new_df)
+    if not changed_cols and not touches_calibration:
+        # 새 행만 계산
+        new_df["proxy_sales"] = normalizer.score(new_df)
+        instrumentation.to_csv(new_df, csv_path, mode="a", header=False, index=False, encoding="utf-8-sig")
+        normalizer.append(new_df)
+        normalizer.save(state_path(brand, data_path))
+        report = {"mode": "incremental", "new_rows": len(new_df), "affected_dates": []}
+    else:
+        # 전체 재계산 (기존 행 + 새 행)
+        hist_df = schemas.read_table("proxy_sales", csv_path)
+        old_proxy = hist_df.pop("proxy_sales").to_numpy()
+        all_df = pd.concat([hist_df, new_df], ignore_index=True)
+
+        normalizer = ProxyNormalizer.fit(all_df, cols_to_normalize, get_brand(brand)['actual_sales_2024'],
+                                         version=normalizer.version + 1)
+        all_df["proxy_sales"] = normalizer.score(all_df)
+
+        # 값이 바뀐 과거 날짜
+        new_proxy = all_df["proxy_sales"].to_numpy()[:len(old_proxy)]
+        affected = ~np.isclose(old_proxy, new_proxy, rtol=tol, atol=0)
+        instrumentation.to_csv(all_df, csv_path, index=False, encoding="utf-8-sig")
+        normalizer.save(state_path(brand, data_path))
+        report = {
+            "mode": "full",
+            "reason": "calibration_year" if not changed_cols else "min_max",
+            "changed_columns": changed_cols,
+            "new_rows": len(new_df),
+            "affected_dates": hist_df.loc[affected, "date"].dt.strftime("%Y-%m-%d").tolist(),
+        }
+
+    report["version"] = normalizer.version
+    print(f"[{brand}] proxy_sales {report['mode']} 갱신: 새 행 {report['new_rows']}개, "
+          f"영향받은 과거 행 {len(report['affected_dates'])}개")
+    return report
+
+
+if __name__ == "__main__":
+    brand = 'L'  # 'B', 'D', 'L' *********************************************************************************************************************************
+    incremental = False  # True: 저장된 정규화 상태로 새 날짜만 계산
+
+    if incremental:
+        print(run_incremental(brand))
+    else:
+        merged_df = run(brand)
+        print(merged_df[["date", "proxy_sales"]].head(10))
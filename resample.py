@@ -0,0 +1,149 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+import schemas
+from brand_config import DATA_PATH, data_file
+
+#############################################
+######   누적합 기반 다중 단위 집계 (일/주/월)   #####
+#############################################
+# 일 단위 테이블의 컬럼별 누적합(앞에 0 한 칸)을 한 번만 만들어 두고
+# 구간 [a, b) 합계 = S[b] - S[a] → 단위가 몇 개든 출력 행 하나당 O(1), 다시 groupby 하지 않음
+# freq : "D" (일), "W" (달력 시작일부터 7일씩), "ISO-W" (월요일 시작 ISO 주), "M" (월), "14D" 등 N일
+# 집계 : sum / mean / any (구간에 0 보다 큰 값이 하나라도 있으면 1, 플래그용)
+base_cols = ["search_ad_spend_est", "live_ad_spend_est", "competitor_event_flag", "proxy_sales"]
+freq_names = {"D": "day", "W": "week", "ISO-W": "isoweek", "M": "month"}
+
+
+class CumulativeTable:
+    def __init__(self, daily_df, columns=None, date_col="date"):
+        dates = pd.DatetimeIndex(daily_df[date_col])
+        if len(dates) > 1 and (np.diff(dates.to_numpy().astype("datetime64[D]").astype(np.int64)) != 1).any():
+            raise ValueError("날짜가 하루 간격으로 연속되지 않습니다. daily_join.join_daily 결과를 사용하세요.")
+        self.dates = dates
+        self.columns = list(columns or [c for c in daily_df.columns
+                                        if c != date_col and pd.api.types.is_numeric_dtype(daily_df[c])])
+        self._col = {c: i for i, c in enumerate(self.columns)}
+
+        values = daily_df[self.columns].to_numpy(dtype=float)
+        if np.isnan(values).any():
+            raise ValueError("누적합을 만들 컬럼에 결측치가 있습니다.")
+        zeros = np.zeros((1, len(self.columns)))
+        self._sum = np.vstack([zeros, np.cumsum(values, axis=0)])  # (날짜 수 + 1, 컬럼 수)
+        self._pos = np.vstack([zeros.astype(np.int64), np.cumsum(values > 0, axis=0)])  # 0 보다 큰 날 수
+
+    def __len__(self):
+        return len(self.dates)
+
+    # 구간 [starts, ends) 합계 (달력 밖 위치는 0 으로 보고 잘라냄)
+    def window_sum(self, col, starts, ends, agg="sum"):
+        n = len(self.dates)
+        starts, ends = np.clip(starts, 0, n), np.clip(ends, 0, n)
+        cum = self._pos if agg == "any" else self._sum
+        total = cum[ends, self._col[col]] - cum[starts, self._col[col]]
+        if agg == "sum":
+            return total
+        if agg == "any":
+            return (total > 0).astype(np.int8)
+        if agg == "mean":
+            return total / np.maximum(ends - starts, 1)
+        raise ValueError(f"지원하지 않는 집계입니다: {agg}")
+
+    # 구간 시작 위치 (달력 위치 기준, 첫 구간은 달력 시작일부터)
+    def period_starts(self, freq):
+        n = len(self.dates)
+        if n == 0:
+            return np.array([], dtype=np.int64)
+        if freq == "D":
+            return np.arange(n)
+        if freq == "W":
+            return np.arange(0, n, 7)
+        match = re.fullmatch(r"(\d+)D", freq)
+        if match and int(match.group(1)) > 0:
+            return np.arange(0, n, int(match.group(1)))
+        if freq == "ISO-W":
+            boundary = self.dates.dayofweek == 0
+        elif freq == "M":
+            boundary = self.dates.day == 1
+        else:
+            raise ValueError(f"지원하지 않는 단위입니다: {freq} (D / W / ISO-W / M / <N>D)")
+        boundary[0] = True
+        return np.flatnonzero(boundary)
+
+    # 구간 (시작, 끝, 완전한 구간 여부) - 달력 앞뒤가 잘린 주 / 월은 완전하지 않음
+    def periods(self, freq):
+        starts = self.period_starts(freq)
+        ends = np.append(starts[1:], len(self.dates)).astype(np.int64)
+        if freq == "M":
+            nominal = self.dates[starts].days_in_month.to_numpy()
+        elif freq in ("W", "ISO-W"):
+            nominal = 7
+        else:
+            nominal = 1 if freq == "D" else int(freq[:-1])
+        return starts, ends, (ends - starts) == nominal
+
+    # 단위별 집계 {컬럼: sum/mean/any} (기본: 모든 컬럼 합계)
+    def aggregate(self, freq, agg=None):
+        starts, ends, _ = self.periods(freq)
+        agg = agg or {c: "sum" for c in self.columns}
+        out = {"date": self.dates[starts], "n_days": ends - starts}
+        for col, how in agg.items():
+            out[col] = self.window_sum(col, starts, ends, how)
+        return pd.DataFrame(out)
+
+    # 각 구간 마지막 날까지 최근 days 일 합계 (freq="D" 이면 일 단위 rolling sum)
+    def rolling(self, col, days, freq="D", agg="sum"):
+        _, ends, _ = self.periods(freq)
+        return self.window_sum(col, ends - days, ends, agg)
+
+    # 구간을 days 일 앞으로 민 합계 (freq="D" 이면 shift(days) 후 0 채움과 같음)
+    def shifted(self, col, days, freq="D", agg="sum"):
+        starts, ends, _ = self.periods(freq)
+        return self.window_sum(col, starts - days, ends - days, agg)
+
+    # elasticnet_data 와 같은 컬럼을 단위별로 계산 (lag / rolling 창은 일 단위 그대로)
+    # lag3   : 구간을 3일 앞으로 민 합계
+    # 7d_sum : 구간 마지막 날까지 최근 7일 합계
+    # full_only=True 면 앞뒤가 잘린 주 / 월 제외
+    @instrumentation.traced()
+    def training_frame(self, freq="D", lag=3, window=7, full_only=True):
+        starts, ends, full = self.periods(freq)
+        frame = pd.DataFrame({"date": self.dates[starts]})
+        frame["search_ad_spend_est"] = self.window_sum("search_ad_spend_est", starts, ends)
+        frame["live_ad_spend_est"] = self.window_sum("live_ad_spend_est", starts, ends)
+        for col in ("search_ad_spend_est", "live_ad_spend_est"):
+            frame[col.replace("_est", f"_lag{lag}")] = self.window_sum(col, starts - lag, ends - lag)
+        for col in ("search_ad_spend_est", "live_ad_spend_est"):
+            frame[col.replace("_est", f"_{window}d_sum")] = self.window_sum(col, ends - window, ends)
+        frame["competitor_event_flag"] = self.window_sum("competitor_event_flag", starts, ends, "any").astype(float)
+        frame[f"competitor_event_flag_lag{lag}"] = self.window_sum("competitor_event_flag", starts - lag, ends - lag,
+                                                                   "any").astype(float)
+        frame["month"] = frame["date"].dt.month
+        frame["proxy_sales"] = self.window_sum("proxy_sales", starts, ends)
+        return frame[full].reset_index(drop=True) if full_only else frame
+
+
+# elasticnet_data_{brand}.csv 의 기본 컬럼으로 누적합 테이블 생성
+def load_table(brand, data_path=DATA_PATH):
+    return CumulativeTable(schemas.load("elasticnet_data", brand, data_path, columns=["date"] + base_cols), base_cols)
+
+
+# 단위별 학습 데이터 저장 (elasticnet_data_{week/month/...}_{brand}.csv)
+def run(brand, data_path=DATA_PATH, freqs=("W", "M")):
+    table = load_table(brand, data_path)
+    frames = {}
+    for freq in freqs:
+        frames[freq] = table.training_frame(freq)
+        name = freq_names.get(freq, freq.lower())
+        instrumentation.to_csv(frames[freq], data_file(f"elasticnet_data_{name}_{brand}.csv", data_path), index=False,
+                               encoding="utf-8-sig")
+    return frames
+
+
+if __name__ == "__main__":
+    brand = 'B'  # 'B', 'D', 'L' *********************************************************************************************************************************
+
+    run(brand)
@@ -1,39 +1,112 @@
-import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-brand = 'L'  # 'B', 'D', 'L' *********************************************************************************************************************************
+from brand_config import DATA_PATH, data_file
 
-# 폴더 경로
-folder_path = rf"D:\School\5-2\데이터\shoppinglive_data\reviews_data\reviews_{brand}P"
+# 필요한 컬럼만 읽기 (상품명, URL 등은 파싱 단계에서 제외)
+review_cols = ["상품코드", "날짜", "별점", "판매여부"]
+optional_cols = ["구매자 성별"]
 
-# 폴더 안 모든 CSV 파일 선택
-csv_files = [f for f in os.listdir(folder_path) if f.endswith(".csv")]
+# 컬럼 타입 (상품코드는 dictionary 인코딩, 플래그는 int8)
+review_schema = pa.schema([
+    ("상품코드", pa.dictionary(pa.int32(), pa.string())),
+    ("날짜", pa.timestamp("ns")),
+    ("별점", pa.float32()),
+    ("판매여부", pa.int8()),
+    ("구매자 성별", pa.int8()),
+])
 
-# 데이터프레임 리스트
-df_list = []
 
-# 각 CSV 파일 읽으면서 처리
-for f in csv_files:
-    df = pd.read_csv(os.path.join(folder_path, f))
+# CSV 하나 읽기 + 인코딩
+def read_review_file(path):
+    wanted = set(review_cols + optional_cols)
+    df = pd.read_csv(path, usecols=lambda c: c in wanted, dtype={"상품코드": "category", "판매여부": "category"})
 
-    # 성별 변환: 여자 → 0, 남자 → 1
+    # 성별 변환: 여자 → 0, 남자 → 1 (결측치 2)
     if "구매자 성별" in df.columns:
-        df["구매자 성별"] = df["구매자 성별"].map({"여성": 0, "남성": 1})
-        df["구매자 성별"] = df["구매자 성별"].fillna(2).astype("int8")  # 결측치 2
+        df["구매자 성별"] = df["구매자 성별"].map({"여성": 0, "남성": 1}).fillna(2).astype("int8")
+    else:
+        df["구매자 성별"] = np.int8(2)
 
-        # 판매여부 변환: N → 0, Y → 1
+    # 판매여부 변환: N → 0, Y → 1 (그 외 / 컬럼 없음 -1)
     if "판매여부" in df.columns:
-        df["판매여부"] = df["판매여부"].map({"N": 0, "Y": 1}).astype("int8")
+        df["판매여부"] = df["판매여부"].astype(object).map({"N": 0, "Y": 1}).fillna(-1).astype("int8")
+    else:
+        df["판매여부"] = np.int8(-1)
+
+    df["날짜"] = pd.to_datetime(df["날짜"])
+    df["별점"] = pd.to_numeric(df["별점"], errors="coerce").astype("float32")
+    df["상품코드"] = df["상품코드"].astype(str).astype("category")
+    return df[review_cols + optional_cols]
+
+
+# (상품코드, 날짜)별 별점 합계 / 개수 (proxy_sales 의 avg_rating, daily_review_count 계산용)
+def daily_partial(df):
+    return df.groupby(["상품코드", "날짜"], observed=True).agg(
+        rating_sum=("별점", "sum"),
+        rating_count=("별점", "count"),
+        review_count=("상품코드", "size"),
+    ).reset_index()
+
+
+# 폴더 안 CSV 들을 병렬로 읽으면서 Parquet(파일 하나 = row group 하나)에 바로 기록
+# 동시에 읽는 파일 수를 제한해서 메모리 사용량 유지
+def merge_reviews(folder_path, out_path, max_workers=None):
+    csv_files = sorted(f for f in os.listdir(folder_path) if f.endswith(".csv"))
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+
+    partials = []
+    n_rows = 0
+    with pq.ParquetWriter(out_path, review_schema) as writer, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        files = iter(csv_files)
+
+        def submit_next():
+            f = next(files, None)
+            if f is not None:
+                pending.add(pool.submit(read_review_file, os.path.join(folder_path, f)))
+
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                df = future.result()
+                writer.write_table(pa.Table.from_pandas(df, schema=review_schema, preserve_index=False))
+                partials.append(daily_partial(df))
+                n_rows += len(df)
+                submit_next()
+
+    # 파일별 부분 집계 합치기 (같은 상품이 여러 파일에 나뉘어 있어도 처리)
+    daily_df = pd.concat(partials, ignore_index=True)
+    daily_df["상품코드"] = daily_df["상품코드"].astype(str)
+    daily_df = daily_df.groupby(["상품코드", "날짜"], as_index=False)[["rating_sum", "rating_count", "review_count"]].sum()
+    daily_df = daily_df.rename(columns={"상품코드": "prod_code", "날짜": "date"})
+    return daily_df, len(csv_files), n_rows
+
+
+def run(brand, folder_path, data_path=DATA_PATH, max_workers=None):
+    out_path = data_file(f"product_review_{brand}.parquet", data_path)
+    daily_df, n_files, n_rows = merge_reviews(folder_path, out_path, max_workers)
 
-    # 상품명, URL 컬럼 제거
-    df.drop(columns=[c for c in ["상품명", "URL"] if c in df.columns], inplace=True)
+    # 일별 집계 저장 (proxy_sales.py 입력)
+    daily_df.to_csv(data_file(f"review_daily_{brand}.csv", data_path), index=False, encoding="utf-8-sig")
+    print(f"[{brand}] CSV {n_files}개, 리뷰 {n_rows}건 합치기 완료")
+    return daily_df
 
-    df_list.append(df)
 
-# 모든 CSV 합치기
-merged_df = pd.concat(df_list, ignore_index=True)
+if __name__ == "__main__":
+    brand = 'L'  # 'B', 'D', 'L' *********************************************************************************************************************************
 
-# CSV 저장
-merged_df.to_csv(rf"D:\School\5-2\데이터\shoppinglive_data\product_review_{brand}.csv", index=False, encoding="utf-8-sig")
+    # 폴더 경로
+    folder_path = rf"D:\School\5-2\데이터\shoppinglive_data\reviews_data\reviews_{brand}P"
 
-print("모든 CSV 합치기 완료")
\ No newline at end of file
+    run(brand, folder_path)
+    print("모든 CSV 합치기 완료")
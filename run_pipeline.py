@@ -0,0 +1,235 @@
+import argparse
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import build_training_dataset
+import competitor_events
+import daily_join
+import elasticnet_regression
+import estimate_live_ad_spend
+import instrumentation
+import proxy_normalizer
+import proxy_sales
+import schemas
+from brand_config import BRANDS, DATA_PATH, data_file, get_brand, get_competitors, load_data_brands
+from competitor_events import CompetitorEvents
+from pipeline_cache import PipelineCache, file_digest
+
+#############################################
+######      브랜드 전체 파이프라인 실행      #####
+#############################################
+# 실행 순서: 라이브 광고비 추정 → proxy_sales → 학습 데이터 구축 → ElasticNet
+STAGES = ["estimate_live_ad_spend", "proxy_sales", "build_training_dataset", "elasticnet_regression"]
+
+# 캐시 stage 별 계산 코드 모듈 (소스가 바뀌면 캐시 키가 바뀜)
+stage_code = {
+    "live_info_2": [estimate_live_ad_spend, schemas],
+    "proxy_sales": [proxy_sales, daily_join, proxy_normalizer, schemas],
+    "elasticnet_data": [build_training_dataset, competitor_events, daily_join, schemas],
+    "elasticnet_results": [elasticnet_regression],
+}
+
+# 워커 프로세스별 공유 입력 (initializer에서 한 번만 전달됨)
+_shared = {}
+
+
+def _init_worker(search_df, search_key=None, events=None):
+    _shared["search_df"] = search_df
+    _shared["search_key"] = search_key
+    _shared["events"] = events  # 경쟁사 이벤트 행렬 (모든 브랜드 live_info 에서 한 번만 생성)
+
+
+# 한 브랜드의 전체 stage 실행
+def run_brand(brand, data_path=DATA_PATH, search_df=None, incremental=False, events=None):
+    if search_df is None:
+        search_df = _shared.get("search_df")
+    if events is None:
+        events = _shared.get("events")
+
+    timings = {}
+    start = time.perf_counter()
+    with instrumentation.stage("estimate_live_ad_spend", brand):
+        estimate_live_ad_spend.run(brand, data_path)
+    timings["estimate_live_ad_spend"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = None
+    with instrumentation.stage("proxy_sales", brand):
+        if incremental:
+            report = proxy_sales.run_incremental(brand, data_path, searches_df=search_df)
+        else:
+            proxy_sales.run(brand, data_path, searches_df=search_df)
+    timings["proxy_sales"] = time.perf_counter() - start
+
+    # proxy_sales 를 전체 재계산했으면 과거 날짜 값도 바뀌므로 학습 데이터도 전체 재구축
+    start = time.perf_counter()
+    with instrumentation.stage("build_training_dataset", brand):
+        if incremental and report["mode"] != "full":
+            build_training_dataset.run_incremental(brand, data_path, search_df=search_df, events=events)
+        else:
+            build_training_dataset.run(brand, data_path, search_df=search_df, events=events)
+    timings["build_training_dataset"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with instrumentation.stage("elasticnet_regression", brand):
+        elasticnet_regression.run(brand, data_path)
+    timings["elasticnet_regression"] = time.perf_counter() - start
+
+    return timings
+
+
+# 캐시 사용 실행: 입력/파라미터가 바뀌지 않은 stage 는 건너뜀
+# CSV 는 export_csv=True 일 때만 마지막에 저장
+def run_brand_cached(brand, data_path=DATA_PATH, search_df=None, search_key=None, export_csv=False):
+    if search_df is None:
+        search_df, search_key = _shared.get("search_df"), _shared.get("search_key")
+    if search_df is None:
+        path = data_file("search_volume_total.csv", data_path)
+        search_df, search_key = schemas.read_table("search_volume", path), file_digest(path)
+
+    cache = PipelineCache(data_path)
+    info = get_brand(brand)
+
+    def src(filename):
+        return data_file(filename, data_path)
+
+    timings, hits = {}, {}
+
+    start = time.perf_counter()
+    live_df, live_key, hits["estimate_live_ad_spend"] = cache.get_or_compute(
+        "live_info_2", brand,
+        [file_digest(src(f"live_info_{brand}.csv")), file_digest(src(f"prod_code_{brand}.csv"))],
+        {"cvr": estimate_live_ad_spend.cvr, "fee_rate": estimate_live_ad_spend.fee_rate, "k": estimate_live_ad_spend.k},
+        lambda: estimate_live_ad_spend.estimate_live_ad_spend(schemas.load("live_info", brand, data_path),
+                                                              schemas.load("prod_code", brand, data_path)),
+        stage_code["live_info_2"])
+    timings["estimate_live_ad_spend"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engagement_path = schemas.table_path("live_comment_stats", brand, data_path)
+    engagement_keys = [file_digest(engagement_path)] if os.path.exists(engagement_path) else []
+    proxy_df, proxy_key, hits["proxy_sales"] = cache.get_or_compute(
+        "proxy_sales", brand,
+        [search_key, file_digest(src(f"prod_code_{brand}.csv")), file_digest(proxy_sales.review_path(brand, data_path)),
+         file_digest(src(f"live_info_{brand}.csv"))] + engagement_keys,
+        {"keyword": info["keyword"], "actual_sales_2024": info["actual_sales_2024"]},
+        lambda: proxy_sales.build_proxy_sales(brand, search_df, schemas.load("prod_code", brand, data_path),
+                                              proxy_sales.load_reviews(brand, data_path),
+                                              schemas.load("live_info", brand, data_path),
+                                              engagement_df=proxy_sales.load_engagement(brand, data_path)),
+        stage_code["proxy_sales"])
+    timings["proxy_sales"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    competitor_keys = [file_digest(src(f"live_info_{c}.csv")) for c in get_competitors(brand)]
+    model_input_df, train_key, hits["build_training_dataset"] = cache.get_or_compute(
+        "elasticnet_data", brand, [live_key, search_key, proxy_key] + competitor_keys, {"keyword": info["keyword"]},
+        lambda: build_training_dataset.build_training_dataset(
+            brand, live_df, search_df, proxy_df,
+            build_training_dataset.load_competitor_events(brand, data_path, _shared.get("events"))),
+        stage_code["elasticnet_data"])
+    timings["build_training_dataset"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results_df, _, hits["elasticnet_regression"] = cache.get_or_compute(
+        "elasticnet_results", brand, [train_key], {"feature_sets": elasticnet_regression.feature_sets},
+        lambda: elasticnet_regression.run_experiments(model_input_df), stage_code["elasticnet_results"])
+    timings["elasticnet_regression"] = time.perf_counter() - start
+
+    # CSV 내보내기 (선택)
+    if export_csv:
+        live_df.to_csv(src(f"live_info_{brand}_2.csv"), index=False, encoding="utf-8-sig")
+        proxy_df.to_csv(src(f"proxy_sales_{brand}.csv"), index=False, encoding="utf-8-sig")
+        model_input_df.to_csv(src(f"elasticnet_data_{brand}.csv"), index=False, encoding="utf-8-sig")
+        results_df.to_csv(src(f"elasticnet_experiments_results_{brand}.csv"), index=False, encoding="utf-8-sig")
+
+    print(f"[{brand}] 캐시 사용 stage: {[stage for stage, hit in hits.items() if hit]}")
+    return timings
+
+
+def _run_brand_safe(brand, data_path, incremental, cache=False, export_csv=False, trace=None):
+    # trace: (run_id, profile_dir) → 워커에서 계측 후 기록을 함께 반환
+    if trace is not None:
+        instrumentation.enable(*trace)
+    try:
+        load_data_brands(data_path)  # spawn 워커는 부모에서 등록한 합성 브랜드를 모름
+        if cache:
+            timings = run_brand_cached(brand, data_path, export_csv=export_csv)
+        else:
+            timings = run_brand(brand, data_path, incremental=incremental)
+        return brand, timings, None, instrumentation.records()
+    except Exception:
+        return brand, None, traceback.format_exc(), instrumentation.records()
+    finally:
+        instrumentation.disable()
+
+
+# 등록된 브랜드를 프로세스 풀에서 동시에 실행
+def run_all(brands=None, data_path=DATA_PATH, max_workers=None, incremental=False, cache=False,
+            export_csv=False, trace=False, profile=False):
+    load_data_brands(data_path)
+    brands = list(BRANDS) if brands is None else list(brands)
+    for brand in brands:
+        get_brand(brand)
+
+    # 공유 입력은 한 번만 로드
+    search_path = data_file("search_volume_total.csv", data_path)
+    search_df = schemas.read_table("search_volume", search_path)
+    search_key = file_digest(search_path) if cache else None
+    events = CompetitorEvents.from_live_info(data_path)
+
+    if max_workers is None:
+        max_workers = min(len(brands), os.cpu_count() or 1)
+
+    # 계측 기록은 data/trace/run_{run_id}.json (profile=True 면 가장 느린 stage 의 .prof 도 저장)
+    trace_dir = data_file("trace", data_path)
+    run_id = instrumentation.enable() if trace or profile else None
+    worker_trace = (run_id, trace_dir if profile else None) if run_id else None
+
+    results, errors, run_records = {}, {}, []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(search_df, search_key, events)) as pool:
+        futures = [pool.submit(_run_brand_safe, brand, data_path, incremental, cache, export_csv, worker_trace)
+                   for brand in brands]
+        for future in as_completed(futures):
+            brand, timings, error, brand_records = future.result()
+            run_records.extend(brand_records)
+            if error is None:
+                results[brand] = timings
+                print(f"[{brand}] 완료 ({sum(timings.values()):.2f}s)")
+            else:
+                errors[brand] = error
+                print(f"[{brand}] 실패\n{error}")
+
+    if run_id:
+        instrumentation.disable()
+        path = instrumentation.write_run(trace_dir, run_records, run_id, brands=brands, incremental=incremental,
+                                         cache=cache, failed=sorted(errors))
+        print(f"계측 기록 저장: {path}")
+
+    return results, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="등록된 모든 브랜드에 대해 파이프라인 실행")
+    parser.add_argument("--brands", nargs="*", default=None, help="실행할 브랜드 (기본: 전체)")
+    parser.add_argument("--data-path", default=DATA_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--incremental", action="store_true", help="proxy_sales / 학습 데이터는 새 날짜만 계산")
+    parser.add_argument("--cache", action="store_true", help="입력이 바뀌지 않은 stage 는 캐시 사용")
+    parser.add_argument("--export-csv", action="store_true", help="캐시 사용 시 CSV 도 저장")
+    parser.add_argument("--trace", action="store_true", help="단계별 시간 / 메모리 / 행 수를 JSON 으로 기록")
+    parser.add_argument("--profile", action="store_true", help="--trace + 가장 느린 stage 의 cProfile 저장")
+    args = parser.parse_args()
+
+    results, errors = run_all(args.brands, args.data_path, args.workers, args.incremental, args.cache,
+                              args.export_csv, args.trace, args.profile)
+    print(f"성공 {len(results)}개 / 실패 {len(errors)}개")
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+import instrumentation
+from brand_config import DATA_PATH, data_file
+
+#############################################
+######       테이블 스키마 (컬럼 / dtype)      #####
+#############################################
+# 모든 스크립트가 같은 dtype 으로 CSV 를 읽도록 테이블별 컬럼 정의
+# date     : datetime64 (고유 날짜 문자열만 파싱, 파싱 실패 / 결측 시 에러)
+# category : 반복되는 코드 / 브랜드명
+# str      : 자유 텍스트
+# flag     : 0/1 값만 허용, int8
+# int*     : 정수만 허용 (범위 초과 / 소수 / 결측 시 에러)
+# float*   : 출력 CSV 에 그대로 다시 쓰이거나 모델 입력이 되는 값은 float64, 나머지는 float32
+# optional 에 없는 컬럼이 파일에 없으면 에러, 스키마에 없는 컬럼은 읽지 않음
+TABLES = {
+    "search_volume": {
+        "file": "search_volume_total.csv",
+        "columns": {"brand": "category", "date": "date", "search_volume_relative": "float32", "cpc_pred": "float32",
+                    "cpc_est": "float32", "search_volume_abs": "float64", "ad_spend_est": "float64"},
+        "optional": ["search_volume_relative", "cpc_pred", "cpc_est"],
+    },
+    "prod_code": {
+        "file": "prod_code_{brand}.csv",
+        "columns": {"prod_code": "category", "prod_name": "str", "prod_url": "str", "prod_price": "int32"},
+        "optional": ["prod_url"],
+    },
+    "live_info": {
+        "file": "live_info_{brand}.csv",
+        "columns": {"live_code": "category", "date": "date", "start_time": "str", "end_time": "str",
+                    "duration_min": "int16", "viewer_count": "int32", "promotion_flag": "flag", "promotion_text": "str",
+                    "prod_codes": "str"},
+        "optional": ["start_time", "end_time", "promotion_text", "prod_codes"],
+    },
+    "live_info_2": {
+        "file": "live_info_{brand}_2.csv",
+        "columns": {"live_code": "category", "date": "date", "start_time": "str", "end_time": "str",
+                    "duration_min": "int16", "viewer_count": "int32", "promotion_flag": "flag", "promotion_text": "str",
+                    "prod_codes": "str", "avg_price": "float32", "purchase_count_est": "float32",
+                    "live_ad_spend_est": "float64"},
+        "optional": ["start_time", "end_time", "promotion_text", "prod_codes", "avg_price", "purchase_count_est"],
+    },
+    # review_data_processing.py 병합 결과 (원본 리뷰)
+    "product_review": {
+        "file": "product_review_{brand}.csv",
+        "columns": {"상품코드": "category", "날짜": "date", "별점": "float32", "판매여부": "category"},
+        "optional": ["판매여부"],
+    },
+    # review_data_processing.py 일별 집계
+    "review_daily": {
+        "file": "review_daily_{brand}.csv",
+        "columns": {"prod_code": "category", "date": "date", "rating_sum": "float64", "rating_count": "int32",
+                    "review_count": "int32"},
+        "optional": [],
+    },
+    # live_comments.py 라이브별 댓글 집계
+    "live_comment_stats": {
+        "file": "live_comment_stats_{brand}.csv",
+        "columns": {"live_code": "category", "date": "date", "comment_count": "int32", "unique_commenters": "int32",
+                    "active_minutes": "int32", "duration_min": "float64", "comment_rate": "float64",
+                    "peak_minute_comments": "int32", "peak_intensity": "float64"},
+        "optional": [],
+    },
+    "proxy_sales": {
+        "file": "proxy_sales_{brand}.csv",
+        "columns": {"brand": "category", "date": "date", "search_volume_abs": "float64", "avg_rating": "float64",
+                    "daily_review_count": "float64", "live_code": "str", "duration_min": "float64",
+                    "viewer_count": "float64", "promotion_flag": "float64", "comment_count": "float64",
+                    "unique_commenters": "float64", "peak_minute_comments": "float64", "proxy_sales": "float64"},
+        "optional": ["comment_count", "unique_commenters", "peak_minute_comments"],
+    },
+    "elasticnet_data": {
+        "file": "elasticnet_data_{brand}.csv",
+        "columns": {"date": "date", "search_ad_spend_est": "float64", "live_ad_spend_est": "float64",
+                    "search_ad_spend_lag3": "float64", "live_ad_spend_lag3": "float64",
+                    "search_ad_spend_7d_sum": "float64", "live_ad_spend_7d_sum": "float64",
+                    "competitor_event_flag": "float64", "competitor_event_flag_lag3": "float64", "month": "int8",
+                    "proxy_sales": "float64"},
+        "optional": [],
+    },
+}
+
+
+def table_path(table, brand=None, data_path=DATA_PATH):
+    return data_file(TABLES[table]["file"].format(brand=brand), data_path)
+
+
+# CSV 읽기 단계의 dtype (정수 / flag 는 float64 로 읽은 뒤 검사 후 변환)
+def _read_dtype(dtype):
+    if dtype in ("category", "date"):
+        return "category"  # 날짜도 고유값만 파싱하도록 category 로 읽음
+    if dtype == "str":
+        return str
+    return "float64"
+
+
+def _check_column(table, col, dtype, series):
+    if dtype == "date":
+        codes = series.cat.codes.to_numpy()
+        if (codes < 0).any():
+            raise ValueError(f"[{table}] '{col}' 컬럼에 결측치가 있습니다.")
+        try:
+            dates = pd.to_datetime(series.cat.categories, format="ISO8601")
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"[{table}] '{col}' 컬럼에 날짜로 읽을 수 없는 값이 있습니다: {e}") from None
+        return pd.Series(dates.to_numpy()[codes], index=series.index, name=col)
+
+    if dtype == "flag" or dtype.startswith("int"):
+        values = series.to_numpy()
+        if np.isnan(values).any():
+            raise ValueError(f"[{table}] '{col}' 컬럼에 결측치가 있습니다.")
+        if (values != np.round(values)).any():
+            raise ValueError(f"[{table}] '{col}' 컬럼에 정수가 아닌 값이 있습니다.")
+        if dtype == "flag":
+            if not np.isin(values, (0, 1)).all():
+                raise ValueError(f"[{table}] '{col}' 컬럼은 0/1 값만 허용됩니다.")
+            return series.astype("int8")
+        info = np.iinfo(dtype)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(f"[{table}] '{col}' 컬럼 값이 {dtype} 범위를 벗어납니다.")
+        return series.astype(dtype)
+
+    if dtype.startswith("float"):
+        return series.astype(dtype)
+    return series
+
+
+# chunk 에서 since 이후 날짜 행만 남김 (날짜로 읽을 수 없는 값은 남겨서 _check_column 에서 에러)
+def _after(chunk, since):
+    dates = chunk["date"].cat
+    parsed = pd.to_datetime(dates.categories, format="ISO8601", errors="coerce")
+    keep = np.append(~(parsed <= since), True)  # 결측 (code -1) 도 남김
+    return chunk[keep[dates.codes.to_numpy()]]
+
+
+# 스키마대로 CSV 읽기 (columns 를 주면 그 컬럼만)
+# float 는 round_trip 으로 읽음 → 중간 CSV 를 다시 읽는 stage 도 메모리에서 바로 넘긴 값(캐시 경로)과 비트 단위로 같음
+# since 를 주면 chunk 단위로 읽으면서 date > since 인 행만 보관 (증분 실행에서 이력 전체를 변환 / 보관하지 않음)
+def read_table(table, path, columns=None, since=None, chunksize=100_000):
+    schema = TABLES[table]
+    wanted = {c: t for c, t in schema["columns"].items()
+              if columns is None or c in columns or (since is not None and c == "date")}
+    if since is not None and wanted.get("date") != "date":
+        raise ValueError(f"[{table}] date 컬럼이 없는 테이블은 날짜로 거를 수 없습니다.")
+
+    with instrumentation.step(f"read {table}", "load") as record:
+        read_dtype = {c: _read_dtype(t) for c, t in wanted.items()}
+        options = {"usecols": lambda c: c in wanted, "dtype": read_dtype, "float_precision": "round_trip"}
+        try:
+            if since is None:
+                df = pd.read_csv(path, **options)
+            else:
+                since = pd.Timestamp(since)
+                reader = pd.read_csv(path, chunksize=chunksize, **options)
+                parts = [_after(chunk, since) for chunk in reader]
+                df = pd.concat(parts, ignore_index=True) if parts else \
+                    pd.read_csv(path, nrows=0, **options)
+                # chunk 마다 category 가 달라서 concat 후 다시 category 로
+                df = df.astype({c: "category" for c, t in read_dtype.items() if t == "category" and c in df.columns})
+        except ValueError as e:
+            raise ValueError(f"[{table}] {path} 를 스키마대로 읽을 수 없습니다: {e}") from None
+
+        missing = [c for c in wanted if c not in df.columns and c not in schema["optional"]]
+        if missing:
+            raise ValueError(f"[{table}] {path} 에 필수 컬럼이 없습니다: {missing}")
+
+        for col in df.columns:
+            df[col] = _check_column(table, col, wanted[col], df[col])
+        record["rows_out"] = len(df)
+    return df
+
+
+def load(table, brand=None, data_path=DATA_PATH, columns=None, since=None):
+    return read_table(table, table_path(table, brand, data_path), columns, since)
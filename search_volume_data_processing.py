@@ -1,65 +1,95 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+
+from brand_config import get_cpc_dict
+
+# 실제 월간 검색량 (모든 키워드 합계, 기준값)
+actual_monthly_searches = 229475
+
 
 ###############################################
 #### 1. 원본 CSV 불러오기 및 세로형(long) 변환 ####
 ###############################################
-df = pd.read_csv(r"D:\검색량_전체.csv")
+# (날짜, 키워드 검색량) 2개 컬럼씩 묶인 wide 데이터를 한 번에 long 형태로 변환
+# 키워드 순서대로 이어붙인 결과 (기존 컬럼쌍 반복 + concat 결과와 같은 순서)
+def reshape_long(df):
+    if df.shape[1] % 2 != 0:
+        raise ValueError("검색량 CSV는 (날짜, 검색량) 2개 컬럼씩 묶여 있어야 합니다.")
 
-dfs = []
+    n_rows = df.shape[0]
+    brand_names = list(df.columns[1::2])  # 브랜드 이름은 컬럼명 그대로 사용
 
-# 2개 컬럼씩 묶어서 (날짜, 브랜드 검색량) 변환
-for i in range(0, df.shape[1], 2):
-    date_col = df.columns[i]
-    brand_col = df.columns[i + 1]
-    brand_name = brand_col  # 브랜드 이름은 컬럼명 그대로 사용
+    # (행, 키워드) → (키워드, 행) 순서로 펼치기
+    dates = df.iloc[:, 0::2].to_numpy().T.ravel()
+    values = df.iloc[:, 1::2].to_numpy(dtype=float).T.ravel()
+    codes = np.repeat(np.arange(len(brand_names)), n_rows)
 
-    tmp = df[[date_col, brand_col]].copy()
-    tmp.columns = ["date", "search_volume_relative"]
-    tmp["brand"] = brand_name
-    dfs.append(tmp)
-
-# 세로로 합치기
-df_long = pd.concat(dfs, ignore_index=True)
-
-# 날짜 변환
-df_long["date"] = pd.to_datetime(df_long["date"])
+    return pd.DataFrame({
+        "date": pd.to_datetime(dates),  # 날짜 변환
+        "search_volume_relative": values,
+        "brand": pd.Categorical.from_codes(codes, categories=brand_names),  # read_csv 가 중복 컬럼명은 구분해 줌
+    })
 
 
 #######################################
 ##### 2. 브랜드별 예상 CPC 컬럼 추가 #####
 #######################################
-cpc_dict = {"비에날씬": 93, "덴마크 유산균": 101, "락토핏": 122}
-df_long["cpc_pred"] = df_long["brand"].map(cpc_dict)
+def add_cpc(df_long, cpc_dict=None):
+    cpc_dict = get_cpc_dict() if cpc_dict is None else cpc_dict  # 브랜드 레지스트리 기준
+    categories = df_long["brand"].cat.categories
+    cpc = np.asarray(categories.map(lambda b: cpc_dict.get(b, np.nan)), dtype=float)
+    df_long["cpc_pred"] = cpc[df_long["brand"].cat.codes.to_numpy()]
+    return df_long
 
 
 #########################################
 ####### 3. 절대 검색량 및 광고비 추정 #######
 #########################################
-# 한 달치 데이터 필터링 (어제 기준 최근 30일)
-yesterday = datetime.today() - timedelta(days=1)
-one_month_ago = yesterday - timedelta(days=30)
-df_last_month = df_long[(df_long["date"] >= one_month_ago) & (df_long["date"] <= yesterday)]  # 한달치 데이터 추출
-
-# 한달치 상대검색량 합계 (모든 키워드)
-total_relative_searches = df_last_month["search_volume_relative"].sum()
-print(f"최근 한 달간 상대검색량 합계: {total_relative_searches}")
-
-# 실제 월간 검색량 (모든 키워드 합계, 기준값)
-actual_monthly_searches = 229475
-
-# 스케일링 비율
-scaling_factor = actual_monthly_searches / total_relative_searches
-
-# 절대 검색량 및 광고비 계산
-df_long["search_volume_abs"] = df_long["search_volume_relative"] * scaling_factor
-df_long["ad_spend_est"] = df_long["search_volume_abs"] * df_long["cpc_pred"]
-
-#########################################
-########### 4. 최종 데이터 저장 ###########
-#########################################
-save_path = r"D:\School\5-2\데이터\search_volume_data\search_volume_total.csv"
-df_long.to_csv(save_path, index=False, encoding="utf-8-sig")
-
-print(f"저장 완료: {save_path}")
-print(df_long.head())
+# 기준 기간(reference_start ~ reference_end) 상대검색량 합계를 실제 월간 검색량에 맞춤
+# 기준 기간을 주지 않으면 데이터 마지막 날짜 기준 최근 30일 (실행 날짜와 무관)
+def scale_search_volume(df_long, reference_start=None, reference_end=None, monthly_searches=actual_monthly_searches):
+    reference_end = pd.Timestamp(reference_end) if reference_end is not None else df_long["date"].max()
+    reference_start = pd.Timestamp(reference_start) if reference_start is not None \
+        else reference_end - pd.Timedelta(days=30)
+
+    in_period = (df_long["date"] >= reference_start) & (df_long["date"] <= reference_end)  # 한달치 데이터 추출
+
+    # 한달치 상대검색량 합계 (모든 키워드)
+    total_relative_searches = df_long.loc[in_period, "search_volume_relative"].sum()
+    print(f"기준 기간 {reference_start.date()} ~ {reference_end.date()} 상대검색량 합계: {total_relative_searches}")
+    if total_relative_searches <= 0:
+        raise ValueError("기준 기간의 상대검색량 합계가 0입니다. reference 기간을 확인하세요.")
+
+    # 스케일링 비율
+    scaling_factor = monthly_searches / total_relative_searches
+
+    # 절대 검색량 및 광고비 계산
+    df_long["search_volume_abs"] = df_long["search_volume_relative"] * scaling_factor
+    df_long["ad_spend_est"] = df_long["search_volume_abs"] * df_long["cpc_pred"]
+    return df_long
+
+
+def run(raw_path, save_path, reference_start=None, reference_end=None):
+    df = pd.read_csv(raw_path)
+    df_long = reshape_long(df)
+    df_long = add_cpc(df_long)
+    df_long = scale_search_volume(df_long, reference_start, reference_end)
+
+    #########################################
+    ########### 4. 최종 데이터 저장 ###########
+    #########################################
+    df_long.to_csv(save_path, index=False, encoding="utf-8-sig")
+    return df_long
+
+
+if __name__ == "__main__":
+    raw_path = r"D:\검색량_전체.csv"
+    save_path = r"D:\School\5-2\데이터\search_volume_data\search_volume_total.csv"
+
+    # 스케일링 기준 기간 (None 이면 데이터 마지막 날짜 기준 최근 30일)
+    reference_start = None
+    reference_end = None
+
+    df_long = run(raw_path, save_path, reference_start, reference_end)
+    print(f"저장 완료: {save_path}")
+    print(df_long.head())
@@ -0,0 +1,343 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import build_training_dataset
+import elasticnet_regression
+import estimate_live_ad_spend
+import liveinfo_comment_data_processing
+import promotion_tagger
+import proxy_sales
+import review_data_processing
+import search_volume_data_processing
+from brand_config import BRANDS, DATA_PATH, data_file, get_brand, load_data_brands
+from pipeline_cache import file_digest
+
+#############################################
+######    stage 의존성 그래프 / 스케줄러    #####
+#############################################
+# stage 마다 (브랜드별) 입력 / 출력 파일을 선언하고, 출력 → 입력 관계로 의존성 그래프 생성
+# 앞 stage 가 모두 끝난 stage 부터 프로세스 풀에서 동시에 실행
+# 입력 파일 내용이 지난 실행과 같고 출력이 남아 있으면 건너뜀 → 바뀐 입력의 하위 stage 만 다시 실행
+# 원천 데이터 처리 stage(검색량 / 리뷰 / 라이브 정보)는 sources 에 원천 경로를 줄 때만 그래프에 포함
+STATE_FILE = "stage_state.json"
+default_sec = 1.0  # 실행 기록이 없는 stage 의 예상 시간 (dry-run 임계 경로 계산용)
+
+
+# stage 이름 → 실행 함수 (워커 프로세스에서 이름으로 찾아서 실행)
+stage_funcs = {
+    "search_volume_data_processing":
+        lambda brand, data_path, src: search_volume_data_processing.run(src, data_file("search_volume_total.csv", data_path)),
+    "review_data_processing":
+        lambda brand, data_path, src: review_data_processing.run(brand, src, data_path),
+    "liveinfo_comment_data_processing":
+        lambda brand, data_path, src: liveinfo_comment_data_processing.run(brand, src[0], src[1],
+                                                                           data_file(f"live_info_{brand}.csv", data_path)),
+    "estimate_live_ad_spend": lambda brand, data_path, src: estimate_live_ad_spend.run(brand, data_path),
+    "promotion_tagger": lambda brand, data_path, src: promotion_tagger.run(brand, data_path),
+    "proxy_sales": lambda brand, data_path, src: proxy_sales.run(brand, data_path),
+    "build_training_dataset": lambda brand, data_path, src: build_training_dataset.run(brand, data_path),
+    "elasticnet_regression": lambda brand, data_path, src: elasticnet_regression.run(brand, data_path),
+}
+
+
+def node_name(stage, brand=None):
+    return stage if brand is None else f"{stage}:{brand}"
+
+
+# 그래프 정의 {노드: {stage, brand, inputs, outputs, source}}
+# sources = {"search_raw": 검색량 원본 CSV, "reviews": 리뷰 폴더 템플릿 ("...reviews_{brand}P"),
+#            "liveinfo": 라이브 정보 CSV 템플릿, "live_code": live_code CSV 템플릿}
+def build_graph(brands=None, data_path=DATA_PATH, sources=None):
+    load_data_brands(data_path)
+    brands = list(BRANDS) if brands is None else list(brands)
+    for brand in brands:
+        get_brand(brand)
+    sources = sources or {}
+
+    def src(filename):
+        return data_file(filename, data_path)
+
+    graph = {}
+
+    def add(stage, brand, inputs, outputs, source=None):
+        graph[node_name(stage, brand)] = {"stage": stage, "brand": brand, "inputs": inputs, "outputs": outputs,
+                                          "source": source}
+
+    if sources.get("search_raw"):
+        add("search_volume_data_processing", None, [sources["search_raw"]], [src("search_volume_total.csv")],
+            sources["search_raw"])
+
+    for brand in brands:
+        if sources.get("reviews"):
+            folder = sources["reviews"].format(brand=brand)
+            add("review_data_processing", brand, [folder],
+                [src(f"review_daily_{brand}.csv"), src(f"product_review_{brand}.parquet")], folder)
+            review_input = src(f"review_daily_{brand}.csv")
+        else:
+            review_input = proxy_sales.review_path(brand, data_path)
+
+        if sources.get("liveinfo") and sources.get("live_code"):
+            raw = (sources["liveinfo"].format(brand=brand), sources["live_code"].format(brand=brand))
+            add("liveinfo_comment_data_processing", brand, list(raw), [src(f"live_info_{brand}.csv")], raw)
+
+        add("estimate_live_ad_spend", brand, [src(f"live_info_{brand}.csv"), src(f"prod_code_{brand}.csv")],
+            [src(f"live_info_{brand}_2.csv")])
+        # 프로모션 태깅: 키워드 사전 / 라이브 제목(live_code)은 있을 때만 입력
+        promo_inputs = [src(f) for f in (promotion_tagger.KEYWORD_FILE, f"live_code_{brand}.csv") if os.path.exists(src(f))]
+        add("promotion_tagger", brand, [src(f"live_info_{brand}.csv")] + promo_inputs,
+            [src(f"live_promotions_{brand}.csv")])
+        # 댓글 집계(live_comments.py)는 있을 때만 입력
+        engagement = [src(f"live_comment_stats_{brand}.csv")] if os.path.exists(src(f"live_comment_stats_{brand}.csv")) else []
+        add("proxy_sales", brand,
+            [src("search_volume_total.csv"), src(f"prod_code_{brand}.csv"), review_input, src(f"live_info_{brand}.csv")] +
+            engagement,
+            [src(f"proxy_sales_{brand}.csv"), proxy_sales.state_path(brand, data_path)])
+        # 경쟁사 이벤트는 등록된 모든 브랜드의 live_info 사용
+        add("build_training_dataset", brand,
+            [src(f"live_info_{brand}_2.csv"), src("search_volume_total.csv"), src(f"proxy_sales_{brand}.csv")] +
+            [src(f"live_info_{b}.csv") for b in BRANDS],
+            [src(f"elasticnet_data_{brand}.csv")])
+        add("elasticnet_regression", brand, [src(f"elasticnet_data_{brand}.csv")],
+            [src(f"elasticnet_experiments_results_{brand}.csv")])
+
+    link(graph)
+    return graph
+
+
+# 입력 파일을 만드는 노드를 앞 노드(deps)로 연결
+def link(graph):
+    producers = {}
+    for name, node in graph.items():
+        for path in node["outputs"]:
+            if path in producers:
+                raise ValueError(f"{path} 를 만드는 stage 가 둘 이상입니다: {producers[path]}, {name}")
+            producers[path] = name
+    for name, node in graph.items():
+        node["deps"] = sorted({producers[p] for p in node["inputs"] if p in producers} - {name})
+    topological_order(graph)
+    return graph
+
+
+# 위상 정렬 (순환이 있으면 에러)
+def topological_order(graph):
+    remaining = {name: set(node["deps"]) for name, node in graph.items()}
+    order = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"stage 의존성에 순환이 있습니다: {sorted(remaining)}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+# 입력 해시 (폴더는 안의 파일 이름 + 내용 해시)
+def input_digest(path):
+    if not os.path.isdir(path):
+        return file_digest(path)
+    h = hashlib.sha256()
+    for f in sorted(os.listdir(path)):
+        h.update(f.encode("utf-8"))
+        h.update(file_digest(os.path.join(path, f)).encode("ascii"))
+    return h.hexdigest()
+
+
+def load_state(data_path=DATA_PATH):
+    path = data_file(STATE_FILE, data_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, data_path=DATA_PATH):
+    path = data_file(STATE_FILE, data_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# 다시 실행해야 하는 이유 (필요 없으면 None)
+def stale_reason(node, record, digests):
+    if record is None:
+        return "실행 기록 없음"
+    missing = [p for p in node["outputs"] if not os.path.exists(p)]
+    if missing:
+        return f"출력 없음: {missing}"
+    changed = [p for p in node["inputs"] if record["inputs"].get(p) != digests.get(p)]
+    if changed:
+        return f"입력 변경: {changed}"
+    return None
+
+
+def _digests(paths):
+    return {p: input_digest(p) if os.path.exists(p) else None for p in paths}
+
+
+# 실행 계획: 지금 입력 기준으로 다시 실행할 노드 (앞 노드가 다시 실행되면 하위 노드도 포함)
+def plan(graph, state, force=()):
+    reasons = {}
+    for name in topological_order(graph):
+        node = graph[name]
+        if name in force or node["stage"] in force:
+            reasons[name] = "강제 실행"
+        elif any(dep in reasons for dep in node["deps"]):
+            reasons[name] = f"앞 stage 재실행: {[d for d in node['deps'] if d in reasons]}"
+        else:
+            reason = stale_reason(node, state.get(name), _digests(node["inputs"]))
+            if reason:
+                reasons[name] = reason
+    return reasons
+
+
+# 임계 경로 (예상 시간 합이 가장 긴 의존성 경로)
+def critical_path(graph, names, durations):
+    finish, prev = {}, {}
+    for name in topological_order(graph):
+        if name not in names:
+            continue
+        deps = [d for d in graph[name]["deps"] if d in names]
+        start_dep = max(deps, key=lambda d: finish[d], default=None)
+        finish[name] = (finish[start_dep] if start_dep else 0.0) + durations[name]
+        prev[name] = start_dep
+    if not finish:
+        return [], 0.0
+    node = max(finish, key=finish.get)
+    total = finish[node]
+    path = []
+    while node is not None:
+        path.append(node)
+        node = prev[node]
+    return path[::-1], total
+
+
+def dry_run(graph, state, force=()):
+    reasons = plan(graph, state, force)
+    durations = {name: state.get(name, {}).get("wall_sec", default_sec) for name in graph}
+    print(f"실행할 stage {len(reasons)}개 / 전체 {len(graph)}개")
+    for name in topological_order(graph):
+        if name in reasons:
+            print(f"  {name:<45} 예상 {durations[name]:7.2f}s  ({reasons[name]})")
+    path, total = critical_path(graph, set(reasons), durations)
+    print(f"임계 경로 (예상 {total:.2f}s, 순차 합계 {sum(durations[n] for n in reasons):.2f}s):")
+    print("  " + " → ".join(path) if path else "  (없음)")
+    return reasons, path
+
+
+def _run_node(stage, brand, data_path, source):
+    start = time.perf_counter()
+    try:
+        load_data_brands(data_path)  # spawn 워커는 부모에서 등록한 합성 브랜드를 모름
+        stage_funcs[stage](brand, data_path, source)
+        return time.perf_counter() - start, None
+    except Exception:
+        return time.perf_counter() - start, traceback.format_exc()
+
+
+# 준비된 stage 부터 동시에 실행
+# 앞 stage 가 실행된 뒤에도 입력 내용이 그대로면 건너뜀, 실패한 stage 의 하위 stage 는 실행하지 않음
+# 반환: (실제로 다시 실행된 노드 → 실행 시간, 건너뛴 노드, 실패한 노드 → 오류)
+def run_graph(graph, data_path=DATA_PATH, max_workers=None, force=()):
+    state = load_state(data_path)
+    topological_order(graph)
+
+    # 앞 stage 가 만들지 않는 입력은 미리 확인
+    produced = {p for node in graph.values() for p in node["outputs"]}
+    missing = sorted({p for node in graph.values() for p in node["inputs"] if p not in produced and not os.path.exists(p)})
+    if missing:
+        raise ValueError(f"입력 파일이 없습니다: {missing}")
+
+    waiting = {name: set(node["deps"]) for name, node in graph.items()}
+    results, errors, skipped = {}, {}, []
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+
+        def dispatch():
+            ready = sorted(name for name, deps in waiting.items() if not deps)
+            while ready:
+                name = ready.pop(0)
+                del waiting[name]
+                node = graph[name]
+                if any(dep in errors for dep in node["deps"]):
+                    errors[name] = "앞 stage 실패"
+                    ready.extend(finish(name))
+                    continue
+                digests = _digests(node["inputs"])
+                forced = name in force or node["stage"] in force
+                if not forced and not stale_reason(node, state.get(name), digests):
+                    skipped.append(name)
+                    ready.extend(finish(name))
+                    continue
+                future = pool.submit(_run_node, node["stage"], node["brand"], data_path, node["source"])
+                running[future] = (name, digests)
+
+        # 끝난 노드를 앞 노드 목록에서 지우고, 새로 준비된 노드 반환
+        def finish(name):
+            newly_ready = []
+            for other, deps in waiting.items():
+                if name in deps:
+                    deps.discard(name)
+                    if not deps:
+                        newly_ready.append(other)
+            return sorted(newly_ready)
+
+        dispatch()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, digests = running.pop(future)
+                wall, error = future.result()
+                if error is None:
+                    results[name] = wall
+                    state[name] = {"inputs": digests, "wall_sec": wall}
+                    save_state(state, data_path)
+                    print(f"[{name}] 완료 ({wall:.2f}s)")
+                else:
+                    errors[name] = error
+                    state.pop(name, None)
+                    print(f"[{name}] 실패\n{error}")
+                finish(name)
+            dispatch()
+
+    print(f"실행 {len(results)}개 / 건너뜀 {len(skipped)}개 / 실패 {len(errors)}개")
+    return results, skipped, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="stage 의존성 그래프 기준으로 바뀐 부분만 동시 실행")
+    parser.add_argument("--brands", nargs="*", default=None, help="실행할 브랜드 (기본: 전체)")
+    parser.add_argument("--data-path", default=DATA_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="실행할 stage 와 임계 경로만 출력")
+    parser.add_argument("--force", nargs="*", default=[], help="강제로 다시 실행할 stage / 노드 (예: proxy_sales, proxy_sales:B)")
+    parser.add_argument("--search-raw", default=None, help="검색량 원본 CSV")
+    parser.add_argument("--reviews", default=None, help="리뷰 CSV 폴더 ({brand} 치환)")
+    parser.add_argument("--liveinfo", default=None, help="라이브 정보 원본 CSV ({brand} 치환)")
+    parser.add_argument("--live-code", default=None, help="live_code CSV ({brand} 치환)")
+    args = parser.parse_args()
+
+    sources = {"search_raw": args.search_raw, "reviews": args.reviews, "liveinfo": args.liveinfo,
+               "live_code": args.live_code}
+    graph = build_graph(args.brands, args.data_path, sources)
+    if args.dry_run:
+        dry_run(graph, load_state(args.data_path), set(args.force))
+        return
+
+    _, _, errors = run_graph(graph, args.data_path, args.workers, set(args.force))
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
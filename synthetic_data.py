@@ -0,0 +1,167 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from brand_config import BRANDS, data_brands_file, data_file, get_brand, register_brand
+
+#############################################
+######      합성 입력 데이터 생성 (벤치마크용)     #####
+#############################################
+# 실제 수집 데이터와 같은 컬럼 구성의 CSV 를 원하는 규모로 생성
+# search_volume_total.csv, prod_code_{브랜드}.csv, live_info_{브랜드}.csv, product_review_{브랜드}.csv
+# (경쟁사 파일 = 다른 브랜드의 live_info_{브랜드}.csv)
+end_date = "2025-09-30"  # 마지막 날짜 고정 (2024년 scaling 기준 연도가 항상 포함되도록 뒤에서부터 생성)
+promotion_texts = ["🎁 구매인증 이벤트 / 구매인증 / 구매한 상품 1+1", "🎁 소통왕 이벤트 / 자유미션 / 스타벅스 모바일 교환권",
+                   "실시간 구매인증 이벤트 / 구매인증 / SK주유권 3만원권"]
+
+
+# 브랜드 코드 목록 (등록된 브랜드부터 사용, 부족하면 합성 브랜드 등록)
+# data_path 를 주면 합성 브랜드를 {data_path}/brands.csv 에도 기록 → run_pipeline / stage_graph 워커가 다시 읽음
+def synthetic_brands(n_brands, data_path=None):
+    brands = list(BRANDS)[:n_brands] + [f"S{i:03d}" for i in range(len(BRANDS), n_brands)]
+    for i, code in enumerate(brands):
+        if code == f"S{i:03d}":  # 이미 등록돼 있어도 data_path 목록에 기록
+            register_brand(code, name=f"합성{i:03d}", keyword=f"합성브랜드{i:03d}호", cpc=100, prod_prefix=f"{code}P",
+                           live_prefix=f"{code}L", actual_sales_2024=2688 * 1e8, data_path=data_path)
+    return brands
+
+
+# 날짜별 검색량 (추세 + 주간 계절성 + 잡음)
+def make_searches(rng, brands, dates):
+    frames = []
+    t = np.arange(len(dates))
+    for brand in brands:
+        info = get_brand(brand)
+        relative = np.clip(20 + 0.01 * t + 5 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 3, len(t)), 0.01, None)
+        frames.append(pd.DataFrame({
+            "brand": info["keyword"],
+            "search_volume_relative": np.round(relative, 5),
+            "date": dates.strftime("%Y-%m-%d"),
+            "cpc_pred": info["cpc"],
+        }))
+    searches_df = pd.concat(frames, ignore_index=True)
+    searches_df["search_volume_abs"] = searches_df["search_volume_relative"] * 10
+    searches_df["ad_spend_est"] = searches_df["search_volume_abs"] * searches_df["cpc_pred"]
+    return searches_df
+
+
+def make_products(rng, brand, n_products):
+    info = get_brand(brand)
+    codes = [f"{info['prod_prefix']}_{i:03d}" for i in range(1, n_products + 1)]
+    return pd.DataFrame({
+        "prod_code": codes,
+        "prod_name": [f"{info['keyword']} 상품 {i}" for i in range(1, n_products + 1)],
+        "prod_url": [f"https://smartstore.naver.com/main/products/{1000000 + i}" for i in range(n_products)],
+        "prod_price": rng.integers(10, 700, n_products) * 1000,
+    })
+
+
+# 날짜별 라이브 수는 포아송 분포, 방송별 상품은 중복 없이 추출
+def make_lives(rng, brand, dates, prod_codes, lives_per_day, products_per_live):
+    info = get_brand(brand)
+    counts = rng.poisson(lives_per_day, len(dates))
+    live_dates = np.repeat(dates, counts)
+    n_lives = len(live_dates)
+
+    start_min = rng.integers(9 * 60, 21 * 60, n_lives)
+    duration = rng.integers(30, 150, n_lives)
+    promotion = rng.random(n_lives) < 0.5
+    n_prod = np.minimum(rng.poisson(products_per_live, n_lives) + 1, len(prod_codes))
+    prod_codes = np.asarray(prod_codes)
+
+    def hhmmss(minutes):
+        return [f"{m // 60 % 24:02d}:{m % 60:02d}:00" for m in minutes]
+
+    return pd.DataFrame({
+        "live_code": [f"{info['live_prefix']}_{i:03d}" for i in range(1, n_lives + 1)],
+        "date": live_dates.strftime("%Y-%m-%d"),
+        "start_time": hhmmss(start_min),
+        "end_time": hhmmss(start_min + duration),
+        "duration_min": duration,
+        "viewer_count": rng.integers(1000, 600000, n_lives),
+        "promotion_flag": promotion.astype(int),
+        "promotion_text": np.where(promotion, rng.choice(promotion_texts, n_lives), ""),
+        "prod_codes": [",".join(rng.choice(prod_codes, n, replace=False)) for n in n_prod],
+    })
+
+
+# 리뷰 원본 (review_data_processing.py 병합 결과와 같은 컬럼)
+def make_reviews(rng, dates, prod_codes, reviews_per_day):
+    n_reviews = int(rng.poisson(reviews_per_day * len(dates)))
+    return pd.DataFrame({
+        "상품코드": rng.choice(np.asarray(prod_codes), n_reviews),
+        "날짜": pd.DatetimeIndex(rng.choice(dates, n_reviews)).strftime("%Y-%m-%d"),
+        "별점": rng.choice([1, 2, 3, 4, 5], n_reviews, p=[0.05, 0.05, 0.1, 0.2, 0.6]),
+        "판매여부": rng.integers(0, 2, n_reviews),
+    })
+
+
+# 전체 입력 생성 → 파일별 행 수 반환
+def generate(data_path, n_brands=3, years=7, lives_per_day=0.1, products_per_live=20, n_products=200,
+             reviews_per_day=50, seed=42):
+    os.makedirs(data_path, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=end_date, periods=int(round(years * 365)), freq="D")
+    # 이전 생성의 합성 브랜드 목록은 지우고 새로 기록
+    if os.path.exists(data_brands_file(data_path)):
+        os.remove(data_brands_file(data_path))
+    brands = synthetic_brands(n_brands, data_path)
+
+    def save(df, filename):
+        df.to_csv(data_file(filename, data_path), index=False, encoding="utf-8-sig")
+        counts[filename] = len(df)
+
+    counts = {}
+    save(make_searches(rng, brands, dates), "search_volume_total.csv")
+    for brand in brands:
+        prod_df = make_products(rng, brand, n_products)
+        save(prod_df, f"prod_code_{brand}.csv")
+        save(make_lives(rng, brand, dates, prod_df["prod_code"], lives_per_day, products_per_live),
+             f"live_info_{brand}.csv")
+        save(make_reviews(rng, dates, prod_df["prod_code"], reviews_per_day), f"product_review_{brand}.csv")
+
+    # 측정 대상이 아닌 등록 브랜드도 경쟁사 이벤트 입력(live_info)은 필요
+    for brand in BRANDS:
+        if brand not in brands:
+            prod_codes = make_products(rng, brand, n_products)["prod_code"]
+            save(make_lives(rng, brand, dates, prod_codes, lives_per_day, products_per_live), f"live_info_{brand}.csv")
+
+    # 이전 실행의 일별 리뷰 집계가 남아 있으면 proxy_sales 가 그 파일을 읽으므로 삭제
+    for brand in brands:
+        stale = data_file(f"review_daily_{brand}.csv", data_path)
+        if os.path.exists(stale):
+            os.remove(stale)
+    return brands, counts
+
+
+def add_scale_args(parser):
+    parser.add_argument("--brands", type=int, default=3, help="브랜드 수 (3 초과분은 합성 브랜드)")
+    parser.add_argument("--years", type=float, default=7)
+    parser.add_argument("--lives-per-day", type=float, default=0.1)
+    parser.add_argument("--products-per-live", type=int, default=20)
+    parser.add_argument("--products", type=int, default=200, help="브랜드별 상품 수")
+    parser.add_argument("--reviews-per-day", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def scale_kwargs(args):
+    return {"n_brands": args.brands, "years": args.years, "lives_per_day": args.lives_per_day,
+            "products_per_live": args.products_per_live, "n_products": args.products,
+            "reviews_per_day": args.reviews_per_day, "seed": args.seed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 입력 데이터 생성")
+    parser.add_argument("data_path")
+    add_scale_args(parser)
+    args = parser.parse_args()
+
+    brands, counts = generate(args.data_path, **scale_kwargs(args))
+    for filename, n_rows in counts.items():
+        print(f"{filename}: {n_rows}행")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+import adstock
+
+
+def test_geometric_adstock_matches_recurrence():
+    x = np.random.default_rng(0).gamma(1.0, 1e6, 500)
+    out = adstock.geometric_adstock(x, adstock.decays)
+    carry = np.zeros(len(adstock.decays))
+    for t in range(len(x)):
+        carry = x[t] + adstock.decays * carry
+        np.testing.assert_allclose(out[t], carry, rtol=1e-12)
+
+
+# test 행의 y 를 바꿔도 선택된 파라미터가 같아야 함 (train 행만 사용)
+def test_sweep_ignores_test_rows():
+    rng = np.random.default_rng(1)
+    n = 300
+    df = pd.DataFrame({channel: rng.gamma(0.5, 1e5, n) for channel in adstock.channels})
+    df["proxy_sales"] = adstock.geometric_adstock(df["live_ad_spend_est"], [0.6])[:, 0] + rng.normal(0, 1e4, n)
+
+    test = np.setdiff1d(np.arange(n), adstock.train_rows(n))
+    shuffled = df.copy()
+    shuffled.loc[test, "proxy_sales"] = rng.permutation(df.loc[test, "proxy_sales"].to_numpy()) * 10
+
+    pd.testing.assert_frame_equal(adstock.sweep(df), adstock.sweep(shuffled))
+    assert not adstock.sweep(df, train_only=False).equals(adstock.sweep(shuffled, train_only=False))
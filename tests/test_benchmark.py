@@ -0,0 +1,35 @@
+import pandas as pd
+
+import benchmark
+import synthetic_data
+from brand_config import data_file
+from run_pipeline import STAGES
+
+
+# 생성한 파일 행 수 = 반환한 행 수, 측정 결과는 브랜드 × stage 마다 한 행 (처리량 = 입력 행 / 시간)
+def test_generate_and_benchmark_rows(tmp_path):
+    data_path = str(tmp_path / "data")
+    brands, counts = synthetic_data.generate(data_path, n_brands=2, years=1, reviews_per_day=3, seed=1)
+    for filename, n_rows in counts.items():
+        assert benchmark.count_rows(data_file(filename, data_path)) == n_rows
+
+    results_df = benchmark.run_benchmark(data_path, brands, label="test", repeat=2)
+    assert len(results_df) == 2 * len(brands) * len(STAGES)
+    assert (results_df["wall_sec"] > 0).all()
+    first = results_df[(results_df["stage"] == "estimate_live_ad_spend") & (results_df["brand"] == brands[0])].iloc[0]
+    assert first["input_rows"] == counts[f"live_info_{brands[0]}.csv"] + counts[f"prod_code_{brands[0]}.csv"]
+    assert first["rows_per_sec"] == first["input_rows"] / first["wall_sec"]
+
+
+# 두 실행 비교: stage 별 브랜드 합계의 반복 중 최소값 기준 speedup
+def test_compare_uses_fastest_repeat():
+    rows = []
+    for run_id, scale in (("base", 2.0), ("new", 1.0)):
+        for repeat, extra in ((0, 1.0), (1, 0.0)):
+            for brand in ("B", "D"):
+                rows.append({"run_id": run_id, "repeat": repeat, "brand": brand, "stage": "proxy_sales",
+                             "wall_sec": scale + extra, "peak_rss_mb": 100.0})
+    summary = benchmark.compare(pd.DataFrame(rows), "base", "new")
+    assert summary.loc["proxy_sales", "base_wall_sec"] == 4.0
+    assert summary.loc["proxy_sales", "new_wall_sec"] == 2.0
+    assert summary.loc["proxy_sales", "speedup"] == 2.0
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import adstock
+import budget_optimizer as bo
+
+horizon = 14
+budget = 1e8
+
+
+def hill_params(half_sat=2e6, slope=1.0):
+    return pd.DataFrame({"channel": bo.channels, "adstock": ["geometric", "delayed"], "decay": [0.5, 0.3],
+                         "delay": [0, 2], "saturation": ["hill", "log"], "half_sat": [half_sat, half_sat],
+                         "slope": [slope, np.nan]})
+
+
+# 상한과 총 예산을 지키면서 한계 기여도가 큰 칸부터 채워야 함
+def test_greedy_allocation_respects_caps_and_budget():
+    marginal = np.random.default_rng(0).random((len(bo.channels), horizon))
+    max_daily = np.array([5e6, 3e6])
+    alloc = bo.greedy_allocation(marginal, budget, max_daily)
+
+    assert alloc.sum() == pytest.approx(budget)
+    assert (alloc <= max_daily[:, None]).all()
+    filled = alloc > 0
+    assert marginal[filled].min() >= marginal[~filled].max()
+
+    with pytest.raises(ValueError):
+        bo.greedy_allocation(marginal, budget, np.array([1e6, 1e6]))
+
+
+# 선형 모델 + 상한 없음: 예산 전부가 한 칸에 몰리지 않도록 채널별 하루 상한 = 총 예산 / 계획 일수
+def test_linear_default_cap_avoids_corner_solution():
+    coefs = {"search_ad_spend_est": 3.0, "live_ad_spend_est": 1.0, "search_ad_spend_lag3": 0.5}
+    plan_df, _, _ = bo.optimize(coefs, 0.0, budget, horizon, n_candidates=100)
+    spend = plan_df[["search_ad_spend_est", "live_ad_spend_est"]].to_numpy()
+    assert spend.sum() == pytest.approx(budget)
+    assert spend.max() <= budget / horizon * (1 + 1e-12)
+
+
+# 포화 feature 는 이력 + 계획 기간 전체를 adstock.transform 한 결과의 계획 기간 부분과 같아야 함
+def test_saturated_feature_continues_history():
+    rng = np.random.default_rng(1)
+    history = {c: rng.gamma(1.0, 1e6, 60) for c in bo.channels}
+    schedule = rng.gamma(1.0, 1e6, (3, horizon))
+    for p in hill_params().itertuples():
+        out = bo.saturated_feature(schedule, history[p.channel], p)
+        for k in range(len(schedule)):
+            full = adstock.transform(np.concatenate([history[p.channel], schedule[k]]), p.adstock, p.decay,
+                                     int(p.delay), p.saturation, p.half_sat, p.slope)
+            np.testing.assert_allclose(out[k], full[-horizon:], rtol=1e-10)
+
+
+# 포화 모델: 한계 효과가 줄어들므로 예산이 여러 칸 / 두 채널로 나뉘고, 상한 / 총 예산을 지키며 몰아주기보다 나음
+def test_incremental_allocation_spreads_budget_under_saturation():
+    coefs = {"search_ad_spend_adstock": 1e9, "live_ad_spend_adstock": 8e8}
+    saturation = hill_params()
+    max_daily = np.array([2e7, 2e7])
+    alloc = bo.incremental_allocation(coefs, 0.0, budget, horizon, saturation=saturation, max_daily=max_daily)
+
+    assert alloc.sum() == pytest.approx(budget)
+    assert (alloc <= max_daily[:, None] * (1 + 1e-12)).all()
+    assert (alloc.sum(axis=1) > 0).all()
+    assert (alloc > 0).sum() > horizon
+
+    corner = np.zeros_like(alloc)
+    corner[0, :5] = budget / 5
+    schedules = {c: np.stack([alloc[i], corner[i]]) for i, c in enumerate(bo.channels)}
+    totals = bo.predict(schedules, coefs, 0.0, saturation=saturation).sum(axis=1)
+    assert totals[0] > totals[1]
+
+    plan_df, total, _ = bo.optimize(coefs, 0.0, budget, horizon, max_daily=max_daily, n_candidates=200,
+                                    saturation=saturation)
+    assert total >= totals[0] - 1e-6
@@ -0,0 +1,40 @@
+import pandas as pd
+
+import build_training_dataset
+import estimate_live_ad_spend
+import proxy_sales
+import synthetic_data
+from brand_config import data_file
+
+
+# 앞부분만 저장된 결과에 증분 추가한 파일이 전체 재계산 결과와 바이트 단위로 같아야 함
+def test_incremental_matches_full_rebuild(tmp_path):
+    data_path = str(tmp_path)
+    brands, _ = synthetic_data.generate(data_path, n_brands=1, years=2, reviews_per_day=5, seed=0)
+    brand = brands[0]
+    estimate_live_ad_spend.run(brand, data_path)
+    proxy_sales.run(brand, data_path)
+    build_training_dataset.run(brand, data_path)
+
+    out_path = data_file(f"elasticnet_data_{brand}.csv", data_path)
+    with open(out_path, "rb") as f:
+        full = f.read()
+    lines = full.splitlines(keepends=True)
+
+    # 저장된 마지막 6행을 다시 읽어서 이어 계산하므로 여러 지점에서 잘라서 확인
+    for n_new in (1, 7, 40, 120, 300):
+        with open(out_path, "wb") as f:
+            f.writelines(lines[:len(lines) - n_new])
+        new_df = build_training_dataset.run_incremental(brand, data_path)
+        assert len(new_df) == n_new
+        with open(out_path, "rb") as f:
+            assert f.read() == full
+
+
+# 저장된 float 를 다시 읽어도 같은 값 (기본 파서는 마지막 자리가 달라질 수 있음)
+def test_read_csv_tail_round_trips_floats(tmp_path):
+    path = str(tmp_path / "tail.csv")
+    values = [0.1, 7918439.6923272535, 128641219.79996534, 1 / 3]
+    pd.DataFrame({"x": values}).to_csv(path, index=False, encoding="utf-8-sig")
+    tail_df = build_training_dataset.read_csv_tail(path, 3)
+    assert tail_df["x"].tolist() == values[1:]
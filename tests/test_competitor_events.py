@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import synthetic_data
+from brand_config import data_file
+from competitor_events import CompetitorEvents
+
+
+# 희소 행렬 결과 = 이벤트 목록을 브랜드별로 직접 groupby 한 결과 (경쟁사 50개)
+def test_matches_dense_groupby_with_many_competitors():
+    rng = np.random.default_rng(0)
+    brands = [f"C{i:02d}" for i in range(50)]
+    events_df = pd.DataFrame({"date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 200, 3000), "D"),
+                              "brand": rng.choice(brands, 3000)})
+    events = CompetitorEvents.from_events(events_df["date"].to_numpy(), [brands.index(b) for b in events_df["brand"]],
+                                          brands)
+
+    for brand in ("C00", "C17", "C49"):
+        others = events_df[events_df["brand"] != brand]
+        totals = others.groupby("date").size().reindex(events.calendar, fill_value=0)
+        frame = events.competitor_frame(brand, lags=[3])
+        np.testing.assert_array_equal(frame["competitor_event_count"], totals.to_numpy())
+        np.testing.assert_array_equal(frame["competitor_event_flag"], (totals > 0).to_numpy().astype(int))
+        np.testing.assert_array_equal(frame["competitor_event_flag_lag3"],
+                                      (totals > 0).astype(int).shift(3, fill_value=0).to_numpy())
+        per_brand = others.groupby(["date", "brand"]).size().unstack(fill_value=0) \
+            .reindex(index=events.calendar, columns=events.competitors(brand), fill_value=0)
+        np.testing.assert_array_equal(events.competitor_counts(brand).toarray(), per_brand.to_numpy())
+
+    with pytest.raises(ValueError):
+        events.competitor_flag("Z")
+
+
+# live_info 파일에서 만든 행렬 = 경쟁사 live_info concat → 프로모션 라이브 날짜별 flag (기존 방식)
+def test_from_live_info_matches_concat(tmp_path):
+    data_path = str(tmp_path)
+    synthetic_data.generate(data_path, n_brands=3, years=1, lives_per_day=1, reviews_per_day=1, seed=0)
+    events = CompetitorEvents.from_live_info(data_path)
+    assert events.brands == ["B", "D", "L"]
+
+    lives = {b: pd.read_csv(data_file(f"live_info_{b}.csv", data_path), parse_dates=["date"]) for b in events.brands}
+    competitors = pd.concat([lives[b] for b in ("D", "L")])
+    promo_days = competitors.loc[competitors["promotion_flag"] == 1, "date"].unique()
+    frame = events.competitor_frame("B")
+    assert set(frame.loc[frame["competitor_event_flag"] == 1, "date"]) == set(pd.DatetimeIndex(promo_days))
+
+    empty = CompetitorEvents.from_events([], [], ["B", "D"])
+    assert len(empty.competitor_frame("B")) == 0
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from selenium.webdriver.common.by import By
+
+import crawling_for_live_product_code as crawler
+
+full_products = [("유산균 30포", "https://shop.example.com/products/1", "39000"),
+                 ("유산균 60포", "https://shop.example.com/products/2", "59000"),
+                 ("쉐이크 1개", "https://shop.example.com/products/3", "12000")]
+
+
+# 세션이 끊기면 current_url 에서 예외를 내는 가짜 드라이버
+class FakeDriver:
+    def __init__(self, n_items=0, n_empty=0):
+        self.alive = True
+        self.quit_called = False
+        self.n_items, self.n_empty = n_items, n_empty
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("invalid session id")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+    def find_elements(self, by, value):
+        return [object()] * (self.n_items if value == crawler.PRODUCT_SELECTOR else self.n_empty)
+
+
+def test_pool_replaces_dead_driver_on_release():
+    made = []
+
+    def factory():
+        made.append(FakeDriver())
+        return made[-1]
+
+    with crawler.DriverPool(1, factory) as pool:
+        driver = pool.acquire()
+        driver.alive = False
+        pool.release(driver)
+        assert driver.quit_called and driver not in pool.drivers
+        replacement = pool.acquire()
+        assert replacement is made[1] and replacement.alive
+        assert pool.n_replaced == 1
+        pool.release(replacement)
+        assert pool.acquire() is replacement  # 살아 있는 드라이버는 그대로 재사용
+
+
+def test_pool_recreates_driver_when_replacement_fails():
+    calls = {"n": 0}
+
+    def factory():
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("browser failed to start")
+        return FakeDriver()
+
+    pool = crawler.DriverPool(1, factory)
+    driver = pool.acquire()
+    driver.alive = False
+    pool.release(driver)  # 교체 실패 → 빈 자리
+    assert pool.acquire().alive  # 빌릴 때 다시 생성
+    assert calls["n"] == 3
+
+
+def test_count_stable_requires_products_or_empty_marker():
+    locator = (By.CSS_SELECTOR, crawler.PRODUCT_SELECTOR)
+    empty = (By.CSS_SELECTOR, crawler.EMPTY_SELECTOR)
+
+    loading = crawler.element_count_stable(locator, empty_locator=empty)
+    assert not any(loading(FakeDriver(n_items=0)) for _ in range(5))  # 0개로 멈춰 있어도 로딩 중
+
+    empty_page = crawler.element_count_stable(locator, empty_locator=empty)
+    assert [empty_page(FakeDriver(n_empty=1)) for _ in range(3)] == [False, False, True]
+
+    loaded = crawler.element_count_stable(locator, empty_locator=empty)
+    assert [loaded(FakeDriver(n_items=3)) for _ in range(3)] == [False, False, True]
+
+
+# 실제 브라우저로 로컬 fixture 페이지 크롤링 (EDGE_DRIVER_PATH 의 msedgedriver 가 있을 때만)
+@pytest.fixture(scope="module")
+def driver_factory():
+    driver_path = os.environ.get("EDGE_DRIVER_PATH")
+    if not driver_path:
+        pytest.skip("EDGE_DRIVER_PATH 가 없어 브라우저 테스트 생략")
+    return lambda: crawler.make_driver(driver_path, headless=True)
+
+
+@pytest.mark.parametrize("page, expected", [
+    ("live_full.html", full_products),
+    ("live_partial.html", full_products),  # '전체 보기' 클릭 후 늦게 붙는 상품까지
+    ("live_empty.html", []),
+])
+def test_crawl_fixture_pages(fixture_server, driver_factory, page, expected):
+    url = f"{fixture_server}/{page}"
+    results = crawler.crawl_broadcasts([url], pool_size=1, driver_factory=driver_factory, timeout=5)
+    assert len(results) == 1
+    assert results[0][0] == url
+    assert results[0][1].startswith("[테스트]")
+    assert results[0][2] == expected
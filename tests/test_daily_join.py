@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from daily_join import join_daily, join_strings, to_daily
+
+
+def make_sources(seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2024-01-01", "2024-03-31")
+    searches = pd.DataFrame({"date": rng.choice(days[10:], 120), "search_volume_abs": rng.random(120)})
+    lives = pd.DataFrame({"date": rng.choice(days[:70], 50), "live_code": [f"TL_{i:03d}" for i in range(50)],
+                          "viewer_count": rng.integers(1, 1000, 50), "promotion_flag": rng.integers(0, 2, 50)})
+    events = pd.DataFrame({"date": pd.date_range("2023-12-01", "2024-05-01", freq="3D")})
+    events["competitor_event_flag"] = 1
+    return searches, lives, events
+
+
+# 일 단위 결합 = 소스별 groupby → 날짜 outer merge → 연속 달력으로 reindex → 조회 소스 left merge
+def test_join_daily_matches_merge_reference():
+    searches, lives, events = make_sources()
+    search_agg, live_agg = {"search_volume_abs": "sum"}, {"live_code": join_strings, "viewer_count": "sum",
+                                                          "promotion_flag": "max"}
+    merged = join_daily([to_daily(searches, search_agg), to_daily(lives, live_agg)],
+                        lookups=[to_daily(events, {"competitor_event_flag": "max"})])
+
+    ref = searches.groupby("date").agg(search_volume_abs=("search_volume_abs", "sum")).reset_index() \
+        .merge(lives.groupby("date").agg(live_code=("live_code", join_strings), viewer_count=("viewer_count", "sum"),
+                                         promotion_flag=("promotion_flag", "max")).reset_index(),
+               on="date", how="outer")
+    calendar = pd.date_range(ref["date"].min(), ref["date"].max(), name="date")
+    ref = ref.set_index("date").reindex(calendar).reset_index() \
+        .merge(events, on="date", how="left")
+
+    assert len(merged) == len(calendar)  # 같은 날 라이브가 여러 개여도 행이 늘어나지 않음
+    pd.testing.assert_frame_equal(merged, ref, check_dtype=False)
+
+
+# start / end 로 달력 고정 (범위 밖 값은 버림), 겹치는 컬럼명 / 빈 소스 처리
+def test_join_daily_fixed_range_and_edge_cases():
+    searches, lives, _ = make_sources()
+    daily = to_daily(searches, {"search_volume_abs": "sum"})
+    part = join_daily([daily], start="2024-02-01", end="2024-02-10")
+    assert part["date"].tolist() == list(pd.date_range("2024-02-01", "2024-02-10"))
+    np.testing.assert_array_equal(part["search_volume_abs"],
+                                  daily["search_volume_abs"].reindex(part["date"]).to_numpy())
+
+    with pytest.raises(ValueError):
+        join_daily([daily, daily])
+    empty = join_daily([daily.iloc[:0]])
+    assert len(empty) == 0 and list(empty.columns) == ["date", "search_volume_abs"]
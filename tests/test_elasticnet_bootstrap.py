@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import ElasticNet
+
+import elasticnet_bootstrap as eb
+from elasticnet_regression import base_feats, lag_feats, roll_feats
+
+
+def make_model_input(n=150, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.gamma(1.0, 1e5, (n, 8)), columns=base_feats + lag_feats + roll_feats)
+    df["competitor_event_flag"] = rng.integers(0, 2, n)
+    df["proxy_sales"] = 2 * df["search_ad_spend_est"] + df["live_ad_spend_lag3"] + rng.normal(0, 5e4, n)
+    return df
+
+
+# 재표본 행 = block_size 길이의 연속 구간들을 이어붙인 것 (길이 n, 범위 안)
+def test_block_indices_are_contiguous_blocks():
+    idx = eb.block_indices(np.random.default_rng(0), 100, 7)
+    assert len(idx) == 100 and idx.min() >= 0 and idx.max() < 100
+    blocks = idx[:98].reshape(-1, 7)
+    assert (np.diff(blocks, axis=1) == 1).all()
+
+
+# 원래 단위 계수 / intercept 로 계산한 예측 = 표준화 모델 예측
+def test_fit_once_real_coefficients_reproduce_predictions():
+    df = make_model_input()
+    X, y = df[base_feats].to_numpy(dtype=float), df["proxy_sales"].to_numpy(dtype=float)
+    scaled, real, intercept = eb.fit_once(X, y, 1.0, 0.5)
+    std = X.std(axis=0)
+    np.testing.assert_allclose(scaled / std, real)
+    model = ElasticNet(alpha=1.0, l1_ratio=0.5, random_state=42).fit((X - X.mean(axis=0)) / std, y)
+    np.testing.assert_allclose(X @ real + intercept, model.predict((X - X.mean(axis=0)) / std), rtol=1e-10)
+
+
+# 병렬 / 순차 결과가 같고, 재표본마다 직접 학습한 퍼센타일과 같음
+def test_bootstrap_matches_serial_loop():
+    df = make_model_input()
+    sets = {"baseline": base_feats, "lag_added": base_feats + lag_feats}
+    serial = eb.bootstrap(df, sets=sets, n_boot=24, block_size=5, max_workers=1)
+    parallel = eb.bootstrap(df, sets=sets, n_boot=24, block_size=5, max_workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    X, y = df[base_feats].to_numpy(dtype=float), df["proxy_sales"].to_numpy(dtype=float)
+    real = []
+    for ss in np.random.SeedSequence(eb.seed).spawn(24):
+        idx = eb.block_indices(np.random.default_rng(ss), len(y), 5)
+        _, beta_real, intercept = eb.fit_once(X[idx], y[idx], 1.0, 0.5)
+        real.append(np.append(beta_real, intercept))
+    lower, median, upper = np.percentile(real, [2.5, 50, 97.5], axis=0)
+    baseline = serial[serial["experiment"] == "baseline"]
+    np.testing.assert_allclose(baseline["beta_real_lower"], lower)
+    np.testing.assert_allclose(baseline["beta_real_median"], median)
+    np.testing.assert_allclose(baseline["beta_real_upper"], upper)
+    assert baseline["feature"].tolist() == base_feats + ["intercept"]
+
+    with pytest.raises(ValueError):
+        eb.bootstrap(df, sets=sets, n_boot=4, block_size=len(df) + 1, max_workers=1)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import ElasticNet
+
+import elasticnet_tuning
+from elasticnet_regression import base_feats, lag_feats, roll_feats
+
+
+def make_model_input(n=240, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.gamma(1.0, 1e5, (n, 8)), columns=base_feats + lag_feats + roll_feats)
+    df["competitor_event_flag"] = rng.integers(0, 2, n)
+    df["proxy_sales"] = 3 * df["search_ad_spend_est"] + 0.5 * df["live_ad_spend_7d_sum"] + rng.normal(0, 5e4, n)
+    return df
+
+
+# warm start alpha path 의 fold 검증 MSE = alpha 마다 ElasticNet 을 따로 학습한 결과
+def test_score_path_matches_elasticnet_per_alpha():
+    df = make_model_input()
+    X = df[base_feats + lag_feats].to_numpy(dtype=float)
+    y = df["proxy_sales"].to_numpy(dtype=float)
+    train_idx, test_idx = np.arange(160), np.arange(160, 240)
+    alphas = elasticnet_tuning.alpha_grid(X, y, 0.5)[::40]
+    _, _, _, mse = elasticnet_tuning._score_path(("lag_added", 0.5, 0, X, y, train_idx, test_idx, alphas))
+
+    mean, std = X[train_idx].mean(axis=0), X[train_idx].std(axis=0)
+    for alpha, path_mse in zip(alphas, mse):
+        model = ElasticNet(alpha=alpha, l1_ratio=0.5, tol=1e-10, max_iter=100_000)
+        model.fit((X[train_idx] - mean) / std, y[train_idx])
+        expected = ((model.predict((X[test_idx] - mean) / std) - y[test_idx]) ** 2).mean()
+        np.testing.assert_allclose(path_mse, expected, rtol=1e-4)
+
+
+# 병렬 실행 결과 = 순차 실행 결과, 선택된 (l1_ratio, alpha) 는 fold 평균 MSE 최소
+def test_tune_parallel_matches_serial(monkeypatch):
+    monkeypatch.setattr(elasticnet_tuning, "n_alphas", 20)
+    df = make_model_input()
+    serial = elasticnet_tuning.tune(df, max_workers=1)
+    parallel = elasticnet_tuning.tune(df, max_workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["experiment"].tolist() == list(elasticnet_tuning.feature_sets)
+
+    jobs, grids = elasticnet_tuning.make_jobs(df)
+    scores = [elasticnet_tuning._score_path(job) for job in jobs if job[0] == "baseline"]
+    best = min((np.mean([s[3] for s in scores if s[1] == l1], axis=0)[i], l1, grids[("baseline", l1)][i])
+               for l1 in elasticnet_tuning.l1_ratios for i in range(20))
+    row = serial.iloc[0]
+    assert (row["cv_mse"], row["l1_ratio"], row["alpha"]) == best
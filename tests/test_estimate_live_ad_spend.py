@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import estimate_live_ad_spend as elas
+
+
+# 기존 스크립트의 상품별 딕셔너리 조회 루프
+def baseline_avg_price(prod_codes, prod_df):
+    price_dict = pd.Series(prod_df.prod_price.values, index=prod_df.prod_code).to_dict()
+    avg = []
+    for prod_codes_str in prod_codes:
+        prices = [price_dict.get(code, 0) for code in prod_codes_str.split(",")]
+        avg.append(sum(prices) / len(prices) if prices else 0)
+    return np.array(avg, dtype=float)
+
+
+def make_inputs(n_lives=400, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = [f"TP_{i:03d}" for i in range(1, 81)]
+    prod_df = pd.DataFrame({"prod_code": codes + codes[:5], "prod_price": rng.integers(10, 700, 85) * 1000})
+    pool = np.array(codes + ["TP_999", "XX_001"])  # 없는 상품코드 포함
+    prod_codes = [",".join(rng.choice(pool, rng.integers(1, 12))) for _ in range(n_lives)]
+    live_df = pd.DataFrame({"live_code": [f"TL_{i:03d}" for i in range(n_lives)], "prod_codes": prod_codes,
+                            "viewer_count": rng.integers(1000, 600000, n_lives)})
+    return live_df, prod_df
+
+
+# CSR 인덱스 조회 평균 단가 = 기존 루프 (중복 상품코드는 마지막 가격, 없는 코드는 0)
+def test_avg_price_matches_loop():
+    live_df, prod_df = make_inputs()
+    np.testing.assert_allclose(elas.calc_avg_price(live_df["prod_codes"], prod_df),
+                               baseline_avg_price(live_df["prod_codes"], prod_df), rtol=1e-12)
+    assert elas.calc_avg_price(pd.Series([], dtype=str), prod_df).shape == (0,)
+
+
+# 광고비 = 기존 공식, 민감도 분석의 각 조합 = 그 파라미터로 계산한 값
+def test_live_ad_spend_matches_formula_and_sweep():
+    live_df, prod_df = make_inputs()
+    out = elas.estimate_live_ad_spend(live_df, prod_df)
+    avg_price = baseline_avg_price(live_df["prod_codes"], prod_df)
+    expected = avg_price * elas.fee_rate * (1 + np.log1p(live_df["viewer_count"] * elas.cvr) / elas.k)
+    np.testing.assert_allclose(out["live_ad_spend_est"], expected, rtol=1e-12)
+
+    summary_df, spend = elas.sweep_live_ad_spend(live_df, prod_df, [0.001, 0.002], [9.97, 5.0], [30, 10])
+    for row, combo in zip(spend, summary_df.itertuples()):
+        np.testing.assert_allclose(row, elas.calc_live_ad_spend(avg_price, live_df["viewer_count"], combo.cvr,
+                                                                combo.fee_rate, combo.k), rtol=1e-12)
+    assert summary_df.loc[0, "live_ad_spend_total"] == spend[0].sum()
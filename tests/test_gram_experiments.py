@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+import gram_experiments
+from elasticnet_regression import run_experiments
+
+
+def model_input(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"search_ad_spend_est": rng.gamma(2.0, 1000.0, n),
+                       "live_ad_spend_est": rng.gamma(1.0, 500.0, n) * (rng.random(n) < 0.3),
+                       "competitor_event_flag": (rng.random(n) < 0.1).astype(float),
+                       "month": rng.integers(1, 13, n)})
+    df["search_ad_spend_lag3"] = df["search_ad_spend_est"].shift(3).fillna(0)
+    df["live_ad_spend_lag3"] = df["live_ad_spend_est"].shift(3).fillna(0)
+    df["competitor_event_flag_lag3"] = df["competitor_event_flag"].shift(3).fillna(0)
+    df["search_ad_spend_7d_sum"] = df["search_ad_spend_est"].rolling(7, min_periods=1).sum()
+    df["live_ad_spend_7d_sum"] = df["live_ad_spend_est"].rolling(7, min_periods=1).sum()
+    df["proxy_sales"] = (0.02 * df["search_ad_spend_est"] + 0.05 * df["live_ad_spend_7d_sum"]
+                         - 5 * df["competitor_event_flag"] + rng.normal(0, 5, n))
+    return gram_experiments.add_seasonality(df)
+
+
+# Gram 행렬 ElasticNet 결과 = elasticnet_regression.run_experiments (sklearn) 결과
+# (run_experiments 는 sklearn 기본 tol=1e-4 로 멈추므로 그 수준까지만 비교)
+def test_elasticnet_matches_run_experiments():
+    df = model_input()
+    params = {"lag_added": (0.1, 0.9)}
+    _, coefs = gram_experiments.fit_all(df, models={"ElasticNet": (1.0, 0.5)}, params=params, max_workers=1)
+    expected = run_experiments(df, params)
+    np.testing.assert_allclose(coefs["beta_real"], expected["beta_real"], rtol=1e-3, atol=1e-6)
+    np.testing.assert_allclose(coefs["R2"], expected["R2"], rtol=1e-3)
+    np.testing.assert_allclose(coefs["RMSE"], expected["RMSE"], rtol=1e-3)
+
+
+# Lasso / Ridge / OLS 도 같은 표준화 · 분할에서 sklearn 으로 직접 학습한 계수와 같음
+@pytest.mark.parametrize("model, estimator", [("Lasso", Lasso(alpha=0.5, tol=1e-12, max_iter=100000)),
+                                              ("Ridge", Ridge(alpha=0.5)), ("OLS", LinearRegression())])
+def test_models_match_sklearn(model, estimator):
+    df = model_input(seed=1)
+    sets = gram_experiments.subset_search(["search_ad_spend_lag3", "month_sin"])
+    summary, coefs = gram_experiments.fit_all(df, sets, models={model: (0.5, 0.0)}, max_workers=2)
+    assert list(summary["experiment"]) == list(sets)
+
+    for exp_name, feature_cols in sets.items():
+        X = StandardScaler().fit_transform(df[feature_cols])
+        X_train, _, y_train, _ = train_test_split(X, df["proxy_sales"], test_size=0.2, random_state=42)
+        estimator.fit(X_train, y_train)
+        got = coefs[coefs["experiment"] == exp_name]
+        np.testing.assert_allclose(got["beta_scaled"].iloc[:-1], estimator.coef_, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(got["beta_scaled"].iloc[-1], estimator.intercept_, rtol=1e-6)
+
+
+# base feature 고정 + optional 컬럼의 모든 부분집합
+def test_subset_search():
+    sets = gram_experiments.subset_search(["a", "b"], base=["x"])
+    assert sets == {"baseline": ["x"], "a": ["x", "a"], "b": ["x", "b"], "a+b": ["x", "a", "b"]}
@@ -0,0 +1,77 @@
+import asyncio
+import os
+
+import pytest
+
+import http_product_extractor as extractor
+from crawl_state import CrawlState
+
+full_products = [("유산균 30포", "https://shop.example.com/products/1", "39000"),
+                 ("유산균 60포", "https://shop.example.com/products/2", "59000"),
+                 ("쉐이크 1개", "https://shop.example.com/products/3", "12000")]
+
+
+def test_parser_flags_show_all_button():
+    with open(os.path.join(os.path.dirname(__file__), "fixtures", "live_partial.html"), encoding="utf-8") as f:
+        live_name, products, _, show_all = extractor.extract_products_from_html(f.read())
+    assert live_name == "[테스트] 일부 상품만 보이는 라이브"
+    assert products == full_products[:1]
+    assert show_all
+
+
+# 전체 목록 페이지만 HTTP 로 추출, 일부만 있는 페이지 / 상품 없는 페이지 / 없는 페이지는 브라우저로
+def test_full_partial_and_empty_pages(fixture_server):
+    urls = [f"{fixture_server}/{page}" for page in ("live_full.html", "live_partial.html", "live_empty.html",
+                                                    "missing.html")]
+    completed = []
+    extracted, fallback = extractor.extract_broadcasts(urls, concurrency=2, retries=0,
+                                                       on_result=lambda *r: completed.append(r))
+    assert list(extracted) == [urls[0]]
+    assert extracted[urls[0]] == (urls[0], "[테스트] 전체 상품 라이브", full_products)
+    assert fallback == urls[1:]
+    assert completed == [extracted[urls[0]]]
+
+
+# 뒤 방송이 먼저 끝나도 결과는 broadcast_urls 순서대로 기록 (실패한 방송은 건너뜀)
+def test_results_committed_in_url_order(monkeypatch):
+    urls = [f"https://live.example.com/{i}" for i in range(5)]
+
+    async def reversed_finish(session, semaphore, url, index, retries):
+        await asyncio.sleep(0.01 * (len(urls) - index))
+        return None if index == 2 else (url, f"방송 {index}", full_products[:1])
+
+    monkeypatch.setattr(extractor, "extract_broadcast", reversed_finish)
+    order = []
+    extracted, fallback = extractor.extract_broadcasts(urls, concurrency=5, on_result=lambda *r: order.append(r[0]))
+    assert order == list(extracted) == urls[:2] + urls[3:]
+    assert fallback == [urls[2]]
+
+
+# HTTP 로 추출한 방송은 브라우저 단계 전에 이미 journal 에 저장됨
+def test_http_results_checkpointed_before_fallback(fixture_server, tmp_path):
+    path = str(tmp_path / "crawl_state.jsonl")
+    urls = [f"{fixture_server}/live_full.html", f"{fixture_server}/live_partial.html"]
+
+    def crashing_fallback(fallback_urls):
+        assert fallback_urls == urls[1:]
+        raise RuntimeError("browser crashed")
+
+    with pytest.raises(RuntimeError):
+        extractor.crawl(CrawlState(path, "TP", "TL"), urls, browser_fallback=crashing_fallback)
+
+    state = CrawlState(path, "TP", "TL")
+    assert state.is_visited(urls[0]) and not state.is_visited(urls[1])
+    assert state.live_results == [("TL_001", "[테스트] 전체 상품 라이브", urls[0], "TP_001,TP_002,TP_003")]
+
+
+# 상품을 못 찾은 방송은 journal 에 남기지 않아 다음 실행에서 다시 시도됨 (코드 번호도 소비하지 않음)
+def test_empty_broadcast_not_checkpointed(tmp_path):
+    path = str(tmp_path / "crawl_state.jsonl")
+    state = CrawlState(path, "TP", "TL")
+    assert state.add_broadcast("https://live.example.com/1", "빈 방송", []) is None
+    assert state.add_broadcast("https://live.example.com/2", "상품 방송", full_products[:1]) == "TL_001"
+
+    state = CrawlState(path, "TP", "TL")
+    assert not state.is_visited("https://live.example.com/1")
+    assert state.add_broadcast("https://live.example.com/1", "빈 방송", full_products[1:]) == "TL_002"
+    assert [r[0] for r in state.live_results] == ["TL_001", "TL_002"]
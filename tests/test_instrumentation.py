@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import instrumentation
+import run_pipeline
+import synthetic_data
+from run_pipeline import STAGES
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.enable("test")
+    yield
+    instrumentation.disable()
+
+
+@instrumentation.traced()
+def explode(df):
+    return pd.concat([df, df])
+
+
+# 꺼져 있으면 기록 없이 원래 결과만
+def test_disabled_records_nothing():
+    instrumentation.disable()
+    before = instrumentation.records()
+    df = pd.DataFrame({"a": [1, 2]})
+    assert len(explode(df)) == 4
+    assert len(instrumentation.merge(df, df, on="a")) == 2
+    assert instrumentation.records() == before
+
+
+# stage 안의 단계는 brand / stage / 깊이와 행 수, merge 는 늘어난 행 수(fan_out) 기록
+def test_stage_context_rows_and_fan_out(enabled):
+    left = pd.DataFrame({"k": [1, 1, 2], "x": [1, 2, 3]})
+    right = pd.DataFrame({"k": [1, 1, 2], "y": [4, 5, 6]})
+    with instrumentation.stage("proxy_sales", "B") as stage_record:
+        explode(left)
+        instrumentation.merge(left, right, name="join", on="k")
+        stage_record["rows_out"] = 5
+
+    inner, join, outer = instrumentation.records()
+    assert (inner["name"], inner["rows_in"], inner["rows_out"], inner["depth"]) == ("explode", 3, 6, 1)
+    assert (join["rows_in"], join["rows_out"], join["fan_out"]) == (6, 5, 2)
+    assert {r["brand"] for r in (inner, join)} == {"B"} and {r["stage"] for r in (inner, join)} == {"proxy_sales"}
+    assert (outer["kind"], outer["depth"], outer["rows_out"]) == ("stage", 0, 5)
+    assert outer["wall_sec"] >= inner["wall_sec"]
+
+
+# 계측해도 결과 파일은 같고, 실행 기록 JSON 에는 브랜드 × stage 기록 + 가장 느린 stage 의 profile 하나만
+def test_traced_run_writes_trace_without_changing_outputs(tmp_path):
+    plain, traced_path = str(tmp_path / "plain"), str(tmp_path / "traced")
+    brands, _ = synthetic_data.generate(plain, n_brands=2, years=1, reviews_per_day=3, seed=0)
+    shutil.copytree(plain, traced_path)
+
+    run_pipeline.run_all(brands, plain, max_workers=1)
+    results, errors = run_pipeline.run_all(brands, traced_path, max_workers=1, profile=True)
+    assert errors == {}
+
+    for brand in brands:
+        for filename in (f"proxy_sales_{brand}.csv", f"elasticnet_data_{brand}.csv"):
+            with open(os.path.join(plain, filename), "rb") as a, open(os.path.join(traced_path, filename), "rb") as b:
+                assert a.read() == b.read()
+
+    trace_dir = os.path.join(traced_path, "trace")
+    [trace_file] = [f for f in os.listdir(trace_dir) if f.endswith(".json")]
+    with open(os.path.join(trace_dir, trace_file), encoding="utf-8") as f:
+        summary = json.load(f)
+    stages = {(r["brand"], r["name"]) for r in summary["records"] if r["kind"] == "stage"}
+    assert stages == {(brand, stage) for brand in brands for stage in STAGES}
+    assert [f for f in os.listdir(trace_dir) if f.endswith(".prof")] == [os.path.basename(summary["profile"])]
@@ -0,0 +1,11 @@
+import numpy as np
+
+import live_comments
+
+
+# 숫자만 있는 값(초)과 "MM:SS" / "HH:MM:SS" 가 섞여 있어도 각각 초로 변환
+def test_parse_seconds_mixed_formats():
+    np.testing.assert_array_equal(live_comments.parse_seconds(["1:05", "01:02:03", "65", " 7 "]),
+                                  [65, 3723, 65, 7])
+    np.testing.assert_array_equal(live_comments.parse_seconds(["65", "7"]), [65, 7])
+    assert np.isnan(live_comments.parse_seconds(["abc", "0:30"])).tolist() == [True, False]
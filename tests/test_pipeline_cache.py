@@ -0,0 +1,29 @@
+import os
+import types
+
+import pandas as pd
+
+from pipeline_cache import PipelineCache
+
+
+# 입력 / 파라미터가 같아도 stage 계산 코드가 바뀌면 이전 결과를 쓰지 않고 다시 계산 (이전 키 파일은 삭제)
+def test_code_change_invalidates_cache(tmp_path):
+    source = tmp_path / "stage_module.py"
+    source.write_text("scale = 1\n")
+    module = types.SimpleNamespace(__file__=str(source))
+    cache = PipelineCache(cache_dir=str(tmp_path / "cache"))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({"x": [len(calls)]})
+
+    _, key, hit = cache.get_or_compute("proxy_sales", "B", ["input"], {"k": 1}, compute, [module])
+    assert not hit
+    df, same_key, hit = cache.get_or_compute("proxy_sales", "B", ["input"], {"k": 1}, compute, [module])
+    assert hit and same_key == key and df["x"].tolist() == [1]
+
+    source.write_text("scale = 2\n")
+    df, new_key, hit = cache.get_or_compute("proxy_sales", "B", ["input"], {"k": 1}, compute, [module])
+    assert not hit and new_key != key and df["x"].tolist() == [2]
+    assert os.listdir(cache.cache_dir) == [f"proxy_sales_B_{new_key}.feather"]
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+import promotion_tagger
+import schemas
+import synthetic_data
+from promotion_tagger import KeywordAutomaton, normalize
+
+
+# 자동자 한 번 훑기 결과 = 키워드마다 부분 문자열 검색한 결과 (겹치는 키워드 / 접미사 키워드 포함)
+def test_automaton_matches_naive_search():
+    keywords = promotion_tagger.load_keywords(data_path="/nonexistent")
+    keywords.update({"이벤트당첨": ("event", 2.0), "1+1+1+1": ("bundle", 0.5)})
+    automaton = KeywordAutomaton(keywords)
+
+    rng = np.random.default_rng(0)
+    alphabet = list(set("".join(keywords)) | set("가나다 ABC 12%"))
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet, rng.integers(0, 40)))
+        expected = {}
+        for keyword, (label, weight) in keywords.items():
+            if normalize(keyword) in normalize(text):
+                expected[label] = expected.get(label, 0) + weight
+        assert automaton.scan(text) == expected, text
+
+
+# "%" 는 1~99 숫자가 붙은 할인율만 discount ("100% 국내산" 은 할인 아님)
+def test_discount_requires_percentage():
+    live_info_df = pd.DataFrame({"live_code": ["L1", "L2", "L3", "L4", "L5"], "date": "2025-01-01",
+                                 "promotion_text": ["100% 국내산 원료", "최대 50% 할인", "30 % 특별 혜택", "%", None]})
+    tagged = promotion_tagger.tag_lives(live_info_df, automaton=KeywordAutomaton({"할인": ("discount", 1.0)}))
+    assert tagged["promotion_flag"].tolist() == [0, 1, 1, 0, 0]
+    assert tagged["discount_score"].tolist() == [0, 2, 1, 0, 0]
+    assert tagged["max_discount_pct"].tolist() == [0, 50, 30, 0, 0]
+    assert promotion_tagger.has_discount_pct(pd.Series(["100%", "5%", None])).tolist() == [False, True, False]
+
+
+# live_info 의 promotion_flag 는 행 위치가 아니라 live_code 기준으로 교체
+def test_update_live_info_matches_live_code(tmp_path, monkeypatch):
+    data_path = str(tmp_path)
+    brand = synthetic_data.generate(data_path, n_brands=1, years=1, reviews_per_day=1, seed=0)[0][0]
+    tag_lives = promotion_tagger.tag_lives
+    monkeypatch.setattr(promotion_tagger, "tag_lives", lambda *args: tag_lives(*args).iloc[::-1])
+
+    tagged = promotion_tagger.run(brand, data_path, update_live_info=True)
+    live_df = schemas.load("live_info", brand, data_path)
+    expected = tagged.set_index(tagged["live_code"].astype(str))["promotion_flag"]
+    assert tagged["promotion_flag"].nunique() == 2
+    assert (live_df["promotion_flag"].to_numpy() == live_df["live_code"].astype(str).map(expected).to_numpy()).all()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from resample import CumulativeTable
+
+
+def daily_frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"date": pd.date_range("2024-01-03", periods=n, freq="D"),
+                         "search_ad_spend_est": rng.gamma(2.0, 1000.0, n),
+                         "live_ad_spend_est": rng.gamma(1.0, 500.0, n) * (rng.random(n) < 0.3),
+                         "competitor_event_flag": (rng.random(n) < 0.1).astype(int),
+                         "proxy_sales": rng.normal(100.0, 10.0, n)})
+
+
+# 누적합 집계 = pandas resample 집계 (월 / ISO 주 / 달력 시작일 기준 7일)
+@pytest.mark.parametrize("freq, rule", [("M", "MS"), ("ISO-W", "W-MON"), ("W", "7D")])
+def test_aggregate_matches_pandas_resample(freq, rule):
+    df = daily_frame()
+    table = CumulativeTable(df)
+    kwargs = {"label": "left", "closed": "left"} if freq == "ISO-W" else {}
+    expected = df.set_index("date").resample(rule, **kwargs).sum()
+    flags = (df.set_index("date")["competitor_event_flag"] > 0).resample(rule, **kwargs).max().astype(int)
+
+    out = table.aggregate(freq, {"search_ad_spend_est": "sum", "proxy_sales": "mean", "competitor_event_flag": "any"})
+    np.testing.assert_allclose(out["search_ad_spend_est"], expected["search_ad_spend_est"].to_numpy())
+    counts = df.set_index("date").resample(rule, **kwargs).size()
+    np.testing.assert_allclose(out["proxy_sales"], (expected["proxy_sales"] / counts).to_numpy())
+    np.testing.assert_array_equal(out["competitor_event_flag"], flags.to_numpy())
+    np.testing.assert_array_equal(out["n_days"], counts.to_numpy())
+    # 첫 구간 날짜는 달력 시작일, 나머지는 resample 구간 시작일
+    assert (out["date"].iloc[1:].to_numpy() == expected.index[1:].to_numpy()).all()
+
+
+# 일 단위 training_frame = 기존 shift / rolling 계산
+def test_daily_training_frame_matches_shift_and_rolling():
+    df = daily_frame(60)
+    frame = CumulativeTable(df).training_frame("D")
+    for col in ("search_ad_spend_est", "live_ad_spend_est"):
+        np.testing.assert_allclose(frame[col.replace("_est", "_lag3")], df[col].shift(3).fillna(0))
+        np.testing.assert_allclose(frame[col.replace("_est", "_7d_sum")], df[col].rolling(7, min_periods=1).sum())
+    np.testing.assert_array_equal(frame["competitor_event_flag_lag3"],
+                                  df["competitor_event_flag"].shift(3).fillna(0))
+
+
+# 달력에 빈 날짜가 있으면 거부
+def test_rejects_gaps():
+    df = daily_frame(10).drop(index=4)
+    with pytest.raises(ValueError):
+        CumulativeTable(df)
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import proxy_sales
+import review_data_processing
+
+
+# 상품이 여러 파일에 나뉘어 있고, 일부 파일은 판매여부 / 구매자 성별 컬럼이 없는 리뷰 폴더
+def write_review_folder(folder, n_files=6, rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder)
+    for i in range(n_files):
+        df = pd.DataFrame({
+            "상품명": "테스트 상품",
+            "URL": "https://smartstore.naver.com/main/products/1",
+            "상품코드": rng.choice([f"TP_{k:03d}" for k in range(1, 6)], rows),
+            "날짜": pd.DatetimeIndex(rng.choice(pd.date_range("2024-01-01", periods=40), rows)).strftime("%Y-%m-%d"),
+            "별점": rng.choice([1.0, 3.0, 4.0, 5.0, np.nan], rows),
+        })
+        if i % 3 != 0:
+            df["판매여부"] = rng.choice(["Y", "N"], rows)
+        if i % 2 == 0:
+            df["구매자 성별"] = rng.choice(["여성", "남성", None], rows)
+        df.to_csv(os.path.join(folder, f"reviews_{i}.csv"), index=False, encoding="utf-8-sig")
+
+
+# 기존 스크립트와 같은 방식 (파일마다 전체 읽기 → 변환 → concat)
+def baseline_merge(folder):
+    frames = []
+    for f in sorted(os.listdir(folder)):
+        df = pd.read_csv(os.path.join(folder, f))
+        if "구매자 성별" in df.columns:
+            df["구매자 성별"] = df["구매자 성별"].map({"여성": 0, "남성": 1}).fillna(2).astype("int8")
+        if "판매여부" in df.columns:
+            df["판매여부"] = df["판매여부"].map({"N": 0, "Y": 1}).astype("int8")
+        frames.append(df.drop(columns=["상품명", "URL"]))
+    merged = pd.concat(frames, ignore_index=True)
+    merged["날짜"] = pd.to_datetime(merged["날짜"])
+    return merged.fillna({"판매여부": -1, "구매자 성별": 2})
+
+
+def test_parquet_and_daily_match_baseline(tmp_path):
+    folder = str(tmp_path / "reviews_TP")
+    write_review_folder(folder)
+    daily_df = review_data_processing.run("B", folder, str(tmp_path), max_workers=3)
+    baseline = baseline_merge(folder)
+    keys = ["상품코드", "날짜", "별점", "판매여부", "구매자 성별"]
+
+    # Parquet = 기존 병합 결과 (파일 완료 순서로 쓰이므로 정렬 후 비교)
+    parquet = pd.read_parquet(tmp_path / "product_review_B.parquet")
+    parquet = parquet.astype({"상품코드": str, "별점": float, "판매여부": float, "구매자 성별": float})
+    expected = baseline[keys].astype({"상품코드": str, "별점": float, "판매여부": float, "구매자 성별": float})
+    pd.testing.assert_frame_equal(parquet.sort_values(keys, ignore_index=True),
+                                  expected.sort_values(keys, ignore_index=True), check_dtype=False)
+
+    # 일별 부분 집계 = 전체 groupby
+    grouped = baseline.groupby(["상품코드", "날짜"]).agg(rating_sum=("별점", "sum"), rating_count=("별점", "count"),
+                                                      review_count=("상품코드", "size")).reset_index()
+    grouped = grouped.rename(columns={"상품코드": "prod_code", "날짜": "date"})
+    pd.testing.assert_frame_equal(daily_df.reset_index(drop=True), grouped, check_dtype=False)
+
+    # proxy_sales 의 날짜별 평균 평점 / 리뷰 수도 원본 리뷰로 계산한 값과 같음
+    saved = pd.read_csv(tmp_path / "review_daily_B.csv")
+    codes = ["TP_001", "TP_002", "TP_004"]
+    pd.testing.assert_frame_equal(proxy_sales.aggregate_reviews(saved, codes),
+                                  proxy_sales.aggregate_reviews(baseline, codes), check_dtype=False)
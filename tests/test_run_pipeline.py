@@ -0,0 +1,37 @@
+import shutil
+
+import pandas as pd
+
+import run_pipeline
+import synthetic_data
+from brand_config import data_file
+
+
+# 새 날짜에 최대값을 넘는 viewer_count 가 들어와 proxy_sales 가 전체 재계산되면
+# 증분 실행 결과도 전체 실행과 같아야 함 (과거 날짜의 proxy_sales 까지)
+def test_incremental_rebuilds_training_data_after_full_rescore(tmp_path):
+    inc_path, full_path = str(tmp_path / "inc"), str(tmp_path / "full")
+    brands, _ = synthetic_data.generate(inc_path, n_brands=1, years=2, reviews_per_day=5, seed=0)
+    brand = brands[0]
+    run_pipeline.run_brand(brand, inc_path)
+
+    # 다음 날 검색량 + 기존 최대보다 큰 시청자 수의 라이브 추가
+    searches = pd.read_csv(data_file("search_volume_total.csv", inc_path))
+    next_day = pd.to_datetime(searches["date"]).max() + pd.Timedelta(days=1)
+    last = searches[searches["date"] == searches["date"].max()].assign(date=next_day.strftime("%Y-%m-%d"))
+    pd.concat([searches, last]).to_csv(data_file("search_volume_total.csv", inc_path), index=False,
+                                       encoding="utf-8-sig")
+    lives = pd.read_csv(data_file(f"live_info_{brand}.csv", inc_path))
+    extreme = lives.tail(1).assign(date=next_day.strftime("%Y-%m-%d"), live_code=f"{brand}L_NEW",
+                                   viewer_count=lives["viewer_count"].max() * 10)
+    pd.concat([lives, extreme]).to_csv(data_file(f"live_info_{brand}.csv", inc_path), index=False,
+                                       encoding="utf-8-sig")
+
+    shutil.copytree(inc_path, full_path)
+    run_pipeline.run_brand(brand, inc_path, incremental=True)
+    run_pipeline.run_brand(brand, full_path)
+
+    inc_df = pd.read_csv(data_file(f"elasticnet_data_{brand}.csv", inc_path))
+    full_df = pd.read_csv(data_file(f"elasticnet_data_{brand}.csv", full_path))
+    assert inc_df["date"].iloc[-1] == next_day.strftime("%Y-%m-%d")
+    pd.testing.assert_frame_equal(inc_df, full_df, rtol=1e-12)
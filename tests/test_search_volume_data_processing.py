@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import search_volume_data_processing as svdp
+
+
+def make_wide_csv(n_days=90, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=n_days).strftime("%Y-%m-%d")
+    df = pd.DataFrame()
+    for i, keyword in enumerate(["비에날씬", "덴마크 유산균", "락토핏", "유산균"]):
+        df[f"날짜{i}"] = dates
+        df[keyword] = np.round(rng.random(n_days) * 100, 5)
+    df.iloc[3, 1] = np.nan
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)))
+
+
+# 기존 스크립트의 컬럼쌍 반복 + concat
+def baseline_long(df):
+    dfs = []
+    for i in range(0, df.shape[1], 2):
+        tmp = df[[df.columns[i], df.columns[i + 1]]].copy()
+        tmp.columns = ["date", "search_volume_relative"]
+        tmp["brand"] = df.columns[i + 1]
+        dfs.append(tmp)
+    df_long = pd.concat(dfs, ignore_index=True)
+    df_long["date"] = pd.to_datetime(df_long["date"])
+    return df_long
+
+
+# 한 번에 펼친 결과 = 컬럼쌍 반복 결과 (순서, 결측 포함)
+def test_reshape_matches_pairwise_loop():
+    df = make_wide_csv()
+    out = svdp.reshape_long(df)
+    expected = baseline_long(df)
+    pd.testing.assert_frame_equal(out.astype({"brand": str}), expected[out.columns].astype({"brand": str}),
+                                  check_dtype=False)
+
+    with pytest.raises(ValueError):
+        svdp.reshape_long(df.iloc[:, :3])
+
+
+# CPC 는 브랜드 레지스트리 기준 (없는 키워드는 NaN), 스케일링은 기준 기간 합계 = 실제 월간 검색량
+def test_cpc_and_fixed_reference_scaling():
+    df_long = svdp.add_cpc(svdp.reshape_long(make_wide_csv()))
+    expected_cpc = df_long["brand"].astype(str).map({"비에날씬": 93, "덴마크 유산균": 101, "락토핏": 122})
+    np.testing.assert_array_equal(df_long["cpc_pred"], expected_cpc.to_numpy(dtype=float))
+
+    out = svdp.scale_search_volume(df_long.copy(), "2025-02-01", "2025-02-28")
+    in_period = out["date"].between("2025-02-01", "2025-02-28")
+    assert out.loc[in_period, "search_volume_abs"].sum() == pytest.approx(svdp.actual_monthly_searches)
+    np.testing.assert_allclose(out["ad_spend_est"], out["search_volume_abs"] * out["cpc_pred"])
+
+    # 기준 기간을 안 주면 데이터 마지막 날짜 기준 최근 30일 (실행 날짜와 무관)
+    default = svdp.scale_search_volume(df_long.copy())
+    explicit = svdp.scale_search_volume(df_long.copy(), df_long["date"].max() - pd.Timedelta(days=30))
+    pd.testing.assert_frame_equal(default, explicit)
@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+
+import stage_graph
+import synthetic_data
+from brand_config import data_file
+
+
+# 원본 라이브 정보 + live_code CSV (liveinfo_comment_data_processing 입력) 를 합성 live_info 에서 만듦
+def write_raw_liveinfo(data_path, brand, raw_dir):
+    live_df = pd.read_csv(data_file(f"live_info_{brand}.csv", data_path))
+    live_df["live_url"] = [f"https://view.shoppinglive.naver.com/replays/{100000 + i}" for i in range(len(live_df))]
+    raw_path, code_path = os.path.join(raw_dir, f"{brand}_liveinfo.csv"), os.path.join(raw_dir, f"live_code_{brand}.csv")
+    live_df.drop(columns=["live_code", "prod_codes"]).rename(columns={"live_url": "url"}) \
+        .to_csv(raw_path, index=False, encoding="utf-8-sig")
+    live_df.assign(live_name="라이브")[["live_code", "live_name", "live_url", "prod_codes"]] \
+        .to_csv(code_path, index=False, encoding="utf-8-sig")
+    return raw_path, code_path, live_df
+
+
+# 원본 라이브 정보부터 다시 만들어도 estimate_live_ad_spend 이하 stage 가 모두 실행돼야 함 (prod_codes 유지)
+def test_graph_runs_from_raw_liveinfo(tmp_path):
+    data_path = str(tmp_path / "data")
+    brands, _ = synthetic_data.generate(data_path, n_brands=1, years=2, reviews_per_day=5, seed=0)
+    brand = brands[0]
+    raw_dir = str(tmp_path)
+    raw_path, code_path, live_df = write_raw_liveinfo(data_path, brand, raw_dir)
+
+    sources = {"liveinfo": os.path.join(raw_dir, "{brand}_liveinfo.csv"),
+               "live_code": os.path.join(raw_dir, "live_code_{brand}.csv")}
+    graph = stage_graph.build_graph([brand], data_path, sources)
+    assert f"liveinfo_comment_data_processing:{brand}" in graph[f"estimate_live_ad_spend:{brand}"]["deps"]
+
+    results, skipped, errors = stage_graph.run_graph(graph, data_path, max_workers=1)
+    assert errors == {}
+    assert set(results) == set(graph)
+    rebuilt = pd.read_csv(data_file(f"live_info_{brand}.csv", data_path))
+    assert rebuilt["prod_codes"].tolist() == live_df["prod_codes"].tolist()
+
+    # 입력이 그대로면 두 번째 실행은 모두 건너뜀
+    results, skipped, errors = stage_graph.run_graph(graph, data_path, max_workers=1)
+    assert results == {} and errors == {} and set(skipped) == set(graph)
@@ -0,0 +1,40 @@
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import brand_config
+import run_pipeline
+import synthetic_data
+from brand_config import BRANDS
+
+
+# 합성 브랜드 등록은 테스트 프로세스의 레지스트리에 남으므로 테스트 후 원래대로
+@pytest.fixture
+def registry():
+    saved = dict(BRANDS)
+    yield
+    BRANDS.clear()
+    BRANDS.update(saved)
+
+
+# spawn 으로 시작한 워커 (Windows 기본) 도 합성 브랜드를 데이터 폴더의 brands.csv 에서 다시 읽어야 함
+def test_synthetic_brands_visible_in_spawn_workers(tmp_path, registry):
+    data_path = str(tmp_path)
+    brands, _ = synthetic_data.generate(data_path, n_brands=4, years=2, reviews_per_day=5, seed=0)
+    assert brands[-1] == "S003"
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+        worker_brands = pool.submit(brand_config.load_data_brands, data_path).result()
+        brand, timings, error, _ = pool.submit(run_pipeline._run_brand_safe, "S003", data_path, False).result()
+
+    assert worker_brands["S003"] == BRANDS["S003"]
+    assert error is None and brand == "S003" and set(timings) == set(run_pipeline.STAGES)
+
+
+# 다시 생성하면 이전 생성의 합성 브랜드는 데이터 폴더 목록에서 빠짐
+def test_generate_rewrites_data_brands(tmp_path, registry):
+    data_path = str(tmp_path)
+    synthetic_data.generate(data_path, n_brands=5, years=1, reviews_per_day=1, seed=0)
+    synthetic_data.generate(data_path, n_brands=4, years=1, reviews_per_day=1, seed=0)
+    assert list(brand_config.read_brands(brand_config.data_brands_file(data_path))) == ["S003"]